@@ -0,0 +1,367 @@
+"""
+Apply-form automation for Indeed's and LinkedIn's Easy Apply flows.
+
+Each step of a form is completed in one execute_script call: the script
+reads the question of every visible field, fills the ones the answer book
+knows, reports required questions it can't answer and, if none are left,
+clicks Submit, Review or Continue. After the click the engine waits for
+the form to change (next step, confirmation, error message or the form
+closing), so a finished application returns as soon as its confirmation
+shows instead of after a timeout.
+"""
+import logging
+import re
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from metrics import APPLY_STEP_SECONDS
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+_REQUIRED_MARK = re.compile(r'\(required\)|\*')
+
+# Where each portal's form lives and how it signals its states. Selectors
+# list the current markup first, then older layouts.
+FLOWS = {
+    'indeed': {
+        'root': ['.ia-BasePage', '#ia-container', 'main', 'body'],
+        'item': '.ia-Questions-item, [data-testid="questions-item"], .css-1ssuflh',
+        'success': ['.ia-PostApply', '[data-testid="post-apply"]', '.ia-ApplicationSubmitted'],
+        'success_text': ['your application has been submitted', 'application submitted'],
+        'errors': ['.ia-ErrorText', '[data-testid="error-message"]', '[role="alert"]'],
+        'submit': ['submit your application', 'submit application', 'submit'],
+        'advance': ['review your application', 'review', 'continue', 'next'],
+    },
+    'linkedin': {
+        'root': ['.jobs-easy-apply-modal', '.jobs-easy-apply-content', 'div[role="dialog"]'],
+        'item': '.jobs-easy-apply-form-section__grouping, .fb-dash-form-element, [data-test-form-element]',
+        'success': ['.jpac-modal-header', '.artdeco-inline-feedback--success', '[data-test-modal-id="post-apply-modal"]'],
+        'success_text': ['your application was sent', 'application sent'],
+        'errors': ['.artdeco-inline-feedback--error', '[data-test-form-element-error-messages]'],
+        'submit': ['submit application', 'submit'],
+        'advance': ['review your application', 'review', 'continue to next step', 'next', 'continue'],
+    },
+}
+
+_HELPERS = """
+const flow = arguments[0];
+function norm(text) {
+    return (text || '').toLowerCase().replace(/\\(required\\)|\\*/g, ' ').replace(/[^a-z0-9]+/g, ' ').trim();
+}
+function visible(el) {
+    return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+function formRoot() {
+    for (const selector of flow.root) {
+        const el = document.querySelector(selector);
+        if (el && visible(el)) { return el; }
+    }
+    return null;
+}
+function succeeded() {
+    // Only the form's own container counts: the page behind a modal can
+    // mention an earlier application. A confirmation dialog is itself a root.
+    const roots = flow.root.join(', ');
+    if (flow.success.some(selector => Array.from(document.querySelectorAll(selector))
+            .some(el => visible(el) && el.closest(roots)))) { return true; }
+    const scope = formRoot();
+    const text = ((scope && scope.innerText) || '').toLowerCase();
+    return flow.success_text.some(phrase => text.includes(phrase));
+}
+function errorsIn(scope) {
+    const messages = [];
+    for (const selector of flow.errors) {
+        for (const el of scope.querySelectorAll(selector)) {
+            const message = (el.innerText || '').trim();
+            if (message && visible(el) && !messages.includes(message)) { messages.push(message); }
+        }
+    }
+    return messages;
+}
+function signature(scope) {
+    const heading = scope.querySelector('h1, h2, h3');
+    const fields = Array.from(scope.querySelectorAll('input, textarea, select'))
+        .filter(visible).map(field => field.name || field.id || field.type);
+    return (heading ? heading.innerText.trim() : '') + '|' + fields.join(',');
+}
+"""
+
+STATE_SCRIPT = _HELPERS + """
+if (succeeded()) { return {state: 'success'}; }
+const scope = formRoot();
+if (!scope) { return {state: 'closed'}; }
+return {state: 'open', errors: errorsIn(scope), signature: signature(scope)};
+"""
+
+STEP_SCRIPT = _HELPERS + """
+const answers = arguments[1];
+function labelText(field) {
+    if (field.id) {
+        const label = document.querySelector('label[for="' + CSS.escape(field.id) + '"]');
+        if (label) { return label.innerText; }
+    }
+    const label = field.closest('label');
+    return label ? label.innerText : '';
+}
+function questionOf(field) {
+    if (field.type === 'radio' || field.type === 'checkbox') {
+        const fieldset = field.closest('fieldset');
+        const legend = fieldset && fieldset.querySelector('legend');
+        if (legend) { return legend.innerText; }
+        const group = field.closest('[role="radiogroup"], [role="group"]');
+        if (group && group.getAttribute('aria-label')) { return group.getAttribute('aria-label'); }
+        const item = field.closest(flow.item);
+        if (item) { return (item.innerText || '').split('\\n')[0]; }
+        if (field.type === 'checkbox') { return labelText(field); }
+    }
+    return labelText(field) || field.getAttribute('aria-label') || field.getAttribute('placeholder') || field.name || '';
+}
+function lookup(question) {
+    const q = norm(question);
+    if (!q) { return null; }
+    if (Object.prototype.hasOwnProperty.call(answers.exact, q)) { return answers.exact[q]; }
+    const padded = ' ' + q + ' ';
+    for (const [key, value] of answers.contains) {
+        if (padded.includes(' ' + key + ' ')) { return value; }
+    }
+    return null;
+}
+function required(field, question) {
+    return field.required || field.getAttribute('aria-required') === 'true' || /\\*|\\(required\\)/i.test(question || '');
+}
+function setValue(field, value) {
+    const proto = field.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype
+        : field.tagName === 'SELECT' ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(field, value);
+    field.dispatchEvent(new Event('input', {bubbles: true}));
+    field.dispatchEvent(new Event('change', {bubbles: true}));
+    field.dispatchEvent(new Event('blur', {bubbles: true}));
+}
+function pick(options, answer, label) {
+    const wanted = norm(answer);
+    return options.find(option => norm(label(option)) === wanted)
+        || options.find(option => norm(label(option)).startsWith(wanted));
+}
+
+if (succeeded()) { return {state: 'success', filled: [], unanswered: [], errors: []}; }
+const scope = formRoot();
+if (!scope) { return {state: 'closed', filled: [], unanswered: [], errors: []}; }
+const step = signature(scope);
+const filled = [], unanswered = [], groups = new Set();
+for (const field of scope.querySelectorAll('input, textarea, select')) {
+    // Styled radios and checkboxes hide the input behind its label
+    const shown = visible(field) || (['radio', 'checkbox'].includes(field.type)
+        && Array.from(field.labels || []).some(visible));
+    if (!shown || field.disabled || field.readOnly
+            || ['hidden', 'submit', 'button', 'file', 'image', 'reset'].includes(field.type)) { continue; }
+    if (field.type === 'radio') {
+        if (groups.has(field.name)) { continue; }
+        groups.add(field.name);
+        const group = field.name
+            ? Array.from(scope.querySelectorAll('input[type="radio"][name="' + CSS.escape(field.name) + '"]'))
+            : [field];
+        if (group.some(radio => radio.checked)) { continue; }
+        const question = questionOf(field), answer = lookup(question);
+        const choice = answer === null ? null : pick(group, answer, radio => labelText(radio) || radio.value);
+        if (choice) { choice.click(); filled.push(question.trim()); }
+        else if (group.some(radio => required(radio, question)) || answer !== null) { unanswered.push(question.trim()); }
+        continue;
+    }
+    const question = questionOf(field);
+    if (field.type === 'checkbox') {
+        const answer = lookup(question);
+        if (answer !== null && answers.yes.includes(norm(answer)) && !field.checked) {
+            field.click();
+            filled.push(question.trim());
+        } else if (!field.checked && required(field, question)) {
+            unanswered.push(question.trim());
+        }
+        continue;
+    }
+    if (field.tagName === 'SELECT') {
+        const empty = field.selectedIndex < 0 || !field.value || /^select/i.test(field.options[field.selectedIndex].text);
+        if (!empty) { continue; }
+        const answer = lookup(question);
+        const option = answer === null ? null
+            : pick(Array.from(field.options).filter(option => option.value), answer, option => option.text);
+        if (option) { setValue(field, option.value); filled.push(question.trim()); }
+        else if (required(field, question)) { unanswered.push(question.trim()); }
+        continue;
+    }
+    if (field.value) { continue; }
+    const answer = lookup(question);
+    if (answer !== null) { setValue(field, answer); filled.push(question.trim()); }
+    else if (required(field, question)) { unanswered.push(question.trim()); }
+}
+const errors = errorsIn(scope);
+if (unanswered.length) {
+    return {state: 'blocked', filled: filled, unanswered: unanswered, errors: errors, signature: step};
+}
+
+const buttons = Array.from(scope.querySelectorAll('button, input[type="submit"]'))
+    .filter(button => visible(button) && !button.disabled && button.getAttribute('aria-disabled') !== 'true');
+for (const [kind, labels] of [['submit', flow.submit], ['advance', flow.advance]]) {
+    for (const wanted of labels) {
+        const button = buttons.find(button =>
+            norm(button.innerText || button.value || button.getAttribute('aria-label')) === wanted);
+        if (button) {
+            button.click();
+            return {state: kind === 'submit' ? 'submitted' : 'advanced', filled: filled, unanswered: [],
+                    errors: errors, signature: step, button: wanted};
+        }
+    }
+}
+return {state: 'stuck', filled: filled, unanswered: [], errors: errors, signature: step};
+"""
+
+def normalize_question(text: Optional[str]) -> str:
+    """Lowercase words of a question, without required markers or punctuation."""
+    return ' '.join(_NON_WORD.sub(' ', _REQUIRED_MARK.sub(' ', (text or '').lower())).split())
+
+class AnswerBook:
+    """
+    Answers to application questions, keyed by normalized question text.
+
+    A question gets the answer of an identical key, otherwise of the
+    longest key that appears in it as whole words ("years of experience"
+    answers "How many years of experience do you have with Python?").
+    """
+
+    YES = ('yes', 'y', 'true', '1', 'on', 'checked')
+
+    def __init__(self, answers: Optional[Dict[str, str]] = None):
+        self.exact = {}
+        for question, answer in (answers or {}).items():
+            key = normalize_question(question)
+            if key and answer is not None:
+                self.exact[key] = str(answer).strip()
+        self.contains = sorted(self.exact.items(), key=lambda item: -len(item[0]))
+        # The form of the book handed to the browser with every step
+        self.compiled = {'exact': self.exact, 'contains': [list(item) for item in self.contains],
+                         'yes': list(self.YES)}
+
+    @classmethod
+    def from_config(cls, config) -> 'AnswerBook':
+        """Answers from the optional [Answers] section (question = answer)."""
+        if not config.has_section('Answers'):
+            return cls()
+        return cls({key: config.get('Answers', key) for key in config.options('Answers')
+                    if key not in config.defaults()})
+
+    def lookup(self, question: Optional[str]) -> Optional[str]:
+        key = normalize_question(question)
+        if not key:
+            return None
+        if key in self.exact:
+            return self.exact[key]
+        padded = f' {key} '
+        for known, answer in self.contains:
+            if f' {known} ' in padded:
+                return answer
+        return None
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+class ApplyResult(NamedTuple):
+    """How an application form ended, with what was filled and what wasn't."""
+    status: str
+    steps: int
+    filled: int
+    unanswered: List[str]
+    errors: List[str]
+
+    @property
+    def submitted(self) -> bool:
+        return self.status == ApplyFormEngine.SUBMITTED
+
+class ApplyFormEngine:
+    """Completes an Easy Apply form step by step, one execute_script per step."""
+
+    SUBMITTED = 'submitted'
+    # Required questions the answer book can't answer; nothing was sent
+    BLOCKED = 'blocked'
+    # The form showed an error after a step was sent
+    ERROR = 'error'
+    # No known button, the step didn't change, or too many steps
+    STUCK = 'stuck'
+
+    def __init__(self, answers: Optional[AnswerBook] = None, max_steps: int = 12, step_timeout: float = 15.0,
+                 logger: Optional[logging.Logger] = None):
+        self.answers = answers or AnswerBook()
+        self.max_steps = max_steps
+        self.step_timeout = step_timeout
+        self.logger = logger or logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config, logger: Optional[logging.Logger] = None) -> 'ApplyFormEngine':
+        """Build an engine from [Answers] and the optional [ApplyForm] section."""
+        return cls(
+            AnswerBook.from_config(config),
+            max_steps=config.getint('ApplyForm', 'max_steps', fallback=12),
+            step_timeout=config.getfloat('ApplyForm', 'step_timeout', fallback=15.0),
+            logger=logger
+        )
+
+    @staticmethod
+    def _state(driver, flow: Dict) -> Dict:
+        try:
+            return driver.execute_script(STATE_SCRIPT, flow) or {'state': 'closed'}
+        except WebDriverException:
+            # The form's frame or window went away
+            return {'state': 'closed'}
+
+    def _wait_for_change(self, driver, portal: str, previous: Dict, waits=None) -> Dict:
+        """Wait until the form moves past the `previous` step, or shows a new error."""
+        def changed(driver):
+            state = self._state(driver, FLOWS[portal])
+            if state['state'] != 'open' or state.get('signature') != previous.get('signature'):
+                return state
+            new_errors = [error for error in state.get('errors', []) if error not in previous.get('errors', [])]
+            return dict(state, errors=new_errors) if new_errors else False
+
+        if waits is not None:
+            state = waits.until(f'{portal}_apply_step', changed, timeout=self.step_timeout)
+        else:
+            try:
+                state = WebDriverWait(driver, self.step_timeout, poll_frequency=0.1).until(changed)
+            except TimeoutException:
+                state = None
+        return state or {'state': 'open', 'errors': [], 'signature': previous.get('signature')}
+
+    def run(self, driver, portal: str, waits=None) -> ApplyResult:
+        """
+        Complete the form the driver has open (already switched into its
+        frame, if any) and return how it ended. `waits` is an optional
+        WaitEngine whose learned latencies are updated per step.
+        """
+        flow = FLOWS[portal]
+        filled = 0
+        for step in range(1, self.max_steps + 1):
+            started = time.perf_counter()
+            result = driver.execute_script(STEP_SCRIPT, flow, self.answers.compiled) or {}
+            filled += len(result.get('filled', []))
+            state = result.get('state')
+
+            if state == 'success':
+                return ApplyResult(self.SUBMITTED, step - 1, filled, [], [])
+            if state == 'blocked':
+                self.logger.info(f"{portal}: no answer for required questions {result['unanswered']}")
+                return ApplyResult(self.BLOCKED, step, filled, result['unanswered'], result.get('errors', []))
+            if state in ('closed', 'stuck'):
+                return ApplyResult(self.STUCK, step, filled, [], result.get('errors', []))
+
+            outcome = self._wait_for_change(driver, portal, result, waits)
+            APPLY_STEP_SECONDS.observe(time.perf_counter() - started, portal=portal)
+            if outcome['state'] == 'success' or (state == 'submitted' and outcome['state'] == 'closed'):
+                return ApplyResult(self.SUBMITTED, step, filled, [], [])
+            if outcome['state'] == 'closed':
+                return ApplyResult(self.STUCK, step, filled, [], [])
+            if outcome.get('errors'):
+                return ApplyResult(self.ERROR, step, filled, [], outcome['errors'])
+            if outcome.get('signature') == result.get('signature'):
+                # Nothing happened within step_timeout
+                return ApplyResult(self.STUCK, step, filled, [], [])
+        return ApplyResult(self.STUCK, self.max_steps, filled, [], [])
@@ -0,0 +1,275 @@
+"""
+Offline end-to-end throughput benchmark.
+
+Starts the local fixture portal, points both bots at it with a generated
+config and drives the real code paths in headless Chrome:
+
+    linkedin_login      JobApplicationBot.login_to_linkedin
+    linkedin_search     JobApplicationBot.search_linkedin_jobs (per search)
+    indeed_campaign     IndeedJobBot.run_job_search_campaign (login, search, all pages)
+    indeed_apply_form   IndeedJobBot._handle_indeed_apply_form (per application)
+
+Each stage runs once per browser mode (standard and/or lean). Per-stage
+timings, throughput, page load time, bytes transferred, Chrome RSS and
+learned wait latencies are printed and optionally written as JSON so runs
+can be compared.
+
+Usage:
+    python benchmark.py [--latency-ms 50] [--pages 3] [--jobs-per-page 10]
+                        [--captcha-rate 0] [--applications 5]
+                        [--modes standard,lean] [--output bench.json]
+"""
+import argparse
+import configparser
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from selenium import webdriver
+
+from browser import apply_browser_options, enable_resource_blocking
+from fixture_portal import FixturePortal
+from journal import read_events
+
+SEARCHES = [
+    {"keywords": "Python Developer", "location": "Remote", "filters": None},
+    {"keywords": "Software Engineer", "location": "San Francisco",
+     "filters": {"experience_level": "Entry level", "job_type": "Full-time"}},
+]
+
+def write_config(base_url: str, work_dir: str, lean: bool = False) -> str:
+    """Config pointing both bots at the fixture portal with isolated storage."""
+    path = os.path.join(work_dir, 'config.ini')
+    with open(path, 'w') as f:
+        f.write(f"""
+[LinkedIn]
+base_url = {base_url}/linkedin
+login_url = {base_url}/linkedin/login
+email = bench@example.com
+password = bench
+
+[Indeed]
+base_url = {base_url}/indeed
+auth_url = {base_url}/indeed/auth
+profile_url = {base_url}/indeed/profile
+email = bench@example.com
+password = bench
+
+[Skills]
+required = python,selenium
+preferred = pytest,jenkins,git,docker
+min_preferred = 1
+
+[SearchCriteria]
+keywords = Python Developer
+location = Remote
+
+[Browser]
+headless = true
+lean = {str(lean).lower()}
+
+[Storage]
+job_index = {os.path.join(work_dir, 'job_index.db')}
+
+[Journal]
+directory = {os.path.join(work_dir, 'journal')}
+
+[Waits]
+latency_file = {os.path.join(work_dir, 'wait_latency.json')}
+
+[Session]
+enabled = false
+""")
+    return path
+
+def headless_chrome(config_path: str) -> webdriver.Chrome:
+    """Headless Chrome with the [Browser] settings of the benchmark config."""
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    options = webdriver.ChromeOptions()
+    for argument in ('--no-sandbox', '--disable-gpu', '--disable-dev-shm-usage', '--window-size=1280,900'):
+        options.add_argument(argument)
+    apply_browser_options(options, config)
+    driver = webdriver.Chrome(options=options)
+    enable_resource_blocking(driver, config)
+    return driver
+
+def page_metrics_summary(journal_dir: str) -> Dict:
+    """Average load time and bytes, and peak Chrome RSS, from journaled page metrics."""
+    events = [e for e in read_events(journal_dir) if e.get('event') == 'page_metrics']
+    if not events:
+        return {}
+
+    def mean(key):
+        values = [e[key] for e in events if e.get(key) is not None]
+        return round(statistics.mean(values), 1) if values else None
+
+    rss = [e['chrome_rss_mb'] for e in events if e.get('chrome_rss_mb') is not None]
+    return {
+        'pages': len(events),
+        'mean_load_ms': mean('load_ms'),
+        'mean_kb': round(mean('bytes') / 1024, 1) if mean('bytes') is not None else None,
+        'mean_resources': mean('resources'),
+        'peak_chrome_rss_mb': max(rss) if rss else None
+    }
+
+class StageTimer:
+    """Collects wall-clock samples per stage."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.items: Dict[str, int] = {}
+
+    def record(self, stage: str, seconds: float, items: int = 1) -> None:
+        self.samples.setdefault(stage, []).append(seconds)
+        self.items[stage] = self.items.get(stage, 0) + items
+
+    def summary(self) -> Dict[str, Dict]:
+        result = {}
+        for stage, samples in self.samples.items():
+            total = sum(samples)
+            items = self.items.get(stage, 0)
+            result[stage] = {
+                'runs': len(samples),
+                'total_s': round(total, 3),
+                'mean_s': round(statistics.mean(samples), 3),
+                'max_s': round(max(samples), 3),
+                'items': items,
+                'items_per_min': round(items / total * 60, 1) if total else None
+            }
+        return result
+
+def bench_linkedin(config_path: str, timer: StageTimer) -> Dict:
+    from main import JobApplicationBot
+
+    driver = headless_chrome(config_path)
+    try:
+        bot = JobApplicationBot(config_path=config_path, autosave=False, driver=driver)
+        started = time.perf_counter()
+        if not bot.login_to_linkedin():
+            raise RuntimeError("LinkedIn login against the fixture portal failed")
+        timer.record('linkedin_login', time.perf_counter() - started)
+
+        for search in SEARCHES:
+            before = bot.jobs_processed
+            started = time.perf_counter()
+            bot.search_linkedin_jobs(search['keywords'], search['location'], search['filters'])
+            timer.record('linkedin_search', time.perf_counter() - started, bot.jobs_processed - before)
+
+        stats = bot.waits.tracker.stats()
+        bot.cleanup()
+        return stats
+    finally:
+        driver.quit()
+
+def bench_indeed_campaign(config_path: str, timer: StageTimer, max_applications: int) -> Dict:
+    from indeed_job_bot import IndeedJobBot
+
+    driver = headless_chrome(config_path)
+    try:
+        bot = IndeedJobBot(config_path=config_path, driver=driver)
+        started = time.perf_counter()
+        bot.run_job_search_campaign('Python Developer', 'Remote', max_applications=max_applications)
+        timer.record('indeed_campaign', time.perf_counter() - started, bot.stats['jobs_processed'])
+        timer.items['indeed_applications'] = bot.stats['applications_submitted']
+        return bot.waits.tracker.stats()
+    finally:
+        driver.quit()
+
+def bench_indeed_apply_form(config_path: str, base_url: str, timer: StageTimer, runs: int) -> None:
+    from indeed_job_bot import IndeedJobBot
+
+    driver = headless_chrome(config_path)
+    try:
+        bot = IndeedJobBot(config_path=config_path, driver=driver)
+        for run in range(runs):
+            driver.get(f'{base_url}/indeed/applyhost?jk=bench{run}')
+            started = time.perf_counter()
+            bot._handle_indeed_apply_form()
+            timer.record('indeed_apply_form', time.perf_counter() - started)
+    finally:
+        driver.quit()
+
+def print_summary(mode: str, summary: Dict, pages: Dict) -> None:
+    print(f"\n[{mode}]")
+    print(f"{'stage':<20}{'runs':>6}{'total s':>10}{'mean s':>10}{'max s':>10}{'items':>8}{'items/min':>12}")
+    for stage, row in summary.items():
+        print(f"{stage:<20}{row['runs']:>6}{row['total_s']:>10}{row['mean_s']:>10}"
+              f"{row['max_s']:>10}{row['items']:>8}{str(row['items_per_min']):>12}")
+    if pages:
+        print(f"pages: {pages['pages']}, mean load {pages['mean_load_ms']} ms, "
+              f"mean {pages['mean_kb']} KB / {pages['mean_resources']} resources, "
+              f"peak Chrome RSS {pages['peak_chrome_rss_mb']} MB")
+
+def run_mode(mode: str, base_url: str, args, stages) -> Dict:
+    """Run the selected stages with one browser mode in an isolated work dir."""
+    work_dir = tempfile.mkdtemp(prefix=f'jobbot_bench_{mode}_')
+    timer = StageTimer()
+    wait_stats = {}
+    try:
+        config_path = write_config(base_url, work_dir, lean=(mode == 'lean'))
+
+        if 'linkedin' in stages:
+            wait_stats['linkedin'] = bench_linkedin(config_path, timer)
+        if 'indeed_campaign' in stages:
+            wait_stats['indeed'] = bench_indeed_campaign(config_path, timer, args.applications)
+        if 'indeed_apply_form' in stages:
+            bench_indeed_apply_form(config_path, base_url, timer, args.applications)
+
+        return {
+            'stages': timer.summary(),
+            'applications_submitted': timer.items.get('indeed_applications', 0),
+            'page_metrics': page_metrics_summary(os.path.join(work_dir, 'journal')),
+            'wait_latencies': wait_stats
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark against the fixture portal")
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--jobs-per-page', type=int, default=10)
+    parser.add_argument('--captcha-rate', type=float, default=0.0)
+    parser.add_argument('--apply-steps', type=int, default=3)
+    parser.add_argument('--applications', type=int, default=5,
+                        help="max_applications for the Indeed campaign and runs of the apply-form stage")
+    parser.add_argument('--stages', default='linkedin,indeed_campaign,indeed_apply_form')
+    parser.add_argument('--modes', default='standard', help="Comma-separated browser modes: standard, lean")
+    parser.add_argument('--output', default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    stages = set(args.stages.split(','))
+    results = {}
+
+    portal = FixturePortal(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, pages=args.pages,
+        jobs_per_page=args.jobs_per_page, captcha_rate=args.captcha_rate,
+        apply_steps=args.apply_steps
+    )
+    try:
+        base_url = portal.start()
+        for mode in args.modes.split(','):
+            results[mode] = run_mode(mode, base_url, args, stages)
+            print_summary(mode, results[mode]['stages'], results[mode]['page_metrics'])
+    finally:
+        portal.stop()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(),
+                'parameters': vars(args),
+                'requests_served': portal.requests_served,
+                'modes': results
+            }, f, indent=4)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == '__main__':
+    main()
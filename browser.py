@@ -0,0 +1,169 @@
+import os
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+
+# URL patterns (Network.setBlockedURLs wildcard syntax) for each resource type
+# that lean mode can block
+RESOURCE_TYPE_PATTERNS = {
+    'image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*', '*.avif*'],
+    'font': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'],
+    'media': ['*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*', '*.ogg*', '*.ts?*'],
+    'stylesheet': ['*.css*'],
+}
+
+DEFAULT_BLOCKED_TYPES = 'image,font,media'
+
+# Analytics, ad and tracking hosts seen on LinkedIn and Indeed pages
+DEFAULT_BLOCKED_URLS = ','.join([
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*facebook.net*', '*connect.facebook.*',
+    '*hotjar.com*', '*px.ads.linkedin.com*', '*snap.licdn.com*',
+    '*bat.bing.com*', '*analytics.twitter.com*', '*demdex.net*',
+])
+
+PAGE_METRICS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? (nav.transferSize || 0) : 0;
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }
+return {
+    url: location.href,
+    dom_content_loaded_ms: nav ? Math.round(nav.domContentLoadedEventEnd) : null,
+    load_ms: nav && nav.loadEventEnd ? Math.round(nav.loadEventEnd) : null,
+    resources: resources.length,
+    bytes: bytes
+};
+"""
+
+def lean_mode(config) -> bool:
+    return config.getboolean('Browser', 'lean', fallback=False)
+
+def mode_name(config) -> str:
+    return 'lean' if lean_mode(config) else 'standard'
+
+def apply_browser_options(options, config) -> None:
+    """
+    Add [Browser] settings to ChromeOptions. Lean mode switches to the
+    'eager' page load strategy, disables image decoding and defaults to
+    headless; `headless` in config still overrides the default either way.
+    """
+    lean = lean_mode(config)
+    if config.getboolean('Browser', 'headless', fallback=lean):
+        options.add_argument('--headless=new')
+    if lean:
+        options.page_load_strategy = 'eager'
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--mute-audio')
+
+def chrome_options(config, profile: Optional[str] = None) -> webdriver.ChromeOptions:
+    """
+    ChromeOptions shared by the bots and the driver pool: notifications off,
+    the [BrowserOptions] switches, the [Browser] settings and, given a
+    `profile` name, that directory under the managed [Session] user_data_dir.
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument('--disable-notifications')
+    if config.has_section('BrowserOptions'):
+        for option in config['BrowserOptions']:
+            options.add_argument(option)
+    apply_browser_options(options, config)
+    user_data_dir = config.get('Session', 'user_data_dir', fallback='')
+    if profile and user_data_dir:
+        options.add_argument(f"--user-data-dir={os.path.abspath(os.path.join(user_data_dir, profile))}")
+    return options
+
+def blocked_url_patterns(config) -> List[str]:
+    """URL patterns to block in lean mode, from resource types plus explicit patterns."""
+    types = config.get('Browser', 'block_resource_types', fallback=DEFAULT_BLOCKED_TYPES)
+    urls = config.get('Browser', 'block_url_patterns', fallback=DEFAULT_BLOCKED_URLS)
+
+    patterns = []
+    for resource_type in filter(None, (t.strip().lower() for t in types.split(','))):
+        patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+    patterns.extend(p.strip() for p in urls.split(',') if p.strip())
+    return patterns
+
+def enable_resource_blocking(driver, config) -> List[str]:
+    """
+    Block resources through the DevTools protocol when lean mode is on.
+    Returns the patterns that were installed (empty when lean mode is off).
+    """
+    if not lean_mode(config):
+        return []
+    patterns = blocked_url_patterns(config)
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    return patterns
+
+def _descendant_pids(pid: int) -> List[int]:
+    """Child processes of pid via /proc (Linux only)."""
+    pids = []
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f'/proc/{current}/task/{current}/children') as f:
+                children = [int(child) for child in f.read().split()]
+        except OSError:
+            continue
+        pids.extend(children)
+        stack.extend(children)
+    return pids
+
+def chrome_rss_mb(driver) -> Optional[float]:
+    """
+    Resident memory of the browser process tree started by this driver, in
+    MB. Uses psutil when installed, /proc on Linux otherwise; None if neither
+    is available.
+    """
+    try:
+        root_pid = driver.service.process.pid
+    except AttributeError:
+        return None
+
+    try:
+        import psutil
+        try:
+            root = psutil.Process(root_pid)
+            processes = [root] + root.children(recursive=True)
+            return round(sum(p.memory_info().rss for p in processes) / (1024 * 1024), 1)
+        except psutil.Error:
+            return None
+    except ImportError:
+        pass
+
+    total = 0
+    page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+    for pid in [root_pid] + _descendant_pids(root_pid):
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return round(total / (1024 * 1024), 1) if total else None
+
+def process_rss_mb() -> Optional[float]:
+    """Resident memory of this Python process in MB (psutil or /proc), or None."""
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+    return round(pages * page_size / (1024 * 1024), 1)
+
+def page_metrics(driver, mode: str) -> Optional[Dict]:
+    """Load time, bytes transferred and Chrome RSS for the current page."""
+    metrics = driver.execute_script(PAGE_METRICS_SCRIPT)
+    if not isinstance(metrics, dict):
+        return None
+    metrics['mode'] = mode
+    metrics['chrome_rss_mb'] = chrome_rss_mb(driver)
+    return metrics
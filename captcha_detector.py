@@ -0,0 +1,111 @@
+import time
+from typing import Optional, Tuple
+
+# Installs a MutationObserver probe the first time it runs on a document and
+# returns the probe's current state. The full-page scan only happens on the
+# first call and after nodes are removed or iframe sources change; added
+# nodes are inspected incrementally as they arrive, so a repeat call on an
+# unchanged page is a single property read. Text is read from text nodes
+# rather than innerText, which would force a synchronous layout inside the
+# observer callback on busy pages.
+PROBE_SCRIPT = """
+var probe = window.__jabCaptchaProbe;
+var SKIP = {SCRIPT: 1, STYLE: 1, NOSCRIPT: 1, TEMPLATE: 1, CODE: 1};
+function hasMarker(text) {
+    return text.indexOf('Captcha') !== -1 || text.indexOf('Security Check') !== -1;
+}
+function detect(node) {
+    if (!node) { return ''; }
+    if (node.nodeType === 3) {
+        return node.parentNode && !SKIP[node.parentNode.tagName] && hasMarker(node.nodeValue) ? 'Generic' : '';
+    }
+    if (node.nodeType !== 1 || SKIP[node.tagName]) { return ''; }
+    var match = function(selector) {
+        return (node.matches && node.matches(selector)) || node.querySelector(selector);
+    };
+    if (match('iframe[src*="recaptcha"]')) { return 'reCAPTCHA'; }
+    if (match('iframe[src*="hcaptcha"]')) { return 'hCaptcha'; }
+    var walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+    for (var text = walker.nextNode(); text; text = walker.nextNode()) {
+        if (!SKIP[text.parentNode.tagName] && hasMarker(text.nodeValue)) { return 'Generic'; }
+    }
+    return '';
+}
+var installed = false;
+if (!probe) {
+    installed = true;
+    probe = window.__jabCaptchaProbe = {state: detect(document.body), rescan: false, generation: 0};
+    new MutationObserver(function(mutations) {
+        probe.generation++;
+        for (var i = 0; i < mutations.length; i++) {
+            var m = mutations[i];
+            if (m.type === 'attributes' || m.removedNodes.length) { probe.rescan = true; continue; }
+            if (probe.state) { continue; }
+            for (var j = 0; j < m.addedNodes.length; j++) {
+                var found = detect(m.addedNodes[j]);
+                if (found) { probe.state = found; break; }
+            }
+        }
+    }).observe(document.documentElement, {childList: true, subtree: true, attributes: true, attributeFilter: ['src']});
+}
+if (probe.rescan) {
+    probe.state = detect(document.body);
+    probe.rescan = false;
+}
+return {state: probe.state, generation: probe.generation, installed: installed};
+"""
+
+class CaptchaDetector:
+    """
+    Push-based CAPTCHA detection.
+
+    The browser-side probe tracks DOM changes, so each check is one cheap
+    execute_script instead of several document-wide XPath scans. Checks
+    within `cache_ttl` seconds of the previous one reuse its result without
+    touching the driver at all, until invalidate() is called; the bot calls
+    it after every navigation and click, so a new page is always probed.
+    """
+
+    def __init__(self, driver, cache_ttl: float = 1.0):
+        self.driver = driver
+        self.cache_ttl = cache_ttl
+        self._cached = None
+        self._checked_at = 0.0
+        self._episode = None
+
+    def check(self, force: bool = False) -> Optional[Tuple[bool, str]]:
+        """
+        Return (is_captcha_present, captcha_type), or None if the probe could
+        not run (e.g. the script result was unusable) and the caller should
+        fall back to scanning the DOM itself.
+        """
+        now = time.monotonic()
+        if not force and self._cached is not None and now - self._checked_at < self.cache_ttl:
+            return self._cached
+
+        result = self.driver.execute_script(PROBE_SCRIPT)
+        if not isinstance(result, dict) or not isinstance(result.get('state'), str):
+            self._cached = None
+            return None
+
+        captcha_type = result['state']
+        self._cached = (bool(captcha_type), captcha_type)
+        self._checked_at = now
+        return self._cached
+
+    def is_new_episode(self, captcha_type: str) -> bool:
+        """
+        True the first time a CAPTCHA is reported after a clear check, so
+        callers can screenshot once per episode instead of on every check.
+        """
+        if captcha_type == self._episode:
+            return False
+        self._episode = captcha_type
+        return True
+
+    def reset_episode(self) -> None:
+        self._episode = None
+
+    def invalidate(self) -> None:
+        """Drop the cached result, e.g. after navigating to a new page."""
+        self._cached = None
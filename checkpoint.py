@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+def fingerprint(value: Any) -> str:
+    """Stable short hash of a JSON-serialisable value (e.g. a search or list of searches)."""
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+class Checkpoint:
+    """
+    Position and counters of a long-running campaign, written atomically to
+    data/checkpoints/<name>.json so a crashed run can resume where it stopped.
+
+    `update` merges fields and writes at most every `every` updates; `save`
+    writes immediately (use it on page changes and on shutdown). A
+    checkpoint only resumes a run whose fingerprint matches, so editing the
+    searches starts over instead of jumping to a stale position.
+    """
+
+    def __init__(self, path: str, key: str, every: int = 5):
+        self.path = path
+        self.key = key
+        self.every = max(1, every)
+        self.state: Dict[str, Any] = {}
+        self._pending = 0
+
+    @classmethod
+    def from_config(cls, config, name: str, key: str) -> 'Checkpoint':
+        """Checkpoint `name` under [Checkpoint] directory, for the run fingerprinted by `key`."""
+        directory = config.get('Checkpoint', 'directory', fallback=os.path.join('data', 'checkpoints'))
+        return cls(
+            os.path.join(directory, f'{name}.json'),
+            key,
+            every=config.getint('Checkpoint', 'every', fallback=5)
+        )
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Saved state for this run, or None if there is none (or it belongs to another run)."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('key') != self.key:
+            return None
+        self.state = state
+        return state
+
+    def update(self, **fields) -> None:
+        """Merge fields into the state, writing it every `every` updates."""
+        self.state.update(fields)
+        self._pending += 1
+        if self._pending >= self.every:
+            self.save()
+
+    def save(self, **fields) -> None:
+        """Merge fields and write the checkpoint now."""
+        self.state.update(fields)
+        self.state['key'] = self.key
+        self.state['updated_at'] = datetime.now().isoformat()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=4)
+        os.replace(tmp_path, self.path)
+        self._pending = 0
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the campaign has finished."""
+        self.state = {}
+        self._pending = 0
+        if os.path.exists(self.path):
+            os.remove(self.path)
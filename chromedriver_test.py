@@ -1,7 +1,7 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_pool import detect_chrome_version, resolve_chromedriver
 import sys
 import platform
 
@@ -10,10 +10,11 @@ def check_chrome_setup():
     print(f"Python Version: {sys.version}")
     print(f"Platform: {platform.platform()}")
     print(f"Architecture: {platform.machine()}")
+    print(f"Detected Chrome: {detect_chrome_version() or 'not found'}")
     
     try:
         # Initialize the Chrome driver with automatic ChromeDriver management
-        service = Service(ChromeDriverManager().install())
+        service = Service(resolve_chromedriver())
         driver = webdriver.Chrome(service=service)
         
         # Get Chrome and ChromeDriver versions
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, Optional
+
+class DescriptionCache:
+    """
+    On-disk cache of job description text, so postings surfaced again by
+    overlapping searches are scored without another page load.
+
+    Entries are keyed by (portal, job_id) and point at zlib-compressed
+    bodies stored once per content hash. Entries older than `ttl` seconds
+    are treated as misses; storing the same text again just revalidates
+    them. Once the compressed bodies exceed `max_bytes`, the least recently
+    used entries are evicted.
+    """
+
+    def __init__(self, path: str = os.path.join('data', 'description_cache.db'),
+                 max_bytes: int = 64 * 1024 * 1024, ttl: float = 3 * 24 * 3600):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS bodies (
+                content_hash TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                portal TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (portal, job_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at);
+            CREATE INDEX IF NOT EXISTS idx_entries_hash ON entries (content_hash);
+        ''')
+        self._conn.commit()
+        self._size = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM bodies').fetchone()[0]
+
+    @classmethod
+    def from_config(cls, config) -> Optional['DescriptionCache']:
+        """Open the cache described by [DescriptionCache], or None if it is disabled."""
+        section = 'DescriptionCache'
+        if not config.getboolean(section, 'enabled', fallback=True):
+            return None
+        return cls(
+            config.get(section, 'path', fallback=os.path.join('data', 'description_cache.db')),
+            max_bytes=int(config.getfloat(section, 'max_mb', fallback=64) * 1024 * 1024),
+            ttl=config.getfloat(section, 'ttl_hours', fallback=72) * 3600
+        )
+
+    @staticmethod
+    def content_hash(description: str) -> str:
+        return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+    @property
+    def size(self) -> int:
+        """Compressed bytes currently stored."""
+        return self._size
+
+    def get(self, portal: str, job_id: str) -> Optional[str]:
+        """Cached description of a job, or None if missing or past its TTL."""
+        return self.get_many(portal, [job_id]).get(job_id)
+
+    def get_many(self, portal: str, job_ids: Iterable[str]) -> Dict[str, str]:
+        """Fresh cached descriptions for many jobs (e.g. a results page) at once."""
+        job_ids = list(job_ids)
+        now = time.time()
+        result = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(job_ids), 500):
+                chunk = job_ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT e.job_id, b.body FROM entries e JOIN bodies b USING (content_hash) '
+                    f'WHERE e.portal = ? AND e.fetched_at >= ? AND e.job_id IN ({placeholders})',
+                    [portal, now - self.ttl, *chunk]
+                ).fetchall()
+                result.update((job_id, zlib.decompress(body).decode('utf-8')) for job_id, body in rows)
+            if result:
+                self._conn.executemany(
+                    'UPDATE entries SET accessed_at = ? WHERE portal = ? AND job_id = ?',
+                    [(now, portal, job_id) for job_id in result]
+                )
+                self._conn.commit()
+        self.hits += len(result)
+        self.misses += len(job_ids) - len(result)
+        return result
+
+    def put(self, portal: str, job_id: str, description: str) -> str:
+        """Store (or revalidate) a job's description; returns its content hash."""
+        return self.put_many(portal, {job_id: description})[job_id]
+
+    def put_many(self, portal: str, descriptions: Dict[str, str]) -> Dict[str, str]:
+        """Store {job_id: description}; returns {job_id: content hash}."""
+        now = time.time()
+        hashes = {}
+        with self._lock:
+            for job_id, description in descriptions.items():
+                digest = hashes[job_id] = self.content_hash(description)
+                body = zlib.compress(description.encode('utf-8'), 6)
+                cursor = self._conn.execute(
+                    'INSERT OR IGNORE INTO bodies (content_hash, body, size) VALUES (?, ?, ?)',
+                    (digest, body, len(body))
+                )
+                if cursor.rowcount:
+                    self._size += len(body)
+                previous = self._conn.execute(
+                    'SELECT content_hash FROM entries WHERE portal = ? AND job_id = ?', (portal, job_id)
+                ).fetchone()
+                self._conn.execute(
+                    'INSERT INTO entries (portal, job_id, content_hash, fetched_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?) ON CONFLICT (portal, job_id) DO UPDATE SET '
+                    'content_hash = excluded.content_hash, fetched_at = excluded.fetched_at, '
+                    'accessed_at = excluded.accessed_at',
+                    (portal, job_id, digest, now, now)
+                )
+                if previous and previous[0] != digest:
+                    self._drop_orphan(previous[0])
+            self._evict()
+            self._conn.commit()
+        return hashes
+
+    def _drop_orphan(self, digest: str) -> None:
+        if self._conn.execute('SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1', (digest,)).fetchone():
+            return
+        row = self._conn.execute('SELECT size FROM bodies WHERE content_hash = ?', (digest,)).fetchone()
+        if row:
+            self._conn.execute('DELETE FROM bodies WHERE content_hash = ?', (digest,))
+            self._size -= row[0]
+
+    def _evict(self) -> int:
+        """Drop least recently used entries until the bodies fit in max_bytes."""
+        evicted = 0
+        while self._size > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT portal, job_id, content_hash FROM entries ORDER BY accessed_at LIMIT 64'
+            ).fetchall()
+            if not rows:
+                break
+            for portal, job_id, digest in rows:
+                self._conn.execute('DELETE FROM entries WHERE portal = ? AND job_id = ?', (portal, job_id))
+                self._drop_orphan(digest)
+                evicted += 1
+                if self._size <= self.max_bytes:
+                    break
+        return evicted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,156 @@
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import DESCRIPTION_FETCH_SECONDS
+
+# (attribute, value) pairs identifying the description container, in order of preference
+DESCRIPTION_SELECTORS = {
+    'indeed': [('id', 'jobDescriptionText'), ('class', 'jobsearch-JobComponent-description')],
+    'linkedin': [('class', 'show-more-less-html__markup'), ('class', 'jobs-description__content'),
+                 ('id', 'job-details')],
+}
+
+CAPTCHA_MARKERS = re.compile(r'recaptcha|hcaptcha|captcha-challenge|security check', re.IGNORECASE)
+
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+_BREAK_TAGS = {'br', 'p', 'div', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr'}
+
+class _DescriptionParser(HTMLParser):
+    """Collects the text inside the first element matching one of the selectors."""
+
+    def __init__(self, selectors: Iterable[Tuple[str, str]]):
+        super().__init__(convert_charrefs=True)
+        self.selectors = list(selectors)
+        self.parts = []
+        self.found = False
+        self._depth = 0
+
+    def _matches(self, attrs) -> bool:
+        attrs = dict(attrs)
+        for name, value in self.selectors:
+            if name == 'class' and value in (attrs.get('class') or '').split():
+                return True
+            if name != 'class' and attrs.get(name) == value:
+                return True
+        return False
+
+    def handle_starttag(self, tag, attrs):
+        if self._depth:
+            if tag in _BREAK_TAGS:
+                self.parts.append('\n')
+            if tag not in _VOID_TAGS:
+                self._depth += 1
+        elif not self.found and self._matches(attrs):
+            self.found = True
+            self._depth = 1
+
+    def handle_endtag(self, tag):
+        if self._depth and tag not in _VOID_TAGS:
+            self._depth -= 1
+
+    def handle_data(self, data):
+        if self._depth:
+            self.parts.append(data)
+
+def parse_description(html: str, selectors: Iterable[Tuple[str, str]]) -> Optional[str]:
+    """Plain text of the job description in a detail page, or None if it isn't there."""
+    parser = _DescriptionParser(selectors)
+    parser.feed(html)
+    parser.close()
+    if not parser.found:
+        return None
+    lines = (' '.join(line.split()) for line in ''.join(parser.parts).splitlines())
+    return '\n'.join(line for line in lines if line)
+
+class DescriptionFetcher:
+    """
+    Fetches job detail pages over HTTP with the browser's session cookies.
+
+    A whole results page is fetched concurrently on a pooled keep-alive
+    session, so jobs can be screened against the skill profile without
+    clicking through them in the browser. Requests go through the bot's
+    rate limiter, and CAPTCHA or blocked responses are fed back to it.
+    """
+
+    def __init__(self, portal: str, max_workers: int = 8, timeout: float = 10.0,
+                 rate_limiter=None, logger: Optional[logging.Logger] = None):
+        self.portal = portal
+        self.selectors = DESCRIPTION_SELECTORS[portal]
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.logger = logger or logging.getLogger(__name__)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'{portal}-fetch')
+        self._user_agent = None
+
+    @classmethod
+    def from_config(cls, config, portal: str, rate_limiter=None,
+                    logger: Optional[logging.Logger] = None) -> Optional['DescriptionFetcher']:
+        """Build a fetcher from [Fetcher], or None if HTTP prefetching is disabled."""
+        if not config.getboolean('Fetcher', 'enabled', fallback=True):
+            return None
+        return cls(
+            portal,
+            max_workers=config.getint('Fetcher', 'workers', fallback=8),
+            timeout=config.getfloat('Fetcher', 'timeout', fallback=10.0),
+            rate_limiter=rate_limiter,
+            logger=logger
+        )
+
+    def sync_cookies(self, driver) -> None:
+        """Copy the browser's cookies (and user agent) into the HTTP session."""
+        if self._user_agent is None:
+            self._user_agent = driver.execute_script('return navigator.userAgent;')
+            if isinstance(self._user_agent, str):
+                self.session.headers['User-Agent'] = self._user_agent
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+            )
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Description text of one detail page, or None if it couldn't be read."""
+        with DESCRIPTION_FETCH_SECONDS.time(portal=self.portal, source='http'):
+            return self._fetch(url)
+
+    def _fetch(self, url: str) -> Optional[str]:
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.Timeout:
+            if self.rate_limiter:
+                self.rate_limiter.on_timeout(url)
+            return None
+        except requests.RequestException as e:
+            self.logger.debug(f"Fetching {url} failed: {str(e)}")
+            return None
+
+        description = parse_description(response.text, self.selectors) if response.ok else None
+        if response.status_code in (403, 429) or (description is None and CAPTCHA_MARKERS.search(response.text)):
+            self.logger.warning(f"Description fetch blocked ({response.status_code}) for {url}")
+            if self.rate_limiter:
+                self.rate_limiter.on_captcha(url)
+            return None
+        if self.rate_limiter and response.ok:
+            self.rate_limiter.on_success(url)
+        return description
+
+    def fetch_many(self, urls: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """Fetch {job_id: url} concurrently; returns {job_id: description or None}."""
+        job_ids = list(urls)
+        return dict(zip(job_ids, self._executor.map(self.fetch, [urls[job_id] for job_id in job_ids])))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.session.close()
@@ -0,0 +1,265 @@
+import json
+import logging
+import os
+import queue
+import re
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from browser import chrome_options
+from metrics import CommandCounter
+
+DRIVER_CACHE_FILE = os.path.join('data', 'chromedriver_cache.json')
+
+_CHROME_BINARIES = (
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
+)
+
+_resolve_lock = threading.Lock()
+
+# Clears the current origin's web storage and returns the origin
+CLEAR_STORAGE_SCRIPT = """
+try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}
+return location.origin;
+"""
+
+def detect_chrome_version() -> Optional[str]:
+    """Return the installed Chrome version (e.g. '119.0.6045.105'), or None."""
+    if sys.platform.startswith('win'):
+        try:
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r'Software\Google\Chrome\BLBeacon')
+            return winreg.QueryValueEx(key, 'version')[0]
+        except Exception:
+            return None
+
+    for binary in _CHROME_BINARIES:
+        try:
+            output = subprocess.run(
+                [binary, '--version'], capture_output=True, text=True, timeout=5
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r'(\d+\.\d+\.\d+\.\d+)', output)
+        if match:
+            return match.group(1)
+    return None
+
+def resolve_chromedriver(cache_file: str = DRIVER_CACHE_FILE) -> str:
+    """
+    Path to a chromedriver matching the installed Chrome.
+
+    The result of ChromeDriverManager().install() is cached per Chrome
+    version, so the version check and download only happen after Chrome
+    updates (or if the cached binary disappears).
+    """
+    with _resolve_lock:
+        version = detect_chrome_version() or 'unknown'
+        cache = {}
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r') as f:
+                    cache = json.load(f)
+            except (OSError, ValueError):
+                cache = {}
+
+        entry = cache.get(version)
+        if entry and os.path.exists(entry.get('path', '')):
+            return entry['path']
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+
+        cache[version] = {'path': path, 'resolved_at': datetime.now().isoformat()}
+        directory = os.path.dirname(cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(cache_file, 'w') as f:
+            json.dump(cache, f, indent=4)
+        return path
+
+def chrome_factory(config) -> Callable[[], webdriver.Chrome]:
+    """
+    Driver factory building the same options as the bots (browser.chrome_options)
+    with the cached chromedriver. With a managed [Session] profile each live
+    pooled browser gets a profile of its own (pool-0, pool-1, ...); Chrome
+    locks a profile while it runs, and a slot is reused once its browser quits.
+    """
+    slots = {}
+    lock = threading.Lock()
+
+    def running(driver) -> bool:
+        if driver is None:
+            # Claimed by a browser that is still starting
+            return True
+        try:
+            return driver.service.process.poll() is None
+        except AttributeError:
+            return False
+
+    def create() -> webdriver.Chrome:
+        profile = None
+        if config.get('Session', 'user_data_dir', fallback=''):
+            with lock:
+                slot = 0
+                while slot in slots and running(slots[slot]):
+                    slot += 1
+                slots[slot] = None
+            profile = f'pool-{slot}'
+        try:
+            driver = webdriver.Chrome(service=Service(resolve_chromedriver()),
+                                      options=chrome_options(config, profile))
+        except Exception:
+            if profile:
+                with lock:
+                    slots.pop(slot, None)
+            raise
+        if profile:
+            with lock:
+                slots[slot] = driver
+        return driver
+    return create
+
+class DriverPool:
+    """
+    Pool of pre-spawned, health-checked Chrome drivers.
+
+    Drivers are started concurrently up front so browser startup overlaps,
+    handed out with acquire()/lease(), reset on release and replaced after
+    `max_uses` campaigns or when a health check fails.
+    """
+
+    def __init__(self, factory: Callable, size: int = 2, max_uses: int = 20,
+                 logger: Optional[logging.Logger] = None):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.logger = logger or logging.getLogger(__name__)
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._spawner = ThreadPoolExecutor(max_workers=max(1, size), thread_name_prefix='driver-spawn')
+        for _ in range(size):
+            self._spawner.submit(self._spawn)
+
+    @classmethod
+    def from_config(cls, config, size: Optional[int] = None) -> 'DriverPool':
+        """Build a pool from the optional [DriverPool] config section."""
+        return cls(
+            chrome_factory(config),
+            size=size or config.getint('DriverPool', 'size', fallback=2),
+            max_uses=config.getint('DriverPool', 'max_uses', fallback=20)
+        )
+
+    def _spawn(self) -> None:
+        try:
+            driver = self.factory()
+        except Exception as e:
+            self.logger.error(f"Failed to start pooled driver: {str(e)}")
+            return
+        with self._lock:
+            if self._closed:
+                driver.quit()
+                return
+            self._uses[id(driver)] = 0
+        self._idle.put(driver)
+
+    @staticmethod
+    def is_healthy(driver) -> bool:
+        """Cheap liveness check: the browser answers a script and has a window."""
+        try:
+            return driver.execute_script('return 1;') == 1 and bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def _retire(self, driver) -> None:
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if not self._closed:
+            try:
+                self._spawner.submit(self._spawn)
+            except RuntimeError:
+                # Pool closed concurrently
+                pass
+
+    def acquire(self, timeout: Optional[float] = 120):
+        """Take a healthy driver from the pool, waiting for one if necessary."""
+        while True:
+            try:
+                driver = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError("No pooled driver became available") from None
+            if self.is_healthy(driver):
+                return driver
+            self.logger.warning("Pooled driver failed health check, replacing it")
+            self._retire(driver)
+
+    @staticmethod
+    def reset(driver) -> None:
+        """
+        Clear the previous campaign's cookies and web storage and leave the
+        browser on about:blank, so one portal's session can't leak into the next.
+        """
+        origin = driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        # WebDriver only sees the current document's cookies; CDP clears them all
+        driver.delete_all_cookies()
+        if hasattr(driver, 'execute_cdp_cmd'):
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            if isinstance(origin, str) and origin.startswith('http'):
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        driver.get('about:blank')
+
+    def release(self, driver) -> None:
+        """Return a driver; it is reset for reuse or replaced once worn out."""
+        # The leasing bot's command counter must not count the next bot's commands
+        CommandCounter.unhook(driver)
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+        if self._closed or uses >= self.max_uses:
+            self._retire(driver)
+            return
+        try:
+            self.reset(driver)
+        except Exception as e:
+            self.logger.warning(f"Could not reset pooled driver, replacing it: {str(e)}")
+            self._retire(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = 120):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self) -> None:
+        """Quit every idle driver and stop replacing retired ones."""
+        with self._lock:
+            self._closed = True
+        self._spawner.shutdown(wait=True)
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
@@ -0,0 +1,277 @@
+"""
+Near-duplicate detection for job postings.
+
+The same role is often posted under several job IDs (weekly reposts,
+LinkedIn postings syndicated to Indeed, one listing per city). Each
+posting gets a MinHash signature of its normalized title ("card", only
+compared within the same company) and, when the description is known, of
+the description text ("content"). Signatures are banded into LSH buckets
+stored in SQLite, so a lookup is one indexed query on a handful of
+candidates no matter how many postings are stored.
+
+A posting whose signature is close enough to an earlier one joins that
+posting's cluster; the first posting of a cluster is the one worked on.
+Only postings first seen within the last `window_days` are matched, so
+the same title at the same company months later counts as a new opening;
+older postings' bucket rows are pruned when the index is opened.
+"""
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+_MASK = 0xFFFFFFFF
+_EMPTY = _MASK
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase words only, so punctuation and spacing don't matter."""
+    return ' '.join(_NON_WORD.sub(' ', (text or '').lower()).split())
+
+def card_shingles(title: Optional[str]) -> List[str]:
+    """Character 3-grams of the normalized title."""
+    text = f' {normalize(title)} '
+    return [text[i:i + 3] for i in range(len(text) - 2)] if text.strip() else []
+
+def content_shingles(description: Optional[str], size: int = 3) -> List[str]:
+    """Word `size`-grams of the normalized description."""
+    words = normalize(description).split()
+    if len(words) < size:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+def minhash(shingles: Iterable[str], num_perm: int = 128) -> Optional[array]:
+    """
+    MinHash signature by one-permutation hashing: each shingle is hashed
+    once into one of `num_perm` bins keeping the minimum per bin, and empty
+    bins borrow from the next filled bin (rotation densification). Returns
+    None for an empty shingle set.
+    """
+    bins = [_EMPTY] * num_perm
+    for shingle in shingles:
+        value = (zlib.crc32(shingle.encode()) * 0x9E3779B1) & _MASK
+        index = value % num_perm
+        if value < bins[index]:
+            bins[index] = value
+    if all(value == _EMPTY for value in bins):
+        return None
+    for index in range(num_perm):
+        offset = 0
+        while bins[(index + offset) % num_perm] == _EMPTY:
+            offset += 1
+        if offset:
+            bins[index] = (bins[(index + offset) % num_perm] + offset * 0x61C88647) & (_MASK - 1)
+    return array('I', bins)
+
+def signature_from_bytes(blob: bytes) -> array:
+    signature = array('I')
+    signature.frombytes(blob)
+    return signature
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+class DuplicateIndex:
+    """Persistent MinHash/LSH index of every posting seen, by portal and job ID."""
+
+    # Bucket rows read per lookup, bounding the cost of very common postings
+    MAX_CANDIDATES = 500
+
+    def __init__(self, path: str = os.path.join('data', 'duplicates.db'), num_perm: int = 128,
+                 bands: int = 16, threshold: float = 0.8, window_days: float = 30.0):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.window_days = window_days
+        self._lock = threading.Lock()
+        # Several portals may share the file from different threads
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS postings (
+                key TEXT PRIMARY KEY,
+                cluster TEXT NOT NULL,
+                card BLOB,
+                content BLOB,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                bucket INTEGER NOT NULL,
+                key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_buckets ON buckets (bucket);
+        ''')
+        self._conn.commit()
+        self.prune()
+
+    @classmethod
+    def from_config(cls, config) -> Optional['DuplicateIndex']:
+        """Open the index described by [Duplicates], or None if detection is disabled."""
+        section = 'Duplicates'
+        if not config.getboolean(section, 'enabled', fallback=True):
+            return None
+        return cls(
+            config.get(section, 'path', fallback=os.path.join('data', 'duplicates.db')),
+            num_perm=config.getint(section, 'num_perm', fallback=128),
+            bands=config.getint(section, 'bands', fallback=16),
+            threshold=config.getfloat(section, 'threshold', fallback=0.8),
+            window_days=config.getfloat(section, 'window_days', fallback=30.0)
+        )
+
+    def _cutoff(self) -> float:
+        """Postings first seen before this time are no longer matched."""
+        return time.time() - self.window_days * 86400 if self.window_days else 0.0
+
+    def prune(self) -> int:
+        """
+        Drop the bucket rows of postings older than the window. The postings
+        themselves stay, so a job seen again keeps its cluster. Returns the
+        number of rows removed.
+        """
+        if not self.window_days:
+            return 0
+        with self._lock:
+            removed = self._conn.execute(
+                'DELETE FROM buckets WHERE key IN (SELECT key FROM postings WHERE created_at < ?)',
+                (self._cutoff(),)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    @staticmethod
+    def key(portal: str, job_id: str) -> str:
+        return f'{portal}:{job_id}'
+
+    def _buckets(self, kind: str, signature: array, block: str = '') -> List[int]:
+        """One LSH bucket per band, as a signed 64-bit integer; `block` partitions the buckets."""
+        salt = zlib.crc32(f'{kind}|{block}'.encode())
+        buckets = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = zlib.crc32(rows, salt ^ band) << 32 | zlib.adler32(rows, salt & 0xFFFF | band << 16)
+            buckets.append(struct.unpack('q', struct.pack('Q', digest))[0])
+        return buckets
+
+    def _matches(self, kind: str, signature: array, exclude: str,
+                 block: str = '') -> List[Tuple[float, float, str, str, bool]]:
+        """
+        Recent stored postings sharing a bucket and above the threshold, best
+        first, as (-similarity, created_at, key, cluster, has_content).
+        """
+        buckets = self._buckets(kind, signature, block)
+        placeholders = ','.join('?' * len(buckets))
+        rows = self._conn.execute(
+            f'SELECT p.key, p.cluster, p.{kind}, p.card, p.content, p.created_at FROM postings p '
+            # Cap the candidates after the window filter, newest first, so
+            # stale bucket rows can't crowd recent postings out of the limit
+            f'WHERE p.key IN (SELECT b.key FROM buckets b JOIN postings q ON q.key = b.key '
+            f'WHERE b.bucket IN ({placeholders}) AND q.created_at >= ? '
+            f'ORDER BY q.created_at DESC LIMIT {self.MAX_CANDIDATES})',
+            buckets + [self._cutoff()]
+        ).fetchall()
+        matches = []
+        for key, cluster, stored, card, content, created_at in rows:
+            if key == exclude or stored is None:
+                continue
+            score = similarity(signature, signature_from_bytes(stored))
+            if score >= self.threshold:
+                matches.append((-score, created_at, key, cluster, content is not None))
+        matches.sort()
+        return matches
+
+    def check(self, portal: str, job_id: str, title: Optional[str], company: Optional[str],
+              description: Optional[str] = None) -> Optional[str]:
+        """
+        Add a posting to the index and return the key ("portal:job_id") of
+        the cluster it duplicates, or None if it is the first of its kind.
+        Postings already indexed keep their cluster; a description seen for
+        the first time is added to them.
+
+        Postings are compared on descriptions when both have one, and on
+        the title at the same company otherwise.
+        """
+        with self._lock:
+            cluster = self._check(portal, job_id, title, company, description)
+            self._conn.commit()
+        return cluster
+
+    def _check(self, portal, job_id, title, company, description) -> Optional[str]:
+        key = self.key(portal, job_id)
+        content = minhash(content_shingles(description), self.num_perm) if description else None
+        row = self._conn.execute('SELECT cluster, content FROM postings WHERE key = ?', (key,)).fetchone()
+        if row:
+            cluster, stored_content = row
+            if content is not None and stored_content is None:
+                self._conn.execute('UPDATE postings SET content = ? WHERE key = ?', (content.tobytes(), key))
+                self._add_buckets('content', content, key)
+            return cluster if cluster != key else None
+
+        card = minhash(card_shingles(title), self.num_perm)
+        company = normalize(company)
+        cluster = key
+        matches = self._matches('content', content, key) if content is not None else []
+        if not matches and card is not None:
+            # Fall back to the title at the same company, but only against
+            # postings whose description isn't known (or when this one's isn't)
+            matches = [match for match in self._matches('card', card, key, company)
+                       if content is None or not match[4]]
+        if matches:
+            cluster = matches[0][3]
+
+        self._conn.execute(
+            'INSERT INTO postings (key, cluster, card, content, created_at) VALUES (?, ?, ?, ?, ?)',
+            (key, cluster, card.tobytes() if card is not None else None,
+             content.tobytes() if content is not None else None, time.time())
+        )
+        if card is not None:
+            self._add_buckets('card', card, key, company)
+        if content is not None:
+            self._add_buckets('content', content, key)
+        return cluster if cluster != key else None
+
+    def _add_buckets(self, kind: str, signature: array, key: str, block: str = '') -> None:
+        self._conn.executemany('INSERT INTO buckets (bucket, key) VALUES (?, ?)',
+                               [(bucket, key) for bucket in self._buckets(kind, signature, block)])
+
+    def check_many(self, portal: str, records: Iterable[Dict],
+                   descriptions: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Check job records (title, company) in order, in one transaction.
+        Returns {job_id: key of the cluster it duplicates} for the duplicates.
+        """
+        descriptions = descriptions or {}
+        duplicates = {}
+        with self._lock:
+            for record in records:
+                job_id = record.get('job_id')
+                if not job_id:
+                    continue
+                cluster = self._check(portal, job_id, record.get('title'), record.get('company'),
+                                      descriptions.get(job_id))
+                if cluster:
+                    duplicates[job_id] = cluster
+            self._conn.commit()
+        return duplicates
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM postings').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
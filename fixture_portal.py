@@ -0,0 +1,414 @@
+"""
+Local stand-in for the LinkedIn and Indeed pages the bots drive.
+
+Serves login, search, results, description and apply pages with the same
+selectors the bots use, under /linkedin and /indeed on one local port.
+Response latency, pagination and CAPTCHA injection are configurable so the
+benchmark can measure throughput without touching the real sites.
+
+Usage:
+    python fixture_portal.py [--port 8765] [--latency-ms 50] [--pages 3]
+"""
+import argparse
+import hashlib
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+SKILL_VOCABULARY = (
+    'python', 'selenium', 'automation', 'pytest', 'jenkins', 'git', 'docker',
+    'javascript', 'java', 'go', 'kubernetes', 'sql', 'aws', 'react'
+)
+TITLES = ('Python Developer', 'QA Automation Engineer', 'Software Engineer',
+          'Backend Engineer', 'Test Engineer', 'Data Engineer')
+COMPANIES = ('Acme Corp', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries')
+LOCATIONS = ('Remote', 'San Francisco, CA', 'New York, NY', 'Austin, TX')
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>{title}</title></head>
+<body>
+{body}
+</body></html>"""
+
+class FixturePortal:
+    """Threaded HTTP server serving LinkedIn- and Indeed-style fixture pages."""
+
+    def __init__(self, port: int = 0, latency_ms: float = 0, jitter_ms: float = 0,
+                 pages: int = 3, jobs_per_page: int = 10, captcha_rate: float = 0.0,
+                 apply_steps: int = 3, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.pages = pages
+        self.jobs_per_page = jobs_per_page
+        self.captcha_rate = captcha_rate
+        self.apply_steps = apply_steps
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._captcha_served = set()
+        self.requests_served = 0
+        portal = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                portal._handle(self)
+
+            def do_POST(self):
+                portal._handle(self)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # Fixture data
+
+    def _digest(self, value: str) -> int:
+        return int(hashlib.sha256(value.encode()).hexdigest(), 16)
+
+    def job(self, portal: str, page: int, index: int) -> dict:
+        """Deterministic job posting for a results slot."""
+        if portal == 'linkedin':
+            job_id = str(3900000000 + page * 100 + index)
+        else:
+            job_id = hashlib.sha1(f'indeed-{page}-{index}'.encode()).hexdigest()[:16]
+        digest = self._digest(job_id)
+        skills = [skill for bit, skill in enumerate(SKILL_VOCABULARY) if digest >> bit & 1]
+        return {
+            'job_id': job_id,
+            'title': TITLES[digest % len(TITLES)],
+            'company': COMPANIES[(digest >> 8) % len(COMPANIES)],
+            'location': LOCATIONS[(digest >> 16) % len(LOCATIONS)],
+            'posted': f'{(digest >> 24) % 14 + 1} days ago',
+            'easy_apply': bool(digest >> 32 & 1),
+            'description': (
+                f"We are hiring a {TITLES[digest % len(TITLES)]}. "
+                f"You will work with {', '.join(skills) or 'our stack'}. "
+                "Competitive salary, flexible hours and a friendly team."
+            )
+        }
+
+    def _inject_captcha(self, key: str) -> bool:
+        """Serve a CAPTCHA the first time a page is requested, at captcha_rate."""
+        if self.captcha_rate <= 0 or key in self._captcha_served:
+            return False
+        with self._random_lock:
+            hit = self._random.random() < self.captcha_rate
+        if hit:
+            self._captcha_served.add(key)
+        return hit
+
+    # Request handling
+
+    def _handle(self, request: BaseHTTPRequestHandler) -> None:
+        self.requests_served += 1
+        delay = self.latency_ms
+        if self.jitter_ms:
+            with self._random_lock:
+                delay += self._random.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000.0)
+
+        url = urlparse(request.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        route = url.path.rstrip('/') or '/'
+
+        routes = {
+            '/linkedin/login': self._linkedin_login,
+            '/linkedin/feed': self._linkedin_feed,
+            '/linkedin/jobs': self._linkedin_jobs,
+            '/linkedin/jobs/search': self._linkedin_results,
+            '/indeed/auth': self._indeed_auth,
+            '/indeed/signin': self._indeed_signin,
+            '/indeed': self._indeed_home,
+            '/indeed/jobs': self._indeed_results,
+            '/indeed/viewjob': self._indeed_viewjob,
+            '/indeed/apply': self._indeed_apply,
+            '/indeed/applyhost': self._indeed_apply_host,
+        }
+        handler = routes.get(route)
+        if handler is None and route.startswith('/linkedin/jobs/view/'):
+            handler = self._linkedin_view
+        if handler is None:
+            self._send(request, 404, PAGE.format(title='Not found', body='<h1>Not found</h1>'))
+            return
+        handler(request, query)
+
+    def _send(self, request, status: int, body: str, headers: Optional[dict] = None) -> None:
+        payload = body.encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'text/html; charset=utf-8')
+        request.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def _redirect(self, request, location: str, cookie: Optional[str] = None) -> None:
+        request.send_response(302)
+        request.send_header('Location', location)
+        if cookie:
+            request.send_header('Set-Cookie', f'{cookie}; Path=/')
+        request.send_header('Content-Length', '0')
+        request.end_headers()
+
+    def _captcha_page(self, request) -> None:
+        body = ('<h1>Security Check</h1>'
+                '<iframe src="about:blank#recaptcha" title="recaptcha"></iframe>'
+                '<p>Please complete the Captcha to continue.</p>')
+        self._send(request, 200, PAGE.format(title='Security Check', body=body))
+
+    # LinkedIn
+
+    def _linkedin_login(self, request, query) -> None:
+        if request.command == 'POST':
+            length = int(request.headers.get('Content-Length') or 0)
+            request.rfile.read(length)
+            self._redirect(request, '/linkedin/feed/', cookie='li_at=fixture')
+            return
+        body = """
+<form method="post" action="/linkedin/login">
+  <input id="username" name="session_key" type="text">
+  <input id="password" name="session_password" type="password">
+  <button type="submit">Sign in</button>
+</form>"""
+        self._send(request, 200, PAGE.format(title='LinkedIn Login', body=body))
+
+    def _linkedin_feed(self, request, query) -> None:
+        if 'li_at=' not in (request.headers.get('Cookie') or ''):
+            self._redirect(request, '/linkedin/login')
+            return
+        body = '<nav class="global-nav__nav"><a href="/linkedin/jobs/">Jobs</a></nav><h1>Feed</h1>'
+        self._send(request, 200, PAGE.format(title='Feed | LinkedIn', body=body))
+
+    def _linkedin_jobs(self, request, query) -> None:
+        filters = {
+            'Experience level': ('Internship', 'Entry level', 'Associate', 'Mid-Senior level'),
+            'Job Type': ('Full-time', 'Part-time', 'Contract'),
+            'Remote': ('On-site', 'Remote', 'Hybrid'),
+            'Date posted': ('Past 24 hours', 'Past week', 'Past month'),
+        }
+        sections = ''.join(
+            f'<button type="button" onclick="this.nextElementSibling.style.display=\'block\'">{name}</button>'
+            f'<div style="display:none">'
+            + ''.join(f'<label><input type="checkbox" name="{html.escape(name)}">{value}</label>' for value in values)
+            + '</div>'
+            for name, values in filters.items()
+        )
+        body = f"""
+<form id="search" method="get" action="/linkedin/jobs/search/">
+  <input class="jobs-search-box__text-input" aria-label="Search by title, skill, or company" name="keywords"
+         onkeydown="if (event.key === 'Enter') {{ this.form.submit(); }}">
+  <input class="jobs-search-box__text-input" aria-label="City, state, or zip code" name="location">
+</form>
+<button type="button" aria-label="All filters" onclick="document.getElementById('filters').style.display='block'">All filters</button>
+<div id="filters" role="dialog" style="display:none">
+  {sections}
+  <button type="button" aria-label="Apply current filters"
+          onclick="document.getElementById('filters').style.display='none'">Show results</button>
+</div>"""
+        self._send(request, 200, PAGE.format(title='Jobs | LinkedIn', body=body))
+
+    def _linkedin_results(self, request, query) -> None:
+        start = int(query.get('start', 0))
+        page = start // self.jobs_per_page
+        if self._inject_captcha(f'linkedin:{request.path}'):
+            self._captcha_page(request)
+            return
+        cards = []
+        if page < self.pages:
+            for index in range(self.jobs_per_page):
+                job = self.job('linkedin', page, index)
+                easy_apply = '<span class="job-posting-benefits">Easy Apply</span>' if job['easy_apply'] else ''
+                cards.append(f"""
+<li><div class="base-card" data-entity-urn="urn:li:jobPosting:{job['job_id']}">
+  <a class="base-card__full-link" href="/linkedin/jobs/view/{job['job_id']}/">{html.escape(job['title'])}</a>
+  <h3 class="base-search-card__title">{html.escape(job['title'])}</h3>
+  <h4 class="base-search-card__subtitle">{html.escape(job['company'])}</h4>
+  <span class="job-search-card__location">{html.escape(job['location'])}</span>
+  <time datetime="2026-10-01">{job['posted']}</time>{easy_apply}
+</div></li>""")
+        next_link = ''
+        if page + 1 < self.pages:
+            next_query = dict(query, start=str(start + self.jobs_per_page))
+            next_link = f'<a aria-label="Next" href="/linkedin/jobs/search/?{urlencode(next_query)}">Next</a>'
+        body = f'<ul class="jobs-search__results-list">{"".join(cards)}</ul>{next_link}'
+        self._send(request, 200, PAGE.format(title='Job Search | LinkedIn', body=body))
+
+    def _linkedin_view(self, request, query) -> None:
+        job_id = request.path.rstrip('/').split('/')[-1]
+        digest_page, index = divmod(int(job_id) - 3900000000, 100)
+        job = self.job('linkedin', digest_page, index)
+        body = (f'<h1 class="top-card-layout__title">{html.escape(job["title"])}</h1>'
+                f'<div class="show-more-less-html__markup">{html.escape(job["description"])}</div>')
+        self._send(request, 200, PAGE.format(title=job['title'], body=body))
+
+    # Indeed
+
+    def _indeed_auth(self, request, query) -> None:
+        body = """
+<input id="ifl-InputFormField-3" name="email" type="email">
+<button type="button" onclick="showPasswordStep()">Continue</button>
+<div id="password-step"></div>
+<script>
+function showPasswordStep() {
+  setTimeout(function() {
+    document.getElementById('password-step').innerHTML =
+      '<input id="ifl-InputFormField-7" type="password">' +
+      '<button type="button" onclick="location.href=\\'/indeed/signin\\'">Sign in</button>';
+  }, 50);
+}
+</script>"""
+        self._send(request, 200, PAGE.format(title='Sign In | Indeed', body=body))
+
+    def _indeed_signin(self, request, query) -> None:
+        self._redirect(request, '/indeed/', cookie='CTK=fixture')
+
+    def _indeed_home(self, request, query) -> None:
+        body = """
+<input id="text-input-what" type="text">
+<input id="text-input-where" type="text">
+<button type="button" class="yosegi-InlineWhatWhere-primaryButton" onclick="
+  location.href = '/indeed/jobs?q=' + encodeURIComponent(document.getElementById('text-input-what').value) +
+                  '&l=' + encodeURIComponent(document.getElementById('text-input-where').value);">Find jobs</button>"""
+        self._send(request, 200, PAGE.format(title='Job Search | Indeed', body=body))
+
+    def _indeed_results(self, request, query) -> None:
+        start = int(query.get('start', 0))
+        page = start // self.jobs_per_page
+        if self._inject_captcha(f'indeed:{request.path}'):
+            self._captcha_page(request)
+            return
+        cards = []
+        if page < self.pages:
+            for index in range(self.jobs_per_page):
+                job = self.job('indeed', page, index)
+                easy_apply = '<span class="iaLabel">Easily apply</span>' if job['easy_apply'] else ''
+                cards.append(f"""
+<div class="job_seen_beacon" onclick="openJob('{job['job_id']}')">
+  <h2 class="jobTitle"><a class="jcs-JobTitle" data-jk="{job['job_id']}"><span title="{html.escape(job['title'])}">{html.escape(job['title'])}</span></a></h2>
+  <span data-testid="company-name">{html.escape(job['company'])}</span>
+  <div data-testid="text-location">{html.escape(job['location'])}</div>
+  <span class="date">{job['posted']}</span>{easy_apply}
+</div>""")
+        next_link = ''
+        if page + 1 < self.pages:
+            next_query = dict(query, start=str(start + self.jobs_per_page))
+            next_link = f'<a aria-label="Next Page" href="/indeed/jobs?{urlencode(next_query)}">Next</a>'
+        body = f"""
+<div id="mosaic-jobResults">{''.join(cards)}</div>
+<div id="viewJobPane"></div>
+{next_link}
+<script>
+function openJob(jk) {{
+  fetch('/indeed/viewjob?fragment=1&jk=' + jk).then(function(r) {{ return r.text(); }}).then(function(markup) {{
+    document.getElementById('viewJobPane').innerHTML = markup;
+  }});
+}}
+function openApply(jk) {{
+  var frame = document.createElement('iframe');
+  frame.className = 'indeed-apply-iframe';
+  frame.src = '/indeed/apply?step=1&jk=' + jk;
+  document.getElementById('viewJobPane').appendChild(frame);
+}}
+</script>"""
+        self._send(request, 200, PAGE.format(title='Jobs | Indeed', body=body))
+
+    def _find_indeed_job(self, job_id: str) -> Optional[dict]:
+        for page in range(self.pages):
+            for index in range(self.jobs_per_page):
+                job = self.job('indeed', page, index)
+                if job['job_id'] == job_id:
+                    return job
+        return None
+
+    def _indeed_viewjob(self, request, query) -> None:
+        job = self._find_indeed_job(query.get('jk', ''))
+        if job is None:
+            self._send(request, 404, PAGE.format(title='Not found', body='<h1>Job not found</h1>'))
+            return
+        fragment = (
+            f'<h1 class="jobsearch-JobInfoHeader-title">{html.escape(job["title"])}</h1>'
+            f'<div id="jobDescriptionText" class="jobsearch-JobComponent-description">{html.escape(job["description"])}</div>'
+            f'<button type="button" class="jobsearch-IndeedApplyButton-newDesign" '
+            f'onclick="openApply(\'{job["job_id"]}\')">Apply now</button>'
+        )
+        if query.get('fragment'):
+            self._send(request, 200, fragment)
+        else:
+            self._send(request, 200, PAGE.format(title=job['title'], body=fragment))
+
+    def _indeed_apply(self, request, query) -> None:
+        step = query.get('step', '1')
+        job_id = query.get('jk', '')
+        if step == 'done':
+            body = '<h1>Your application has been submitted!</h1>'
+        else:
+            number = int(step)
+            last = number >= self.apply_steps
+            next_step = 'done' if last else str(number + 1)
+            label = 'Submit your application' if last else 'Continue'
+            body = f"""
+<form>
+  <label for="q{number}">Question {number}</label>
+  <input id="q{number}" name="q{number}" type="text">
+  <button type="button" onclick="location.href='/indeed/apply?step={next_step}&jk={job_id}'">{label}</button>
+</form>"""
+        self._send(request, 200, PAGE.format(title='Apply | Indeed', body=body))
+
+    def _indeed_apply_host(self, request, query) -> None:
+        """Page that only hosts an apply iframe, for timing the form handler alone."""
+        job_id = html.escape(query.get('jk', 'fixture'))
+        body = f'<iframe class="indeed-apply-iframe" src="/indeed/apply?step=1&jk={job_id}"></iframe>'
+        self._send(request, 200, PAGE.format(title='Apply | Indeed', body=body))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the local fixture portal")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--jobs-per-page', type=int, default=10)
+    parser.add_argument('--captcha-rate', type=float, default=0.0)
+    parser.add_argument('--apply-steps', type=int, default=3)
+    args = parser.parse_args()
+
+    portal = FixturePortal(
+        port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        pages=args.pages, jobs_per_page=args.jobs_per_page,
+        captcha_rate=args.captcha_rate, apply_steps=args.apply_steps
+    )
+    print(f"Fixture portal serving LinkedIn at {portal.base_url}/linkedin and Indeed at {portal.base_url}/indeed")
+    try:
+        portal.server.serve_forever()
+    except KeyboardInterrupt:
+        portal.stop()
+
+if __name__ == '__main__':
+    main()
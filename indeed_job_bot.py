@@ -5,49 +5,175 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.chrome.service import Service
 import configparser
+from skill_matcher import SkillMatcher
+from job_index import JobIndex
+from wait_engine import LatencyTracker, WaitEngine
+from job_extractor import extract_job_cards
+from journal import ApplicationJournal
+from session_store import SessionStore
+from rate_limiter import AdaptiveRateLimiter, throttled, unwrap
+from captcha_detector import CaptchaDetector
+from log_setup import setup_logging
+from metrics import (CAPTCHA_CHECK_SECONDS, CAPTCHAS_DETECTED, DESCRIPTION_FETCH_SECONDS,
+                     PAGE_WAIT_SECONDS, SKILL_MATCH_SECONDS,
+                     CommandCounter, start_exporter)
+from driver_pool import resolve_chromedriver
+from search_plan import build_search_plan
+from portals import IndeedPortal
+from description_fetcher import DescriptionFetcher
+from description_cache import DescriptionCache
+from duplicates import DuplicateIndex
+from page_prefetch import PagePrefetcher
+from apply_form import ApplyFormEngine, ApplyResult
+from recycling import RecyclePolicy, add_cookies, log_recycle, memory_snapshot, restart_driver, spill_jobs
+from browser import chrome_options, chrome_rss_mb, enable_resource_blocking, mode_name, page_metrics
+import os
+
+INDEED_BASE_URL = "https://www.indeed.com"
+INDEED_AUTH_URL = "https://secure.indeed.com/auth"
+INDEED_PROFILE_URL = "https://profile.indeed.com/"
+INDEED_LOGIN_MARKERS = ('secure.indeed.com/auth', '/account/login')
 
 class IndeedJobBot:
-    def __init__(self, config_path='config.ini'):
-        # Set up logging
-        logging.basicConfig(
-            filename=f'indeed_applications_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-        
-        # Load configuration
+    def __init__(self, config_path='config.ini', driver=None):
+        # Load configuration; logging is configured once per process from it
         self.config = self._load_config(config_path)
+        setup_logging(self.config)
+        self.base_url = self.config.get('Indeed', 'base_url', fallback=INDEED_BASE_URL).rstrip('/')
+        self.auth_url = self.config.get('Indeed', 'auth_url', fallback=INDEED_AUTH_URL)
+        self.profile_url = self.config.get('Indeed', 'profile_url', fallback=INDEED_PROFILE_URL)
+        self.skill_matcher = SkillMatcher.from_config(self.config)
+        self.apply_form = ApplyFormEngine.from_config(self.config)
+        
+        # Pipelined pagination: results pages loaded this many pages ahead
+        # in a second browser (0 reads them in the main browser)
+        self.prefetch_pages = self.config.getint('Pagination', 'prefetch_pages', fallback=0)
+        self.page_driver_factory = lambda: self._new_chrome(profile=False)
+        self.prefetcher = None
         
-        # Initialize Chrome options
-        chrome_options = webdriver.ChromeOptions()
-        if self.config.getboolean('Browser', 'headless', fallback=False):
-            chrome_options.add_argument('--headless')
+        # Restart the browser after many pages or once Chrome grows too large
+        self.recycle_policy = RecyclePolicy.from_config(self.config)
+        self.driver_factory = self._new_chrome
+        self.pages_since_recycle = 0
+        self.recycles = 0
         
-        # Initialize the webdriver
-        self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=chrome_options
+        # Use a provided (e.g. pooled) driver as-is; the bot won't quit it
+        self._owns_driver = driver is None
+        self.driver = driver if driver is not None else self._new_chrome()
+        
+        # Count WebDriver commands and export hot-path metrics
+        self.metrics_exporter = start_exporter(self.config)
+        self.command_counter = CommandCounter(self.driver, 'indeed')
+        
+        # Every navigation and click goes through the per-host rate limiter;
+        # either may load a new document, so the CAPTCHA result is dropped
+        self.rate_limiter = AdaptiveRateLimiter.from_config(self.config)
+        self.driver = throttled(self.driver, self.rate_limiter, on_page_change=self._page_changed)
+        self.captcha_detector = CaptchaDetector(
+            self.driver,
+            cache_ttl=self.config.getfloat('Captcha', 'cache_ttl', fallback=1.0)
         )
-        self.driver.maximize_window()
         
-        # Initialize results tracking
-        self.applications_submitted = 0
-        self.jobs_processed = 0
+        # Lean mode: block images, fonts, media and trackers via CDP
+        try:
+            blocked = enable_resource_blocking(self.driver, self.config)
+            if blocked:
+                logging.info(f"Lean mode: blocking {len(blocked)} resource URL patterns")
+        except Exception as e:
+            logging.warning(f"Could not enable resource blocking: {str(e)}")
         
+        # Event-driven waits with latencies learned across runs
+        self.latency_file = self.config.get('Waits', 'latency_file', fallback='data/wait_latency.json')
+        tracker = LatencyTracker.from_config(self.config)
+        try:
+            tracker.load(self.latency_file)
+        except Exception as e:
+            logging.warning(f"Could not load wait latencies: {str(e)}")
+        self.waits = WaitEngine(self.driver, tracker, rate_limiter=self.rate_limiter)
+        
+        # Screens job descriptions over HTTP so the browser only opens matches
+        self.fetcher = DescriptionFetcher.from_config(self.config, 'indeed', self.rate_limiter)
+        self.description_cache = DescriptionCache.from_config(self.config)
+        self.duplicates = DuplicateIndex.from_config(self.config)
+        
+        # Campaign counters, shared with the IndeedPortal that runs the campaign
+        self.stats = {'jobs_processed': 0, 'jobs_skipped': 0, 'applications_submitted': 0}
+        self.search_results = []
+        self.search_plan = None
+        self.checkpoint = None
+        self.run_lineage = []
+        self.page_number = 0
+        self.page_url = None
+        self.job_index = JobIndex.from_config(self.config)
+        self.journal = ApplicationJournal.from_config(self.config)
+        self.session_store = SessionStore.from_config(self.config)
+        self.login_stats = {}
+        
+    def _new_chrome(self, profile=True):
+        """Start a Chrome configured from [Browser] (and the managed [Session] profile, if any)"""
+        # A managed profile keeps the Indeed session between runs natively
+        options = chrome_options(self.config, 'indeed' if profile else None)
+        
+        # Initialize the webdriver; the chromedriver path is cached per Chrome version
+        driver = webdriver.Chrome(
+            service=Service(resolve_chromedriver()),
+            options=options
+        )
+        driver.maximize_window()
+        return driver
+
     def _load_config(self, config_path):
         """Load configuration from INI file"""
         config = configparser.ConfigParser()
         config.read(config_path)
         return config
 
+    def _restore_session(self):
+        """Reuse a saved or profile-held Indeed session if it is still valid"""
+        if self.session_store is None:
+            return False
+        
+        account = self.config['Indeed']['email']
+        try:
+            # Only a browser this bot started runs in the Indeed profile
+            managed_profile = self._owns_driver and bool(self.config.get('Session', 'user_data_dir', fallback=''))
+            if not managed_profile and not self.session_store.restore(
+                    self.driver, 'indeed', account, f"{self.base_url}/"):
+                return False
+            
+            if self.session_store.validate(self.driver, self.profile_url, INDEED_LOGIN_MARKERS):
+                logging.info("Restored saved Indeed session")
+                return True
+            
+            logging.info("Saved Indeed session has expired, falling back to form login")
+            self.session_store.clear('indeed', account)
+            self.driver.delete_all_cookies()
+            
+        except Exception as e:
+            logging.warning(f"Could not restore Indeed session: {str(e)}")
+        return False
+
+    def _record_login(self, mode, started):
+        """Log and journal how long login took and whether it was warm or cold"""
+        elapsed = time.monotonic() - started
+        self.login_stats['Indeed'] = {'mode': mode, 'seconds': round(elapsed, 3)}
+        logging.info(f"Indeed login completed ({mode} start) in {elapsed:.2f}s")
+        self.journal.append('login', portal='Indeed', mode=mode, seconds=round(elapsed, 3))
+
     def login_to_indeed(self):
         """Login to Indeed"""
         try:
-            self.driver.get("https://secure.indeed.com/auth")
+            started = time.monotonic()
+            
+            # Warm start: skip the form entirely if a saved session still works
+            if self._restore_session():
+                self._record_login('warm', started)
+                return True
+            
+            self.driver.get(self.auth_url)
             
             # Wait for and enter email
             email_field = WebDriverWait(self.driver, 10).until(
@@ -67,38 +193,41 @@ class IndeedJobBot:
             
             # Click sign in button
             sign_in_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Sign in')]")
+            login_url = self.driver.current_url
             sign_in_button.click()
             
-            time.sleep(3)  # Wait for login to complete
+            # Wait for the redirect away from the sign-in page
+            if not self.waits.until_url_changes('indeed_login', login_url):
+                logging.error("Failed to login to Indeed: still on the sign-in page")
+                return False
             logging.info("Successfully logged into Indeed")
+            
+            if self.session_store is not None:
+                try:
+                    self.session_store.save(self.driver, 'indeed', self.config['Indeed']['email'])
+                except Exception as e:
+                    logging.warning(f"Could not save Indeed session: {str(e)}")
+            self._record_login('cold', started)
             return True
             
         except Exception as e:
             logging.error(f"Failed to login to Indeed: {str(e)}")
             return False
 
-    def search_jobs(self, keywords, location=None):
-        """Search for jobs based on keywords and location"""
+    def search_jobs(self, keywords, location=None, filters=None, navigate=True):
+        """
+        Search for jobs based on keywords, location and optional filters.
+        With navigate=False only the search plan is built, for a page
+        prefetcher to open.
+        """
         try:
-            # Navigate to Indeed search page
-            self.driver.get("https://www.indeed.com")
-            
-            # Enter keywords
-            what_field = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "text-input-what"))
-            )
-            what_field.clear()
-            what_field.send_keys(keywords)
-            
-            # Enter location if provided
-            if location:
-                where_field = self.driver.find_element(By.ID, "text-input-where")
-                where_field.clear()
-                where_field.send_keys(location)
-            
-            # Click search button
-            search_button = self.driver.find_element(By.CLASS_NAME, "yosegi-InlineWhatWhere-primaryButton")
-            search_button.click()
+            # The whole search is one navigation to the results URL
+            self.search_plan = build_search_plan('indeed', self.base_url, keywords, location, filters)
+            if self.search_plan.unmapped:
+                logging.warning(f"Ignoring filters Indeed search URLs can't express: {self.search_plan.unmapped}")
+            if navigate:
+                self.driver.get(self.search_plan.url)
+                self.check_for_captcha()
             
             logging.info(f"Performed job search for '{keywords}' in {location if location else 'any location'}")
             return True
@@ -109,126 +238,415 @@ class IndeedJobBot:
 
     def filter_job_posting(self, job_description):
         """Filter job posting based on requirements and keywords"""
-        required_skills = set(self.config['Skills']['required'].split(','))
-        preferred_skills = set(self.config['Skills']['preferred'].split(','))
-        
-        # Convert job description to lowercase for case-insensitive matching
-        job_description = job_description.lower()
-        
-        # Check if all required skills are present
-        if not all(skill.lower() in job_description for skill in required_skills):
-            return False
+        with SKILL_MATCH_SECONDS.time(portal='indeed'):
+            return self.skill_matcher.match(job_description).passed
+
+    def filter_job_postings(self, job_descriptions):
+        """Filter a batch of job descriptions, returning one boolean per description"""
+        with SKILL_MATCH_SECONDS.time(portal='indeed'):
+            return [match.passed for match in self.skill_matcher.match_many(job_descriptions)]
+
+    def description_url(self, job_id):
+        """Job detail page for a job key"""
+        return f"{self.base_url}/viewjob?jk={job_id}"
+
+    def record_page_metrics(self, stage, driver=None):
+        """Log and journal load time, bytes transferred and Chrome RSS for the current page"""
+        try:
+            metrics = page_metrics(driver or self.driver, mode_name(self.config))
+        except Exception as e:
+            logging.debug(f"Could not read page metrics: {str(e)}")
+            return None
+        if metrics is None:
+            return None
         
-        # Count preferred skills
-        preferred_matches = sum(1 for skill in preferred_skills 
-                              if skill.lower() in job_description)
+        logging.info(
+            f"Page metrics [{metrics['mode']}] {stage}: load {metrics['load_ms']}ms, "
+            f"{metrics['bytes'] / 1024:.0f} KB in {metrics['resources']} resources, "
+            f"Chrome RSS {metrics['chrome_rss_mb']} MB"
+        )
+        self.journal.append('page_metrics', stage=stage, **metrics)
+        return metrics
+
+    def _get_job_id(self, job_card):
+        """Read Indeed's job key (data-jk) from a results card"""
+        try:
+            return job_card.find_element(By.CSS_SELECTOR, "a[data-jk]").get_attribute("data-jk")
+        except NoSuchElementException:
+            return None
+
+    def open_job(self, job_card):
+        """Open a results card and return its description text"""
+        # Click on job card to view details and wait for the previous
+        # description (if any) to be replaced
+        previous = self.driver.find_elements(By.CLASS_NAME, "jobsearch-JobComponent-description")
+        job_card.click()
+        if previous:
+            self.waits.until_stale('indeed_job_card_click', previous[0])
         
-        # Return True if enough preferred skills are present
-        min_preferred = int(self.config['Skills']['min_preferred'])
-        return preferred_matches >= min_preferred
+        # Get job description
+        return self._read_description()
+
+    def open_job_page(self, job_id):
+        """Open a job's own page (which has the apply button) and return its description text"""
+        self.pages_since_recycle += 1
+        self.driver.get(self.description_url(job_id))
+        self.check_for_captcha()
+        return self._read_description()
 
-    def apply_to_job(self, job_card):
-        """Apply to a specific job"""
+    def _read_description(self):
+        """Wait for the open job's description and return its text"""
         try:
-            # Click on job card to view details
-            job_card.click()
-            time.sleep(2)
-            
-            # Get job description
-            job_description = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "jobsearch-JobComponent-description"))
-            ).text
-            
-            # Check if job matches criteria
-            if not self.filter_job_posting(job_description):
-                logging.info("Job doesn't match required criteria")
-                return False
-            
-            # Click apply button
-            apply_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CLASS_NAME, "jobsearch-IndeedApplyButton-newDesign"))
-            )
-            apply_button.click()
-            
-            # Handle Indeed Easy Apply form
-            self._handle_indeed_apply_form()
-            
-            self.applications_submitted += 1
-            logging.info("Successfully applied to job")
-            return True
-            
-        except Exception as e:
-            logging.error(f"Failed to apply to job: {str(e)}")
-            return False
+            with DESCRIPTION_FETCH_SECONDS.time(portal='indeed', source='browser'):
+                return WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "jobsearch-JobComponent-description"))
+                ).text
+        except TimeoutException:
+            # A CAPTCHA page has no description; report it before giving up on the job
+            self.check_for_captcha(force=True)
+            raise
+
+    def _page_changed(self):
+        """Called by the throttled driver after each navigation and click"""
+        detector = getattr(self, 'captcha_detector', None)
+        if detector is not None:
+            detector.invalidate()
+
+    def check_for_captcha(self, driver=None, force=False):
+        """
+        Check the main browser (or `driver`, e.g. the prefetcher's) for a
+        CAPTCHA and slow the Indeed rate limit on each new one. Returns a
+        tuple of (is_captcha_present, captcha_type).
+        """
+        main = driver is None or driver is self.driver
+        # The prefetcher's browser gets a one-off probe; its results aren't cached
+        detector = self.captcha_detector if main else CaptchaDetector(driver, cache_ttl=0)
+        with CAPTCHA_CHECK_SECONDS.time(portal='indeed'):
+            try:
+                result = detector.check(force=force)
+            except Exception as e:
+                logging.error(f"Error checking for CAPTCHA: {str(e)}")
+                return False, ""
+        if not result or not result[0]:
+            detector.reset_episode()
+            return False, ""
+        
+        captcha_type = result[1]
+        if detector.is_new_episode(captcha_type) or not main:
+            logging.warning(f"{captcha_type} detected on Indeed")
+            CAPTCHAS_DETECTED.inc(portal='indeed', type=captcha_type)
+            self.rate_limiter.on_captcha(self.base_url)
+        return True, captcha_type
+
+    def submit_application(self, job_id=None):
+        """
+        Apply to the job currently open and return the form's ApplyResult.
+        The outcome, with any questions left unanswered, is journaled.
+        """
+        # Click apply button
+        apply_button = WebDriverWait(self.driver, 10).until(
+            EC.element_to_be_clickable((By.CLASS_NAME, "jobsearch-IndeedApplyButton-newDesign"))
+        )
+        apply_button.click()
+        
+        # Handle Indeed Easy Apply form
+        result = self._handle_indeed_apply_form()
+        self.journal.append('apply_form', portal='indeed', job_id=job_id, **result._asdict())
+        if not result.submitted:
+            logging.warning(f"Application not submitted ({result.status}); "
+                            f"unanswered: {result.unanswered or 'none'}, errors: {result.errors or 'none'}")
+        return result
 
     def _handle_indeed_apply_form(self):
-        """Handle Indeed's Easy Apply form"""
+        """Fill and submit Indeed's Easy Apply form, step by step, inside its iframe"""
         try:
             # Switch to the application iframe
             iframe = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "indeed-apply-iframe"))
             )
-            self.driver.switch_to.frame(iframe)
-            
-            # Handle each step of the application
-            while True:
-                # Look for continue button
-                try:
-                    continue_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Continue') or contains(text(), 'Submit')]"))
-                    )
-                    continue_button.click()
-                    time.sleep(1)
-                except TimeoutException:
-                    break
-            
-            # Switch back to main content
-            self.driver.switch_to.default_content()
+            self.driver.switch_to.frame(unwrap(iframe))
+            return self.apply_form.run(self.driver, 'indeed', self.waits)
             
         except Exception as e:
             logging.error(f"Error handling application form: {str(e)}")
+            return ApplyResult(ApplyFormEngine.ERROR, 0, 0, [], [str(e)])
+        finally:
+            # Switch back to main content
             self.driver.switch_to.default_content()
 
-    def run_job_search_campaign(self, keywords, location=None, max_applications=50):
-        """Run a complete job application campaign"""
+    def begin_search(self, keywords, location=None, filters=None):
+        """Start a search_results entry for a search and journal it; returns (entry, search_id)"""
+        search_entry = {
+            'timestamp': datetime.now().isoformat(),
+            'keywords': keywords,
+            'location': location,
+            'filters': filters,
+            'url': self.search_plan.url if self.search_plan else None,
+            'jobs': []
+        }
+        self.search_results.append(search_entry)
+        search_id = len(self.search_results)
+        self.journal.append('search_result', search_id=search_id, entry=search_entry)
+        return search_entry, search_id
+
+    def read_results_page(self, driver):
+        """
+        Read the results page `driver` is on. Returns (job_cards, records,
+        extracted); extracted is False when the records had to be rebuilt
+        from the cards' job keys alone.
+        """
+        # Get list of job results
         try:
-            if not self.login_to_indeed():
-                return False
-            
-            if not self.search_jobs(keywords, location):
+            job_cards = WebDriverWait(driver, 10).until(
+                EC.presence_of_all_elements_located(
+                    (By.CLASS_NAME, "job_seen_beacon")
+                )
+            )
+        except TimeoutException:
+            # A CAPTCHA page has no results; report it before giving up on the page
+            self.check_for_captcha(driver, force=True)
+            raise
+        
+        self.record_page_metrics('indeed_results_page', driver)
+        
+        # Read every card's details in one roundtrip; fall back to
+        # per-card lookups if the records don't line up with the cards
+        records = extract_job_cards(driver, 'indeed')
+        if len(records) != len(job_cards):
+            return job_cards, [{'job_id': self._get_job_id(job_card)} for job_card in job_cards], False
+        return job_cards, records, True
+
+    def next_results_page(self, driver, waits, job_cards):
+        """Click through to the next results page; False on the last page"""
+        try:
+            next_button = driver.find_element(By.XPATH, "//a[contains(@aria-label, 'Next')]")
+            if not next_button.is_enabled():
                 return False
+            next_button.click()
+            if waits.until_stale('indeed_next_page', job_cards[0]):
+                return True
+            # The old results are still there; give the page the longest wait
+            # before ending the search rather than re-reading them as the next page
+            if waits.until_stale('indeed_next_page', job_cards[0], timeout=waits.tracker.max_timeout):
+                return True
+            logging.warning("Next results page did not load, ending the search here")
+            return False
+        except NoSuchElementException:
+            return False
+
+    def register_page(self, search_entry, search_id, records, extracted, page_url):
+        """Journal a results page's jobs and checkpoint the page so a crashed run can resume there"""
+        if extracted:
+            search_entry['jobs'].extend(records)
+            self.journal.append('jobs_found', search_id=search_id, jobs=records)
+            # The journal has every record; memory keeps only the newest
+            if self.recycle_policy:
+                spill_jobs(search_entry, self.recycle_policy.max_buffered_jobs)
+        
+        self.page_number += 1
+        if self.checkpoint:
+            self.page_url = page_url
+            self.checkpoint.save(page=self.page_number, page_url=self.page_url, last_job_id=None,
+                                 runs=self.run_lineage, **self.counters())
+
+    def iter_result_pages(self, search_entry, search_id):
+        """
+        Yield (job_cards, records) for each results page of the current search.
+        The next page is only loaded when the caller asks for it, so breaking
+        out of the loop leaves the browser on the current page.
+        """
+        while True:
+            job_cards, records, extracted = self.read_results_page(self.driver)
+            self.register_page(search_entry, search_id, records, extracted, self.driver.current_url)
             
-            while self.applications_submitted < max_applications:
-                # Get list of job results
-                job_cards = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_all_elements_located(
-                        (By.CLASS_NAME, "job_seen_beacon")
-                    )
-                )
-                
-                for job_card in job_cards:
-                    if self.applications_submitted >= max_applications:
-                        break
-                    
-                    self.jobs_processed += 1
-                    self.apply_to_job(job_card)
-                    time.sleep(2)
-                
-                # Try to click next page
-                try:
-                    next_button = self.driver.find_element(By.XPATH, "//a[contains(@aria-label, 'Next')]")
-                    if not next_button.is_enabled():
-                        break
-                    next_button.click()
-                    time.sleep(2)
-                except NoSuchElementException:
-                    break
+            yield job_cards, records
             
+            if not self.next_results_page(self.driver, self.waits, job_cards):
+                return
+            # The old page's elements are stale; don't keep them alive
+            job_cards = records = None
+            self.pages_since_recycle += 1
+            self.maybe_recycle(self.driver.current_url)
+
+    def _start_driver(self, factory, attach_counter=False, on_page_change=None):
+        """Start a throttled, lean browser from `factory`"""
+        raw = factory()
+        if attach_counter:
+            self.command_counter.attach(raw)
+        driver = throttled(raw, self.rate_limiter, on_page_change=on_page_change)
+        try:
+            enable_resource_blocking(driver, self.config)
+        except Exception as e:
+            logging.warning(f"Could not enable resource blocking: {str(e)}")
+        return driver
+
+    def _start_main_driver(self):
+        """Start a new main browser to replace a recycled one and rebind the waits and detector to it"""
+        self.driver = self._start_driver(self.driver_factory, attach_counter=True,
+                                         on_page_change=self._page_changed)
+        self.waits.driver = self.driver
+        self.captcha_detector.driver = self.driver
+        self.captcha_detector.invalidate()
+        return self.driver
+
+    def open_page_driver(self):
+        """Second browser for pipelined pagination, signed in with the main browser's cookies"""
+        driver = self._start_driver(self.page_driver_factory)
+        add_cookies(driver, self.base_url, self.driver.get_cookies())
+        return driver
+
+    def _log_recycle(self, browser, reason, pages, before, driver):
+        """Log and journal the memory released by a browser restart"""
+        self.recycles += 1
+        log_recycle(logging.getLogger(), self.journal, browser, reason, pages, before, driver,
+                    f", {sum(len(entry['jobs']) for entry in self.search_results)} job records in memory")
+
+    def maybe_recycle(self, resume_url=None):
+        """
+        Restart the browser if the recycle policy says it is due, carrying the
+        session over and reopening resume_url. Returns True if it restarted.
+        A driver the bot was given (e.g. pooled) is never restarted.
+        """
+        if self.recycle_policy is None or not self._owns_driver:
+            return False
+        reason = self.recycle_policy.reason(self.pages_since_recycle, chrome_rss_mb(self.driver))
+        if reason is None:
+            return False
+        
+        before = memory_snapshot(self.driver)
+        pages, self.pages_since_recycle = self.pages_since_recycle, 0
+        self.command_counter.detach(self.driver)
+        self.driver = restart_driver(self.driver, self._start_main_driver, self.base_url, resume_url,
+                                     login=self.login_to_indeed)
+        self._log_recycle('main', reason, pages, before, self.driver)
+        return True
+
+    def _page_driver_renewer(self, page_waits):
+        """renew() hook recycling the prefetcher's browser under the same policy (runs on its thread)"""
+        if self.recycle_policy is None:
+            return None
+        pages = [0]
+        
+        def renew(driver):
+            pages[0] += 1
+            reason = self.recycle_policy.reason(pages[0], chrome_rss_mb(driver))
+            if reason is None:
+                return None
+            before = memory_snapshot(driver)
+            renewed = restart_driver(driver, lambda: self._start_driver(self.page_driver_factory),
+                                     self.base_url, driver.current_url)
+            page_waits.driver = renewed
+            self._log_recycle('page', reason, pages[0], before, renewed)
+            pages[0] = 0
+            return renewed
+        return renew
+
+    def iter_prefetched_pages(self, search_entry, search_id, start_url):
+        """
+        Yield (job_cards, records) like iter_result_pages, but the pages are
+        loaded and extracted in a second browser up to prefetch_pages ahead,
+        so the next page loads while this one is scored. The cards live in
+        that browser, so job_cards holds None per record and jobs are read
+        by opening their own page.
+        """
+        page_driver = self.open_page_driver()
+        page_waits = WaitEngine(page_driver, self.waits.tracker, rate_limiter=self.rate_limiter)
+        
+        def read_page(driver):
+            job_cards, records, extracted = self.read_results_page(driver)
+            return job_cards, (records, extracted)
+        
+        prefetcher = self.prefetcher = PagePrefetcher(
+            page_driver, start_url, read_page,
+            lambda driver, job_cards: self.next_results_page(driver, page_waits, job_cards),
+            depth=self.prefetch_pages, first_page=self.page_number + 1,
+            renew=self._page_driver_renewer(page_waits)
+        ).start()
+        waited = 0.0
+        try:
+            for page in prefetcher:
+                PAGE_WAIT_SECONDS.observe(prefetcher.wait_seconds - waited, portal='indeed')
+                waited = prefetcher.wait_seconds
+                records, extracted = page.payload
+                self.register_page(search_entry, search_id, records, extracted, page.url)
+                yield [None] * len(records), records
+        finally:
+            self.stop_prefetch()
+
+    def stop_prefetch(self):
+        """Stop the page prefetcher, if one is running, and quit its browser"""
+        if self.prefetcher is None:
+            return
+        prefetcher, self.prefetcher = self.prefetcher, None
+        prefetcher.close()
+        try:
+            prefetcher.driver.quit()
+        except Exception:
+            pass
+        logging.info(f"Prefetched {prefetcher.pages} results pages; "
+                     f"waited {prefetcher.wait_seconds:.2f}s for pages not ready yet")
+
+    def counters(self):
+        """Campaign counters, as journaled and checkpointed"""
+        return dict(self.stats)
+
+    def resume_search(self, keywords, location, saved, navigate=True):
+        """Restore counters from a checkpoint and reopen the results page it was on"""
+        for counter in self.stats:
+            self.stats[counter] = saved.get(counter, 0)
+        self.page_number = saved['page'] - 1
+        self.search_plan = build_search_plan('indeed', self.base_url, keywords, location)
+        if navigate:
+            self.driver.get(saved['page_url'])
+            self.check_for_captcha()
+        logging.info(f"Resuming campaign at page {saved['page']} after job {saved.get('last_job_id') or '(none)'}")
+
+    def run_job_search_campaign(self, keywords, location=None, max_applications=50, resume=False):
+        """
+        Run a complete job application campaign through the shared portal loop
+        (portals.JobPortal.run_campaign), then release the bot.
+        
+        Every new job is scored as its results page is read; the passing jobs
+        are pooled across pages and applied to best score first. Progress and
+        the pool are checkpointed per page and every few jobs; with
+        resume=True a matching checkpoint restores them and jumps straight to
+        the saved results page.
+        """
+        portal = IndeedPortal(bot=self)
+        try:
+            portal.run_campaign(keywords, location, max_applications=max_applications, resume=resume)
             logging.info(f"""Campaign completed:
-                        Jobs processed: {self.jobs_processed}
-                        Applications submitted: {self.applications_submitted}""")
-            
+                        Jobs processed: {self.stats['jobs_processed']}
+                        Jobs skipped (already handled): {self.stats['jobs_skipped']}
+                        Applications submitted: {self.stats['applications_submitted']}""")
         finally:
+            portal.close()
+            
+    def close(self):
+        """Journal final counters and release the index, journal and driver"""
+        self.journal.append('counters', **self.counters())
+        if self.checkpoint and self.checkpoint.state:
+            try:
+                self.checkpoint.save(**self.counters())
+            except Exception as e:
+                logging.error(f"Failed to save checkpoint: {str(e)}")
+        self.stop_prefetch()
+        self.rate_limiter.log_state()
+        if self.fetcher:
+            self.fetcher.close()
+        if self.description_cache:
+            self.description_cache.close()
+        if self.duplicates:
+            self.duplicates.close()
+        self.journal.close()
+        self.job_index.close()
+        try:
+            self.waits.tracker.save(self.latency_file)
+        except Exception as e:
+            logging.error(f"Failed to save wait latencies: {str(e)}")
+        # Stop counting commands; a pooled driver goes on to another bot
+        self.command_counter.detach()
+        if self._owns_driver:
             self.driver.quit()
             
     def generate_report(self):
@@ -238,7 +656,8 @@ class IndeedJobBot:
         with open(report_path, 'w') as f:
             f.write(f"Indeed Job Application Report\n")
             f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Total Jobs Processed: {self.jobs_processed}\n")
-            f.write(f"Applications Submitted: {self.applications_submitted}\n")
+            f.write(f"Total Jobs Processed: {self.stats['jobs_processed']}\n")
+            f.write(f"Jobs Skipped (already handled): {self.stats['jobs_skipped']}\n")
+            f.write(f"Applications Submitted: {self.stats['applications_submitted']}\n")
             
         logging.info(f"Report generated: {report_path}")
\ No newline at end of file
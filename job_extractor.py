@@ -0,0 +1,114 @@
+from typing import Dict, List
+
+# Each script walks every job card on a results page in the browser and
+# returns plain records, so a whole page costs one WebDriver roundtrip
+# instead of several commands per card. Selectors list the current markup
+# first, then older/alternate layouts.
+
+_HELPERS = """
+function text(root, selectors) {
+    for (const selector of selectors) {
+        const el = root.querySelector(selector);
+        if (el) {
+            const value = (el.getAttribute('title') || el.innerText || el.textContent || '').trim();
+            if (value) { return value.split('\\n')[0].trim(); }
+        }
+    }
+    return null;
+}
+function attr(root, selectors, name) {
+    for (const selector of selectors) {
+        const el = root.matches(selector) ? root : root.querySelector(selector);
+        if (el && el.getAttribute(name)) { return el.getAttribute(name); }
+    }
+    return null;
+}
+"""
+
+LINKEDIN_SCRIPT = _HELPERS + """
+const cards = document.querySelectorAll(
+    '.jobs-search__results-list > li, li[data-occludable-job-id], .scaffold-layout__list-container > li'
+);
+const records = [];
+for (const card of cards) {
+    let jobId = attr(card, ['[data-occludable-job-id]'], 'data-occludable-job-id')
+        || attr(card, ['[data-job-id]'], 'data-job-id');
+    if (!jobId) {
+        const urn = attr(card, ['[data-entity-urn]'], 'data-entity-urn');
+        if (urn) { jobId = urn.split(':').pop(); }
+    }
+    const link = card.querySelector('a.base-card__full-link, a.job-card-list__title, a.job-card-container__link, a[href*="/jobs/view/"]');
+    const url = link ? link.href.split('?')[0] : null;
+    if (!jobId && url) {
+        const match = url.match(/(\\d{6,})\\/?$/);
+        if (match) { jobId = match[1]; }
+    }
+    if (!jobId) { continue; }
+    const time = card.querySelector('time');
+    records.push({
+        job_id: jobId,
+        title: text(card, ['.base-search-card__title', '.job-card-list__title', 'a.job-card-container__link', 'h3']),
+        company: text(card, ['.base-search-card__subtitle', '.job-card-container__primary-description',
+                             '.artdeco-entity-lockup__subtitle', 'h4']),
+        location: text(card, ['.job-search-card__location', '.job-card-container__metadata-item',
+                              '.artdeco-entity-lockup__caption']),
+        url: url,
+        posted: time ? (time.innerText || '').trim() : null,
+        posted_at: time ? time.getAttribute('datetime') : null,
+        easy_apply: /easy apply/i.test(card.innerText || '')
+    });
+}
+return records;
+"""
+
+INDEED_SCRIPT = _HELPERS + """
+const cards = document.querySelectorAll('.job_seen_beacon');
+const records = [];
+for (const card of cards) {
+    const container = card.closest('[data-jk]') || card;
+    const jobId = attr(container, ['[data-jk]'], 'data-jk') || attr(card, ['a[data-jk]'], 'data-jk');
+    if (!jobId) { continue; }
+    records.push({
+        job_id: jobId,
+        title: text(card, ['h2.jobTitle span[title]', 'h2.jobTitle', '.jcs-JobTitle']),
+        company: text(card, ['[data-testid="company-name"]', '.companyName']),
+        location: text(card, ['[data-testid="text-location"]', '.companyLocation']),
+        url: location.origin + '/viewjob?jk=' + jobId,
+        posted: text(card, ['[data-testid="myJobsStateDate"]', '.date']),
+        posted_at: null,
+        easy_apply: !!card.querySelector('.iaLabel, [data-testid="indeedApply"], .ialbl')
+            || /easily apply/i.test(card.innerText || '')
+    });
+}
+return records;
+"""
+
+SCRIPTS = {
+    'linkedin': LINKEDIN_SCRIPT,
+    'indeed': INDEED_SCRIPT
+}
+
+RECORD_FIELDS = ('job_id', 'title', 'company', 'location', 'url', 'posted', 'posted_at', 'easy_apply')
+
+def extract_job_cards(driver, portal: str) -> List[Dict]:
+    """
+    Extract every job card on the current results page in a single
+    execute_script call.
+
+    Returns a list of records with the keys in RECORD_FIELDS plus 'portal',
+    in page order. Returns an empty list if the page has no cards or the
+    script result is unusable.
+    """
+    script = SCRIPTS.get(portal.lower())
+    if script is None:
+        raise ValueError(f"No job card extractor for portal: {portal}")
+
+    records = driver.execute_script(script)
+    if not isinstance(records, list):
+        return []
+
+    return [
+        dict({field: record.get(field) for field in RECORD_FIELDS}, portal=portal.lower())
+        for record in records
+        if isinstance(record, dict) and record.get('job_id')
+    ]
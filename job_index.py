@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+class JobIndex:
+    """
+    Persistent index of job postings the bots have already handled.
+
+    Rows are keyed by (portal, job_id) and carry the last status and when it
+    was recorded, so a campaign can skip cards it rejected, applied to or
+    found to be a repost on a previous run without clicking them.
+    """
+
+    SEEN = 'seen'
+    REJECTED = 'rejected'
+    APPLIED = 'applied'
+    # A repost of a job already handled (see duplicates.DuplicateIndex)
+    DUPLICATE = 'duplicate'
+
+    # Statuses that mean the job needs no further work
+    FINAL_STATUSES = (REJECTED, APPLIED, DUPLICATE)
+
+    def __init__(self, path: str = os.path.join('data', 'job_index.db')):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                portal TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (portal, job_id)
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (portal, status)')
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config) -> 'JobIndex':
+        """Open the index at [Storage] job_index, defaulting to data/job_index.db."""
+        path = config.get('Storage', 'job_index', fallback=os.path.join('data', 'job_index.db'))
+        return cls(path)
+
+    def mark(self, portal: str, job_id: str, status: str) -> None:
+        """Record the latest status for a job."""
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO jobs (portal, job_id, status, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (portal, job_id) DO UPDATE SET status = excluded.status, '
+                'updated_at = excluded.updated_at',
+                (portal, job_id, status, datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def get_status(self, portal: str, job_id: str) -> Optional[str]:
+        """Return the recorded status of a job, or None if never seen."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status FROM jobs WHERE portal = ? AND job_id = ?',
+                (portal, job_id)
+            ).fetchone()
+        return row[0] if row else None
+
+    def is_processed(self, portal: str, job_id: str) -> bool:
+        """True if the job was already rejected or applied to."""
+        return self.get_status(portal, job_id) in self.FINAL_STATUSES
+
+    def statuses(self, portal: str, job_ids: Iterable[str]) -> Dict[str, str]:
+        """Look up the status of many jobs at once (e.g. a whole results page)."""
+        job_ids = list(job_ids)
+        result = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f'SELECT job_id, status FROM jobs WHERE portal = ? AND job_id IN ({placeholders})',
+                    [portal, *chunk]
+                ).fetchall()
+            result.update(rows)
+        return result
+
+    def filter_unprocessed(self, portal: str, job_ids: Iterable[str]) -> List[str]:
+        """Return the job IDs that still need to be evaluated, preserving order."""
+        job_ids = list(job_ids)
+        known = self.statuses(portal, job_ids)
+        return [job_id for job_id in job_ids if known.get(job_id) not in self.FINAL_STATUSES]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,206 @@
+"""
+Append-only NDJSON journal for search results and application events.
+
+Every event is written as one JSON line the moment it happens, so a crash
+mid-campaign loses at most the events since the last fsync. Segments
+rotate by size. The `compact` tool folds one or more runs back into the
+application_data_*.json summary format written by JobApplicationBot.
+
+Usage:
+    python journal.py compact [--dir data/journal] [--run RUN_ID] [--output FILE]
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+# Keeps run ids unique when several journals open in the same second
+_run_sequence = itertools.count()
+
+class ApplicationJournal:
+    """Crash-safe, size-rotated event journal for one bot run."""
+
+    def __init__(self, directory: str = os.path.join('data', 'journal'),
+                 max_bytes: int = 16 * 1024 * 1024, fsync_every: int = 50,
+                 fsync_interval: float = 2.0, run_id: Optional[str] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.run_id = run_id or (
+            f'{datetime.now().strftime("%Y%m%d_%H%M%S")}_{os.getpid()}_{next(_run_sequence)}'
+        )
+        self._lock = threading.Lock()
+        self._segment = 0
+        self._file = None
+        self._pending = 0
+        self._last_fsync = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        self._open_segment()
+
+    @classmethod
+    def from_config(cls, config) -> 'ApplicationJournal':
+        """Build a journal from the optional [Journal] config section."""
+        section = 'Journal'
+        return cls(
+            directory=config.get(section, 'directory', fallback=os.path.join('data', 'journal')),
+            max_bytes=config.getint(section, 'max_bytes', fallback=16 * 1024 * 1024),
+            fsync_every=config.getint(section, 'fsync_every', fallback=50),
+            fsync_interval=config.getfloat(section, 'fsync_interval', fallback=2.0)
+        )
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f'journal_{self.run_id}_{self._segment:04d}.ndjson')
+
+    def _open_segment(self) -> None:
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _fsync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_fsync = time.monotonic()
+
+    def _rotate(self) -> None:
+        self._fsync()
+        self._file.close()
+        self._segment += 1
+        self._open_segment()
+
+    def append(self, event: str, **payload) -> None:
+        """Write one event. The line reaches the OS immediately; fsyncs are batched."""
+        record = {'ts': datetime.now().isoformat(), 'run': self.run_id, 'event': event}
+        record.update(payload)
+        line = json.dumps(record, separators=(',', ':'), default=str) + '\n'
+
+        with self._lock:
+            if self._file is None:
+                raise ValueError("Journal is closed")
+            self._file.write(line)
+            self._file.flush()
+            self._pending += 1
+
+            if (self._pending >= self.fsync_every
+                    or time.monotonic() - self._last_fsync >= self.fsync_interval):
+                self._fsync()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+
+    def flush(self) -> None:
+        """Force pending events to disk."""
+        with self._lock:
+            if self._file is not None and self._pending:
+                self._fsync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._fsync()
+            self._file.close()
+            self._file = None
+
+def read_events(directory: str, run_id: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yield journal events in write order. A torn last line from a crash is
+    skipped rather than failing the whole read.
+    """
+    pattern = f'journal_{run_id}_*.ndjson' if run_id else 'journal_*.ndjson'
+    for path in sorted(glob.glob(os.path.join(directory, pattern))):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+def lineage(directory: str, run_id: str) -> List[str]:
+    """
+    The runs a resumed run continues, oldest first, followed by the run
+    itself. A resumed run journals its ancestors in a `resume` event.
+    """
+    for event in read_events(directory, run_id):
+        if event.get('event') == 'resume':
+            return list(event.get('parents', [])) + [run_id]
+    return [run_id]
+
+def compact(directory: str, run_id: Optional[str] = None) -> Dict:
+    """
+    Fold journal events into the summary format of save_application_data.
+
+    search_result events start an entry, jobs_found events extend an entry's
+    jobs, and the last counters event of each run is summed across runs.
+    A run_id covers the runs it was resumed from as well. A resumed run
+    starts from its parent's counters, so a run that was resumed doesn't
+    count on its own.
+    """
+    entries = {}
+    counters = {}
+    superseded = set()
+    applications = []
+
+    if run_id:
+        events = itertools.chain.from_iterable(
+            read_events(directory, run) for run in lineage(directory, run_id)
+        )
+    else:
+        events = read_events(directory)
+    for event in events:
+        kind = event.get('event')
+        key = (event.get('run'), event.get('search_id'))
+        if kind == 'search_result':
+            entries[key] = event.get('entry', {})
+            entries[key].setdefault('jobs', [])
+        elif kind == 'jobs_found' and key in entries:
+            entries[key]['jobs'].extend(event.get('jobs', []))
+        elif kind == 'application':
+            applications.append({k: v for k, v in event.items() if k not in ('event',)})
+        elif kind == 'counters':
+            counters[event.get('run')] = event
+        elif kind == 'resume':
+            superseded.update(event.get('parents', []))
+
+    totals = [c for run, c in counters.items() if run not in superseded]
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'applications_submitted': sum(c.get('applications_submitted', 0) for c in totals),
+        'jobs_processed': sum(c.get('jobs_processed', 0) for c in totals),
+        'search_results': list(entries.values()),
+        'applications': applications
+    }
+
+def write_summary(summary: Dict, output: Optional[str] = None) -> str:
+    """Write a compacted summary to data/application_data_<timestamp>.json."""
+    if output is None:
+        os.makedirs('data', exist_ok=True)
+        output = os.path.join('data', f'application_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
+    tmp_path = output + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(summary, f)
+    os.replace(tmp_path, output)
+    return output
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Application journal tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compact_parser = subparsers.add_parser('compact', help="Build a summary file from journal segments")
+    compact_parser.add_argument('--dir', default=os.path.join('data', 'journal'), help="Journal directory")
+    compact_parser.add_argument('--run', default=None,
+                                help="Only compact this run ID (and the runs it was resumed from)")
+    compact_parser.add_argument('--output', default=None, help="Summary file to write")
+    args = parser.parse_args()
+
+    if args.command == 'compact':
+        summary = compact(args.dir, args.run)
+        path = write_summary(summary, args.output)
+        print(f"Compacted {len(summary['search_results'])} searches and "
+              f"{len(summary['applications'])} application events into {path}")
+
+if __name__ == '__main__':
+    main()
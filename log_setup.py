@@ -0,0 +1,180 @@
+"""
+Process-wide logging for the bots.
+
+setup_logging() installs a single QueueHandler on the root logger the
+first time it runs in a process; later calls (one per bot) are no-ops.
+Records are handed to a QueueListener thread that does the file and
+console I/O, so the thread driving the browser never blocks on logging.
+
+The log file holds one JSON object per line with the portal, job_id and
+stage set through log_context(). Records below the file's level (DEBUG by
+default) are kept in an in-memory ring buffer and written out only when
+an ERROR is logged, so failures come with their recent detail.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Fields carried from log_context() onto every record
+CONTEXT_FIELDS = ('portal', 'job_id', 'stage')
+
+# Chatty third-party loggers kept out of the ring buffer
+QUIET_LOGGERS = ('selenium', 'urllib3', 'WDM', 'asyncio')
+
+_context = contextvars.ContextVar('log_context', default={})
+_lock = threading.Lock()
+_state = {}
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields such as job_id and stage to every record logged inside the block."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if getattr(record, 'replayed', False):
+            entry['replayed'] = True
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that stamps log_context() fields onto the record in the
+    calling thread and keeps the traceback separate from the message.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        context = _context.get()
+        record = logging.makeLogRecord(record.__dict__)
+        for field in CONTEXT_FIELDS:
+            if getattr(record, field, None) is None and field in context:
+                setattr(record, field, context[field])
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the last `capacity` records below the target's level and writes
+    them to the target when a record at `flush_level` or above arrives.
+    """
+
+    def __init__(self, target: logging.Handler, capacity: int = 500, flush_level: int = logging.ERROR):
+        super().__init__(logging.NOTSET)
+        self.target = target
+        self.flush_level = flush_level
+        self.buffer = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.levelno >= self.flush_level:
+            while self.buffer:
+                buffered = self.buffer.popleft()
+                buffered.replayed = True
+                self.target.handle(buffered)
+        elif record.levelno < self.target.level:
+            self.buffer.append(record)
+
+def setup_logging(config=None) -> logging.Logger:
+    """
+    Configure logging once per process from the optional [Logging] section
+    and return the root logger. Safe to call from every bot.
+    """
+    with _lock:
+        if _state.get('pid') == os.getpid():
+            return logging.getLogger()
+        root = logging.getLogger()
+        # A forked worker inherits the parent's queue handler but not its
+        # listener thread; replace it with the worker's own
+        inherited = _state.get('queue_handler')
+        if inherited in root.handlers:
+            root.removeHandler(inherited)
+
+        def option(name, fallback):
+            return config.get('Logging', name, fallback=fallback) if config is not None else fallback
+
+        log_dir = option('directory', 'logs')
+        level = logging.getLevelName(option('level', 'INFO').upper())
+        buffer_level = logging.getLevelName(option('buffer_level', 'DEBUG').upper())
+        capacity = int(option('buffer_size', '500'))
+        os.makedirs(log_dir, exist_ok=True)
+
+        log_file = os.path.join(
+            log_dir, f'job_applications_{datetime.now().strftime("%Y%m%d_%H%M%S")}_{os.getpid()}.log'
+        )
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setLevel(level)
+        file_handler.setFormatter(JsonFormatter())
+        # The ring buffer goes first so replayed records precede the error
+        handlers = [RingBufferHandler(file_handler, capacity), file_handler]
+        if option('console', 'true').lower() in ('1', 'true', 'yes', 'on'):
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(level)
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            handlers.append(console_handler)
+
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+
+        queue_handler = ContextQueueHandler(log_queue)
+        root.addHandler(queue_handler)
+        root.setLevel(min(level, buffer_level))
+        for name in QUIET_LOGGERS:
+            quiet = logging.getLogger(name)
+            if quiet.level == logging.NOTSET:
+                quiet.setLevel(logging.WARNING)
+
+        _state.update(pid=os.getpid(), queue_handler=queue_handler, listener=listener, log_file=log_file)
+        return root
+
+def shutdown_logging() -> None:
+    """Drain the queue and close the handlers (runs at exit)."""
+    with _lock:
+        listener = _state.get('listener')
+        if listener is None or _state.get('pid') != os.getpid():
+            return
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        logging.getLogger().removeHandler(_state['queue_handler'])
+        _state.clear()
+
+atexit.register(shutdown_logging)
+
+def log_file() -> Optional[str]:
+    """Path of this process's JSON log file, if logging is set up."""
+    return _state.get('log_file')
@@ -6,7 +6,6 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.common.keys import Keys
 from datetime import datetime
 import configparser
 import os
@@ -14,62 +13,112 @@ import json
 from typing import Optional, Dict, List, Tuple
 import atexit
 from selenium.webdriver.support.ui import Select
+from wait_engine import LatencyTracker, WaitEngine
+from job_extractor import extract_job_cards
+from journal import ApplicationJournal, compact, write_summary
+from search_plan import build_search_plan
+from captcha_detector import CaptchaDetector
+from session_store import SessionStore
+from rate_limiter import AdaptiveRateLimiter, throttled
+from log_setup import setup_logging
+from screenshots import ScreenshotPipeline
+from duplicates import DuplicateIndex
+from apply_form import ApplyFormEngine, ApplyResult
+from metrics import (CAPTCHA_CHECK_SECONDS, CAPTCHAS_DETECTED, FILTER_APPLY_SECONDS, WAIT_FOR_ELEMENT_RETRIES,
+                     WAIT_FOR_ELEMENT_SECONDS, WAIT_FOR_ELEMENT_TIMEOUTS, CommandCounter, start_exporter)
+from browser import chrome_options, chrome_rss_mb, enable_resource_blocking, mode_name, page_metrics
+from recycling import RecyclePolicy, log_recycle, memory_snapshot, restart_driver, spill_searches
+
+LINKEDIN_BASE_URL = "https://www.linkedin.com"
+LINKEDIN_LOGIN_MARKERS = ('/login', '/authwall', '/checkpoint', '/uas/')
 
 class JobApplicationBot:
-    def __init__(self, config_path: str = 'config.ini'):
-        """Initialize the job application bot with enhanced logging and configuration."""
-        self._setup_logging()
+    def __init__(self, config_path: str = 'config.ini', autosave: bool = True,
+                 driver: Optional[webdriver.Chrome] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 worker: Optional[int] = None):
+        """Initialize the job application bot with enhanced logging and configuration.
+        
+        Args:
+            config_path: Path to the INI configuration file
+            autosave: Write application data to data/ on cleanup. Workers whose
+                      results are merged by the caller pass False.
+            driver: Optional ready-made driver (e.g. from a DriverPool). The
+                    bot does not quit a driver it was given.
+            rate_limiter: Optional limiter shared with other bots, e.g. a
+                          SharedRateLimiter in run_bot workers. Defaults to
+                          one built from [RateLimit].
+            worker: Index of the run_bot worker process running this bot, so
+                    each worker exports its metrics to its own file and port
+                    and runs Chrome in its own profile (linkedin-<worker>).
+        """
         self.config = self._load_config(config_path)
+        setup_logging(self.config)
+        self.logger = logging.getLogger(__name__)
+        self.autosave = autosave
         self.applications_submitted = 0
         self.jobs_processed = 0
         self.search_results = []
-        self._setup_webdriver()
+        self.journal = ApplicationJournal.from_config(self.config)
+        # Journal runs this run was resumed from, oldest first
+        self.parent_runs = []
+        self.base_url = self.config.get('LinkedIn', 'base_url', fallback=LINKEDIN_BASE_URL).rstrip('/')
+        self.session_store = SessionStore.from_config(self.config)
+        self.login_stats = {}
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter.from_config(self.config, logger=self.logger)
+        self.worker = worker
+        self.metrics_exporter = start_exporter(self.config, worker)
+        self.screenshots = ScreenshotPipeline.from_config(self.config, logger=self.logger)
+        self.duplicates = DuplicateIndex.from_config(self.config)
+        self.apply_form = ApplyFormEngine.from_config(self.config, logger=self.logger)
+        # Restart the browser after many pages or once Chrome grows too large,
+        # and keep only the newest job records in memory (the journal has all)
+        self.recycle_policy = RecyclePolicy.from_config(self.config)
+        self.pages_since_recycle = 0
+        self.recycles = 0
+        self._cleaned_up = False
+        self._owns_driver = driver is None
+        self._setup_webdriver(driver)
         # Register cleanup on exit
         atexit.register(self.cleanup)
         
-    def _setup_logging(self) -> None:
-        """Set up enhanced logging with both file and console output."""
-        log_dir = 'logs'
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-            
-        log_file = os.path.join(
-            log_dir, 
-            f'job_applications_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
-        )
-        
-        # Create a logger instance instead of using basicConfig
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
+    def cleanup(self) -> None:
+        """Cleanup resources properly."""
+        # Runs from both __exit__ and atexit; only the first call does work
+        if self._cleaned_up:
+            return
+        self._cleaned_up = True
         
-        # Create handlers
-        file_handler = logging.FileHandler(log_file)
-        console_handler = logging.StreamHandler()
+        # Record final counters and save any pending data
+        try:
+            self._journal_counters()
+        except Exception as e:
+            self.logger.error(f"Failed to journal counters: {str(e)}")
+        if self.autosave:
+            self.save_application_data()
+        self.journal.close()
         
-        # Create formatter and add it to the handlers
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
+        # Keep learned wait latencies for the next run
+        if hasattr(self, 'waits'):
+            try:
+                self.waits.tracker.save(self.latency_file)
+            except Exception as e:
+                self.logger.error(f"Failed to save wait latencies: {str(e)}")
         
-        # Add handlers to the logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Final pacing per host
+        self.rate_limiter.log_state()
         
-        # Store handlers for cleanup
-        self.handlers = [file_handler, console_handler]
+        # Let queued screenshots finish writing
+        self.screenshots.close()
+        if self.duplicates:
+            self.duplicates.close()
         
-    def cleanup(self) -> None:
-        """Cleanup resources properly."""
-        # Close logging handlers
-        for handler in self.handlers:
-            handler.close()
-            self.logger.removeHandler(handler)
+        # Stop counting commands; a pooled driver goes on to another bot
+        if hasattr(self, 'command_counter'):
+            self.command_counter.detach()
         
-        # Save any pending data
-        self.save_application_data()
-        
-        # Quit WebDriver if it exists
-        if hasattr(self, 'driver'):
+        # Quit WebDriver if it exists and belongs to this bot
+        if hasattr(self, 'driver') and self._owns_driver:
             self.driver.quit()
     
     def _load_config(self, config_path: str) -> configparser.ConfigParser:
@@ -87,61 +136,172 @@ class JobApplicationBot:
                 
         return config
     
-    def _setup_webdriver(self) -> None:
+    def _setup_webdriver(self, driver: Optional[webdriver.Chrome] = None) -> None:
         """Initialize Chrome WebDriver with enhanced options."""
         try:
-            options = webdriver.ChromeOptions()
-            options.add_argument('--start-maximized')
-            options.add_argument('--disable-notifications')
-            
-            if self.config.has_section('BrowserOptions'):
-                for option in self.config['BrowserOptions']:
-                    options.add_argument(option)
+            if driver is not None:
+                self.driver = driver
+                self._init_driver_helpers()
+                self.logger.info("Using provided WebDriver")
+                return
             
-            self.driver = webdriver.Chrome(options=options)
-            self.wait = WebDriverWait(self.driver, 10)
-            self.logger.info("WebDriver initialized successfully")
+            self.driver = self._new_chrome()
+            self._init_driver_helpers()
+            self.logger.info(f"WebDriver initialized successfully ({mode_name(self.config)} mode)")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize WebDriver: {str(e)}")
             raise
 
-    def take_screenshot(self, name: str) -> Optional[str]:
-        """Take a screenshot and save it to the logs directory."""
+    def _new_chrome(self) -> webdriver.Chrome:
+        """Start a Chrome configured from [BrowserOptions], [Browser] and [Session]."""
+        # [BrowserOptions], headless / lean mode settings from [Browser] and
+        # a managed profile, which keeps the LinkedIn session between runs
+        # natively. Chrome locks a profile, so each run_bot worker has its own.
+        profile = 'linkedin' if self.worker is None else f'linkedin-{self.worker}'
+        options = chrome_options(self.config, profile)
+        options.add_argument('--start-maximized')
+        return webdriver.Chrome(options=options)
+
+    def _init_driver_helpers(self) -> None:
+        """Create the waits and detectors bound to the current driver."""
+        self.command_counter = CommandCounter(self.driver, 'linkedin')
+        # Every navigation and click goes through the per-host rate limiter;
+        # either may load a new document, so the CAPTCHA result is dropped
+        self.driver = throttled(self.driver, self.rate_limiter, on_page_change=self._page_changed)
+        try:
+            blocked = enable_resource_blocking(self.driver, self.config)
+            if blocked:
+                self.logger.info(f"Lean mode: blocking {len(blocked)} resource URL patterns")
+        except Exception as e:
+            self.logger.warning(f"Could not enable resource blocking: {str(e)}")
+        self.wait = WebDriverWait(self.driver, 10)
+        self.waits = WaitEngine(self.driver, self._load_latency_tracker(), logger=self.logger,
+                                rate_limiter=self.rate_limiter)
+        self.captcha_detector = CaptchaDetector(
+            self.driver,
+            cache_ttl=self.config.getfloat('Captcha', 'cache_ttl', fallback=1.0)
+        )
+
+    def maybe_recycle(self, resume_url: Optional[str] = None) -> bool:
+        """
+        Restart the browser if the recycle policy says it is due, carrying the
+        session over and reopening resume_url. Returns True if it restarted.
+        A driver the bot was given (e.g. pooled) is never restarted.
+        """
+        if self.recycle_policy is None or not self._owns_driver:
+            return False
+        reason = self.recycle_policy.reason(self.pages_since_recycle, chrome_rss_mb(self.driver))
+        if reason is None:
+            return False
+        
+        before = memory_snapshot(self.driver)
+        pages, self.pages_since_recycle = self.pages_since_recycle, 0
+        self.command_counter.detach(self.driver)
+        self.driver = restart_driver(self.driver, self._start_fresh_driver, self.base_url, resume_url,
+                                     login=self.login_to_linkedin, logger=self.logger)
+        self.recycles += 1
+        log_recycle(self.logger, self.journal, 'main', reason, pages, before, self.driver)
+        return True
+
+    def _start_fresh_driver(self):
+        """Start a new Chrome to replace a recycled one and rebind the waits and detector to it."""
+        raw = self._new_chrome()
+        self.command_counter.attach(raw)
+        self.driver = throttled(raw, self.rate_limiter, on_page_change=self._page_changed)
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"logs/screenshot_{name}_{timestamp}.png"
-            os.makedirs(os.path.dirname(filename), exist_ok=True)
-            self.driver.save_screenshot(filename)
-            self.logger.info(f"Screenshot saved: {filename}")
-            return filename
+            enable_resource_blocking(self.driver, self.config)
         except Exception as e:
-            self.logger.error(f"Failed to take screenshot: {str(e)}")
+            self.logger.warning(f"Could not enable resource blocking: {str(e)}")
+        self.wait = WebDriverWait(self.driver, 10)
+        self.waits.driver = self.driver
+        self.captcha_detector.driver = self.driver
+        self.captcha_detector.invalidate()
+        return self.driver
+
+    def _page_changed(self) -> None:
+        """Called by the throttled driver after each navigation and click."""
+        detector = getattr(self, 'captcha_detector', None)
+        if detector is not None:
+            detector.invalidate()
+
+    def _load_latency_tracker(self) -> LatencyTracker:
+        """Create the wait latency tracker, seeded from the previous run if available."""
+        tracker = LatencyTracker.from_config(self.config)
+        self.latency_file = self.config.get(
+            'Waits', 'latency_file', fallback=os.path.join('data', 'wait_latency.json')
+        )
+        try:
+            tracker.load(self.latency_file)
+        except Exception as e:
+            self.logger.warning(f"Could not load wait latencies: {str(e)}")
+        return tracker
+
+    def record_page_metrics(self, stage: str) -> Optional[Dict]:
+        """Log and journal load time, bytes transferred and Chrome RSS for the current page."""
+        try:
+            metrics = page_metrics(self.driver, mode_name(self.config))
+        except Exception as e:
+            self.logger.debug(f"Could not read page metrics: {str(e)}")
             return None
+        if metrics is None:
+            return None
+        
+        self.logger.info(
+            f"Page metrics [{metrics['mode']}] {stage}: load {metrics['load_ms']}ms, "
+            f"{metrics['bytes'] / 1024:.0f} KB in {metrics['resources']} resources, "
+            f"Chrome RSS {metrics['chrome_rss_mb']} MB"
+        )
+        self.journal.append('page_metrics', stage=stage, **metrics)
+        return metrics
+
+    def take_screenshot(self, name: str) -> Optional[str]:
+        """Queue a screenshot for the background writer; returns its future path."""
+        return self.screenshots.capture(self.driver, name)
 
-    def check_for_captcha(self) -> Tuple[bool, str]:
+    def check_for_captcha(self, force: bool = False) -> Tuple[bool, str]:
         """
         Check if a CAPTCHA is present on the page.
         Returns a tuple of (is_captcha_present, captcha_type)
+        
+        Uses the in-page probe when available; falls back to XPath scans
+        if the probe cannot run. A screenshot is taken once per episode.
         """
-        try:
-            captcha_indicators = {
-                'reCAPTCHA': "//iframe[contains(@src, 'recaptcha')]",
-                'hCaptcha': "//iframe[contains(@src, 'hcaptcha')]",
-                'Generic': "//*[contains(text(), 'Captcha') or contains(text(), 'Security Check')]"
-            }
-            
-            for captcha_type, xpath in captcha_indicators.items():
-                if len(self.driver.find_elements(By.XPATH, xpath)) > 0:
+        with CAPTCHA_CHECK_SECONDS.time(portal='linkedin'):
+            try:
+                result = self.captcha_detector.check(force=force)
+                if result is None:
+                    result = self._scan_for_captcha()
+                
+                is_captcha, captcha_type = result
+                if not is_captcha:
+                    self.captcha_detector.reset_episode()
+                    return False, ""
+                
+                if self.captcha_detector.is_new_episode(captcha_type):
                     self.logger.warning(f"{captcha_type} detected!")
-                    screenshot_path = self.take_screenshot(f"{captcha_type.lower()}_detected")
-                    return True, captcha_type
-                    
-            return False, ""
-            
-        except Exception as e:
-            self.logger.error(f"Error checking for CAPTCHA: {str(e)}")
-            return False, ""
+                    CAPTCHAS_DETECTED.inc(portal='linkedin', type=captcha_type)
+                    self.rate_limiter.on_captcha()
+                    self.take_screenshot(f"{captcha_type.lower()}_detected")
+                return True, captcha_type
+                
+            except Exception as e:
+                self.logger.error(f"Error checking for CAPTCHA: {str(e)}")
+                return False, ""
+
+    def _scan_for_captcha(self) -> Tuple[bool, str]:
+        """Fallback detection using document-wide XPath queries."""
+        captcha_indicators = {
+            'reCAPTCHA': "//iframe[contains(@src, 'recaptcha')]",
+            'hCaptcha': "//iframe[contains(@src, 'hcaptcha')]",
+            'Generic': "//*[contains(text(), 'Captcha') or contains(text(), 'Security Check')]"
+        }
+        
+        for captcha_type, xpath in captcha_indicators.items():
+            if len(self.driver.find_elements(By.XPATH, xpath)) > 0:
+                return True, captcha_type
+                
+        return False, ""
 
     def handle_timeout(self, action: str, retry_count: int = 3, wait_time: int = 30) -> bool:
         """
@@ -172,16 +332,15 @@ class JobApplicationBot:
                     time.sleep(wait_time)
                     
                     # Check if CAPTCHA is still present
-                    is_captcha, _ = self.check_for_captcha()
+                    is_captcha, _ = self.check_for_captcha(force=True)
                     if not is_captcha:
                         self.logger.info("CAPTCHA appears to be solved, continuing...")
                         return True
                         
                 else:
                     self.logger.info(f"Retrying {action} (attempt {attempt + 1}/{retry_count})")
-                    # Exponential backoff
-                    retry_delay = 2 ** attempt
-                    time.sleep(retry_delay)
+                    # The timeout was already reported; back off at the (now reduced) pace
+                    time.sleep(self.rate_limiter.interval())
                     return True
                     
             except Exception as e:
@@ -194,12 +353,23 @@ class JobApplicationBot:
     def wait_for_element(self, by: By, value: str, timeout: int = 10, 
                     clickable: bool = False, retries: int = 3) -> Optional[webdriver.remote.webelement.WebElement]:
         """Wait for an element to be present or clickable with retry logic and CAPTCHA handling."""
+        started = time.perf_counter()
+        element = self._wait_for_element(by, value, clickable, retries)
+        WAIT_FOR_ELEMENT_SECONDS.observe(time.perf_counter() - started, portal='linkedin',
+                                         outcome='found' if element is not None else 'missing')
+        return element
+
+    def _wait_for_element(self, by: By, value: str, clickable: bool, retries: int):
         for attempt in range(retries):
+            if attempt:
+                WAIT_FOR_ELEMENT_RETRIES.inc(portal='linkedin')
             try:
                 condition = EC.element_to_be_clickable if clickable else EC.presence_of_element_located
                 return self.wait.until(condition((by, value)))
                     
             except TimeoutException:
+                WAIT_FOR_ELEMENT_TIMEOUTS.inc(portal='linkedin')
+                self.rate_limiter.on_timeout()
                 is_captcha, captcha_type = self.check_for_captcha()
                 if is_captcha:
                     self.logger.warning(
@@ -217,23 +387,29 @@ class JobApplicationBot:
                 self.logger.error(f"Error waiting for element {value}: {str(e)}")
                 return None
 
+    def _journal_counters(self) -> None:
+        """Append a snapshot of the run counters to the journal."""
+        self.journal.append(
+            'counters',
+            applications_submitted=self.applications_submitted,
+            jobs_processed=self.jobs_processed
+        )
+
     def save_application_data(self) -> None:
-        """Save application data to JSON file with error handling."""
+        """
+        Write the summary file for this run by compacting its journal.
+        
+        Results are journaled as they happen, so this reads them back from
+        disk rather than serializing the in-memory search_results. A resumed
+        run's summary includes the runs it was resumed from.
+        """
         try:
-            data = {
-                'timestamp': datetime.now().isoformat(),
-                'applications_submitted': self.applications_submitted,
-                'jobs_processed': self.jobs_processed,
-                'search_results': self.search_results
-            }
-            
-            # Ensure the directory exists
-            os.makedirs('data', exist_ok=True)
-            
-            filename = os.path.join('data', f'application_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=4)
+            self.journal.flush()
+            data = compact(self.journal.directory, self.journal.run_id)
+            data['applications_submitted'] = self.applications_submitted
+            data['jobs_processed'] = self.jobs_processed
             
+            filename = write_summary(data)
             self.logger.info(f"Application data saved to {filename}")
             
         except Exception as e:
@@ -250,10 +426,59 @@ class JobApplicationBot:
             self.logger.error(f"Error during execution: {str(exc_val)}")
             return False
         
+    def _restore_linkedin_session(self) -> bool:
+        """Reuse a saved or profile-held LinkedIn session if it is still valid."""
+        if self.session_store is None:
+            return False
+        
+        account = self.config['LinkedIn']['email']
+        try:
+            # Only a browser this bot started runs in the LinkedIn profile
+            managed_profile = self._owns_driver and bool(self.config.get('Session', 'user_data_dir', fallback=''))
+            if not managed_profile and not self.session_store.restore(
+                    self.driver, 'linkedin', account, f"{self.base_url}/"):
+                return False
+            
+            if self.session_store.validate(self.driver, f"{self.base_url}/feed/", LINKEDIN_LOGIN_MARKERS):
+                self.logger.info("Restored saved LinkedIn session")
+                return True
+            
+            self.logger.info("Saved LinkedIn session has expired, falling back to form login")
+            self.session_store.clear('linkedin', account)
+            self.driver.delete_all_cookies()
+            
+        except Exception as e:
+            self.logger.warning(f"Could not restore LinkedIn session: {str(e)}")
+        return False
+
+    def _save_linkedin_session(self) -> None:
+        """Persist the LinkedIn session after a successful form login."""
+        if self.session_store is None:
+            return
+        try:
+            path = self.session_store.save(self.driver, 'linkedin', self.config['LinkedIn']['email'])
+            self.logger.info(f"LinkedIn session saved to {path}")
+        except Exception as e:
+            self.logger.warning(f"Could not save LinkedIn session: {str(e)}")
+
+    def _record_login(self, portal: str, mode: str, started: float) -> None:
+        """Log and journal how long login took and whether it was warm or cold."""
+        elapsed = time.monotonic() - started
+        self.login_stats[portal] = {'mode': mode, 'seconds': round(elapsed, 3)}
+        self.logger.info(f"{portal} login completed ({mode} start) in {elapsed:.2f}s")
+        self.journal.append('login', portal=portal, mode=mode, seconds=round(elapsed, 3))
+
     def login_to_linkedin(self) -> bool:
         """Login to LinkedIn with error handling and verification."""
         try:
+            started = time.monotonic()
             self.logger.info("Attempting to login to LinkedIn...")
+            
+            # Warm start: skip the form entirely if a saved session still works
+            if self._restore_linkedin_session():
+                self._record_login('LinkedIn', 'warm', started)
+                return True
+            
             self.driver.get(self.config['LinkedIn']['login_url'])
             
             # Wait for and enter email
@@ -299,6 +524,8 @@ class JobApplicationBot:
                 return False
             
             self.logger.info("Successfully logged into LinkedIn")
+            self._save_linkedin_session()
+            self._record_login('LinkedIn', 'cold', started)
             return True
             
         except Exception as e:
@@ -319,40 +546,14 @@ class JobApplicationBot:
                           "remote": "Remote"}
         """
         try:
-            # Navigate to LinkedIn Jobs
-            self.driver.get("https://www.linkedin.com/jobs/")
-            
-            # Wait for search box
-            search_box = self.wait_for_element(
-                By.CSS_SELECTOR, 
-                "input.jobs-search-box__text-input[aria-label='Search by title, skill, or company']",
-                clickable=True
-            )
-            if not search_box:
-                self.logger.error("Could not find job search box")
-                return False
-                
-            # Clear and enter keywords
-            search_box.clear()
-            search_box.send_keys(keywords)
-            
-            # Handle location if provided
-            if location:
-                location_box = self.wait_for_element(
-                    By.CSS_SELECTOR,
-                    "input.jobs-search-box__text-input[aria-label='City, state, or zip code']",
-                    clickable=True
-                )
-                if location_box:
-                    location_box.clear()
-                    location_box.send_keys(location)
+            # The whole search is one navigation to the results URL
+            plan = build_search_plan('linkedin', self.base_url, keywords, location, filters)
+            self.driver.get(plan.url)
             
-            # Apply additional filters if provided
-            if filters:
-                self._apply_linkedin_filters(filters)
-            
-            # Submit search
-            search_box.send_keys(Keys.RETURN)
+            # Filters the URL can't express fall back to the filter modal
+            if plan.unmapped:
+                self.logger.info(f"Applying filters through the filter modal: {', '.join(plan.unmapped)}")
+                self._apply_linkedin_filters(plan.unmapped)
             
             # Wait for results
             results = self.wait_for_element(
@@ -362,52 +563,92 @@ class JobApplicationBot:
                 self.logger.error("No job results found")
                 return False
             
-            self.logger.info(f"Successfully searched for {keywords} jobs")
+            self.record_page_metrics('linkedin_search_results')
+            
+            # Pull every card on the results page in one roundtrip
+            jobs = extract_job_cards(self.driver, 'linkedin')
+            self._mark_duplicates(jobs)
+            
+            entry = {
+                'timestamp': datetime.now().isoformat(),
+                'keywords': keywords,
+                'location': location,
+                'filters': filters,
+                'url': plan.url,
+                'jobs': jobs
+            }
+            self.search_results.append(entry)
+            self.journal.append('search_result', search_id=len(self.search_results), entry=entry)
+            self.pages_since_recycle += 1
+            # The journal has every record; memory keeps only the newest
+            if self.recycle_policy:
+                spill_searches(self.search_results, self.recycle_policy.max_buffered_jobs)
+            
+            self.logger.info(f"Successfully searched for {keywords} jobs ({len(jobs)} results on first page)")
             return True
             
         except Exception as e:
             self.logger.error(f"Job search failed: {str(e)}")
             return False
 
-    def _apply_linkedin_filters(self, filters: Dict[str, str]) -> None:
-        """Apply job search filters on LinkedIn."""
+    def _mark_duplicates(self, jobs: List[Dict]) -> None:
+        """Tag jobs reposting one already seen (on any portal) with duplicate_of."""
+        if self.duplicates is None or not jobs:
+            return
         try:
-            # Click "All filters" button
-            all_filters_button = self.wait_for_element(
-                By.CSS_SELECTOR,
-                "button[aria-label='All filters']",
-                clickable=True
-            )
-            if all_filters_button:
-                all_filters_button.click()
-                time.sleep(1)  # Wait for filter modal
-                
-                # Map of filter types to their selectors
-                filter_selectors = {
-                    "experience_level": "Experience level",
-                    "job_type": "Job Type",
-                    "remote": "Remote",
-                    "salary": "Salary",
-                    "date_posted": "Date posted"
-                }
-                
-                for filter_type, value in filters.items():
-                    if filter_type in filter_selectors:
-                        filter_name = filter_selectors[filter_type]
-                        self._select_linkedin_filter(filter_name, value)
-                
-                # Apply filters
-                apply_button = self.wait_for_element(
+            clusters = self.duplicates.check_many('linkedin', jobs)
+        except Exception as e:
+            self.logger.warning(f"Duplicate check failed: {str(e)}")
+            return
+        for job in jobs:
+            if job.get('job_id') in clusters:
+                job['duplicate_of'] = clusters[job['job_id']]
+        if clusters:
+            self.logger.info(f"{len(clusters)} of {len(jobs)} results are reposts of jobs already seen")
+
+    def _apply_linkedin_filters(self, filters: Dict[str, str]) -> None:
+        """Apply job search filters through LinkedIn's "All filters" modal."""
+        with FILTER_APPLY_SECONDS.time(portal='linkedin'):
+            try:
+                # Click "All filters" button
+                all_filters_button = self.wait_for_element(
                     By.CSS_SELECTOR,
-                    "button[aria-label='Apply current filters']",
+                    "button[aria-label='All filters']",
                     clickable=True
                 )
-                if apply_button:
-                    apply_button.click()
-                    time.sleep(1)  # Wait for filters to apply
+                if all_filters_button:
+                    all_filters_button.click()
+                    self.waits.until(
+                        'linkedin_filter_modal',
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='dialog']"))
+                    )
+                
+                    # Map of filter types to their selectors
+                    filter_selectors = {
+                        "experience_level": "Experience level",
+                        "job_type": "Job Type",
+                        "remote": "Remote",
+                        "salary": "Salary",
+                        "date_posted": "Date posted"
+                    }
+                
+                    for filter_type, value in filters.items():
+                        if filter_type in filter_selectors:
+                            filter_name = filter_selectors[filter_type]
+                            self._select_linkedin_filter(filter_name, value)
+                
+                    # Apply filters
+                    apply_button = self.wait_for_element(
+                        By.CSS_SELECTOR,
+                        "button[aria-label='Apply current filters']",
+                        clickable=True
+                    )
+                    if apply_button:
+                        apply_button.click()
+                        self.waits.until_network_idle('linkedin_apply_filters')
                     
-        except Exception as e:
-            self.logger.error(f"Error applying filters: {str(e)}")
+            except Exception as e:
+                self.logger.error(f"Error applying filters: {str(e)}")
 
     def _select_linkedin_filter(self, filter_name: str, value: str) -> None:
         """Select a specific filter value in the LinkedIn filter modal."""
@@ -420,9 +661,8 @@ class JobApplicationBot:
             )
             if filter_button:
                 filter_button.click()
-                time.sleep(0.5)
                 
-                # Find and click the specific value
+                # Find and click the specific value once the section has expanded
                 value_element = self.wait_for_element(
                     By.XPATH,
                     f"//label[contains(text(), '{value}')]",
@@ -434,8 +674,55 @@ class JobApplicationBot:
         except Exception as e:
             self.logger.error(f"Error selecting filter {filter_name}: {str(e)}")
 
+    def submit_easy_apply(self, job_id: Optional[str] = None) -> ApplyResult:
+        """Complete Easy Apply for the job page the browser is on; the outcome is journaled.
+        
+        A form that isn't submitted (e.g. a required question without an
+        answer in [Answers]) is discarded so the next job starts clean.
+        """
+        try:
+            apply_button = self.waits.until(
+                'linkedin_easy_apply_button',
+                EC.element_to_be_clickable((By.CSS_SELECTOR, 'button.jobs-apply-button'))
+            )
+            if apply_button is None:
+                result = ApplyResult(ApplyFormEngine.STUCK, 0, 0, [], ['No Easy Apply button'])
+            else:
+                apply_button.click()
+                result = self.apply_form.run(self.driver, 'linkedin', self.waits)
+        except Exception as e:
+            self.logger.error(f"Error handling Easy Apply form: {str(e)}")
+            result = ApplyResult(ApplyFormEngine.ERROR, 0, 0, [], [str(e)])
+        
+        self.journal.append('apply_form', portal='linkedin', job_id=job_id, **result._asdict())
+        if result.submitted:
+            self.applications_submitted += 1
+        else:
+            self.logger.warning(f"Easy Apply not submitted ({result.status}); "
+                                f"unanswered: {result.unanswered or 'none'}, errors: {result.errors or 'none'}")
+        self._close_easy_apply(discard=not result.submitted)
+        return result
+
+    def _close_easy_apply(self, discard: bool) -> None:
+        """Dismiss the Easy Apply modal (confirmation or unfinished form)."""
+        try:
+            dismiss = self.driver.find_elements(By.CSS_SELECTOR, 'div[role="dialog"] button[aria-label="Dismiss"]')
+            if not dismiss:
+                return
+            dismiss[0].click()
+            if discard:
+                confirm = self.waits.until(
+                    'linkedin_easy_apply_discard',
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-control-name="discard_application_confirm_btn"], '
+                                                                 'button[data-test-dialog-primary-btn]'))
+                )
+                if confirm is not None:
+                    confirm.click()
+        except Exception as e:
+            self.logger.debug(f"Could not close Easy Apply modal: {str(e)}")
+
 if __name__ == "__main__":
     with JobApplicationBot() as bot:
         # Example usage
-        if bot.login_to_portal('LinkedIn'):
-            bot.search_jobs("Python Developer", "Remote")
\ No newline at end of file
+        if bot.login_to_linkedin():
+            bot.search_linkedin_jobs("Python Developer", "Remote")
\ No newline at end of file
@@ -0,0 +1,344 @@
+"""
+In-process metrics for the bots' hot paths.
+
+Counters and latency histograms live in a process-wide registry and are
+exported in the Prometheus text format, either as a file rewritten every
+few seconds (for node_exporter's textfile collector or plain tailing) or
+over HTTP at /metrics. Configured by the optional [Metrics] section.
+"""
+import atexit
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence, Tuple
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.support.events import EventFiringWebDriver
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(key)} {value:g}')
+        return '\n'.join(lines)
+
+class Histogram:
+    """Cumulative-bucket histogram (seconds by default) with optional labels."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[LabelKey, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(_label_key(labels))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                    lines.append(f'{self.name}_bucket{_format_labels(key, ("le", le))} {cumulative}')
+                lines.append(f'{self.name}_sum{_format_labels(key)} {total:.6f}')
+                lines.append(f'{self.name}_count{_format_labels(key)} {cumulative}')
+        return '\n'.join(lines)
+
+class MetricsRegistry:
+    """Named counters and histograms, rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help_text, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+    def write(self, path: str) -> None:
+        """Atomically rewrite `path` with the current metrics."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+REGISTRY = MetricsRegistry()
+
+WEBDRIVER_COMMANDS = REGISTRY.counter(
+    'jobbot_webdriver_commands_total', 'WebDriver commands sent, by portal and command')
+DRIVER_GET_SECONDS = REGISTRY.histogram(
+    'jobbot_driver_get_seconds', 'Duration of driver.get navigations')
+COMMANDS_PER_JOB = REGISTRY.histogram(
+    'jobbot_webdriver_commands_per_job', 'WebDriver commands spent on one job', COUNT_BUCKETS)
+WAIT_FOR_ELEMENT_SECONDS = REGISTRY.histogram(
+    'jobbot_wait_for_element_seconds', 'Duration of wait_for_element, by outcome')
+WAIT_FOR_ELEMENT_RETRIES = REGISTRY.counter(
+    'jobbot_wait_for_element_retries_total', 'wait_for_element retry attempts')
+WAIT_FOR_ELEMENT_TIMEOUTS = REGISTRY.counter(
+    'jobbot_wait_for_element_timeouts_total', 'wait_for_element attempts that timed out')
+CAPTCHA_CHECK_SECONDS = REGISTRY.histogram(
+    'jobbot_captcha_check_seconds', 'Duration of check_for_captcha')
+CAPTCHAS_DETECTED = REGISTRY.counter(
+    'jobbot_captchas_detected_total', 'CAPTCHA episodes detected, by type')
+FILTER_APPLY_SECONDS = REGISTRY.histogram(
+    'jobbot_filter_apply_seconds', 'Duration of applying search filters through the UI')
+DESCRIPTION_FETCH_SECONDS = REGISTRY.histogram(
+    'jobbot_description_fetch_seconds', 'Duration of reading a job description, by source (http or browser)')
+SKILL_MATCH_SECONDS = REGISTRY.histogram(
+    'jobbot_skill_match_seconds', 'Duration of matching descriptions against the skill profile',
+    (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5))
+PAGE_WAIT_SECONDS = REGISTRY.histogram(
+    'jobbot_page_wait_seconds', 'Time spent waiting for a prefetched results page to be ready')
+APPLY_STEP_SECONDS = REGISTRY.histogram(
+    'jobbot_apply_step_seconds', 'Duration of one apply-form step')
+JOB_OUTCOMES = REGISTRY.counter(
+    'jobbot_job_outcomes_total', 'Jobs recorded per outcome (seen, rejected, applied)')
+
+# Raw driver -> [its own execute, the CommandCounter it currently counts for]
+_hooked = weakref.WeakKeyDictionary()
+_hook_lock = threading.Lock()
+
+def _raw_driver(driver):
+    return driver.wrapped_driver if isinstance(driver, EventFiringWebDriver) else driver
+
+class CommandCounter:
+    """
+    Counts every WebDriver command a driver sends (and times navigations) by
+    hooking WebDriver.execute, which all driver and element commands go
+    through. job() observes how many commands one job took.
+
+    A driver is hooked once: attaching another counter (e.g. the next bot
+    to lease a pooled driver) takes the hook over instead of stacking a
+    second one, and detach() restores the driver's own execute.
+    """
+
+    def __init__(self, driver, portal: str):
+        self.portal = portal
+        self.total = 0
+        self._drivers = weakref.WeakSet()
+        self.attach(driver)
+
+    def attach(self, driver) -> None:
+        """Count the commands of `driver` too, e.g. a browser started to replace a recycled one."""
+        raw = _raw_driver(driver)
+        with _hook_lock:
+            hook = _hooked.get(raw)
+            if hook is not None:
+                hook[1] = self
+            else:
+                hook = _hooked[raw] = [raw.execute, self]
+
+                def counted_execute(driver_command, params=None):
+                    execute, counter = hook
+                    counter.total += 1
+                    WEBDRIVER_COMMANDS.inc(portal=counter.portal, command=driver_command)
+                    if driver_command == Command.GET:
+                        with DRIVER_GET_SECONDS.time(portal=counter.portal):
+                            return execute(driver_command, params)
+                    return execute(driver_command, params)
+
+                raw.execute = counted_execute
+        self._drivers.add(raw)
+
+    def detach(self, driver=None) -> None:
+        """Stop counting `driver` (default: every driver this counter is attached to)."""
+        drivers = [_raw_driver(driver)] if driver is not None else list(self._drivers)
+        for raw in drivers:
+            self._drivers.discard(raw)
+            with _hook_lock:
+                hook = _hooked.get(raw)
+                # Leave a hook another counter has taken over since
+                if hook is not None and hook[1] is self:
+                    del _hooked[raw]
+                    raw.execute = hook[0]
+
+    @staticmethod
+    def unhook(driver) -> None:
+        """Restore a driver's own execute, whichever counter it was counting for."""
+        raw = _raw_driver(driver)
+        with _hook_lock:
+            hook = _hooked.pop(raw, None)
+            if hook is not None:
+                raw.execute = hook[0]
+
+    @contextmanager
+    def job(self):
+        started = self.total
+        try:
+            yield
+        finally:
+            COMMANDS_PER_JOB.observe(self.total - started, portal=self.portal)
+
+class MetricsExporter:
+    """Rewrites a metrics file every `interval` seconds and/or serves /metrics over HTTP."""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, path: Optional[str] = None,
+                 interval: float = 15.0, port: int = 0, host: str = '127.0.0.1'):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.port = port
+        self.host = host
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    @classmethod
+    def from_config(cls, config, worker: Optional[int] = None) -> Optional['MetricsExporter']:
+        """
+        Build an exporter from [Metrics], or None if metrics export is disabled.
+        Worker processes each have their own registry, so worker N exports to
+        <file>.workerN.prom and port + N.
+        """
+        if not config.getboolean('Metrics', 'enabled', fallback=False):
+            return None
+        path = config.get('Metrics', 'file', fallback=os.path.join('data', 'metrics.prom')) or None
+        port = config.getint('Metrics', 'port', fallback=0)
+        if worker is not None:
+            if path:
+                root, ext = os.path.splitext(path)
+                path = f'{root}.worker{worker}{ext}'
+            if port:
+                port += worker
+        return cls(
+            path=path,
+            interval=config.getfloat('Metrics', 'interval', fallback=15.0),
+            port=port,
+            host=config.get('Metrics', 'host', fallback='127.0.0.1')
+        )
+
+    def start(self) -> 'MetricsExporter':
+        if self.path:
+            self._thread = threading.Thread(target=self._write_loop, name='metrics-writer', daemon=True)
+            self._thread.start()
+        if self.port:
+            registry = self.registry
+
+            class Handler(BaseHTTPRequestHandler):
+                def log_message(self, format, *args):
+                    pass
+
+                def do_GET(self):
+                    body = registry.render().encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+            self.port = self._server.server_address[1]
+            threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True).start()
+        return self
+
+    def _write_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self) -> None:
+        if not self.path:
+            return
+        try:
+            self.registry.write(self.path)
+        except OSError:
+            pass
+
+    def stop(self) -> None:
+        """Stop exporting; the metrics file gets a final rewrite."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.write()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+def start_exporter(config, worker: Optional[int] = None) -> Optional[MetricsExporter]:
+    """
+    Start the process-wide exporter on first call; later calls return the
+    same one. `worker` is the index of a run_bot worker process.
+    """
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = MetricsExporter.from_config(config, worker)
+            if _exporter is not None:
+                _exporter.start()
+                atexit.register(_exporter.stop)
+        return _exporter
@@ -0,0 +1,114 @@
+"""
+Run job campaigns on several portals at once.
+
+Each portal plugin (see portals.PORTALS) runs its campaign in its own
+thread with its own driver, either started by the bot or leased from a
+DriverPool. Results are aggregated into one application_data summary; the
+search results come from each portal's journal, since the bots keep only
+their newest job records in memory.
+
+Usage:
+    python orchestrator.py [--portals linkedin,indeed] [--max-applications 50]
+                           [--config config.ini] [--pool]
+"""
+import argparse
+import configparser
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from driver_pool import DriverPool
+from journal import compact, write_summary
+from log_setup import setup_logging
+from portals import PORTALS
+
+class CampaignOrchestrator:
+    """Runs one campaign per portal concurrently and aggregates the results."""
+
+    def __init__(self, config_path: str = 'config.ini', portals: Optional[List[str]] = None,
+                 driver_pool: Optional[DriverPool] = None):
+        self.config_path = config_path
+        self.portals = portals or list(PORTALS)
+        unknown = [name for name in self.portals if name not in PORTALS]
+        if unknown:
+            raise ValueError(f"Unknown portal(s): {', '.join(unknown)}")
+        self.driver_pool = driver_pool
+        self.logger = logging.getLogger(__name__)
+
+    def run_portal(self, name: str, keywords: str, location: Optional[str],
+                   filters: Optional[Dict[str, str]], max_applications: int) -> Dict:
+        """Run a full campaign on one portal; returns its stats and search results."""
+        driver = self.driver_pool.acquire() if self.driver_pool else None
+        try:
+            portal = PORTALS[name](config_path=self.config_path, driver=driver)
+            try:
+                stats = portal.run_campaign(keywords, location, filters, max_applications)
+            finally:
+                portal.close()
+            # Closing the portal flushes its journal
+            search_results = compact(portal.journal.directory, portal.journal.run_id)['search_results']
+            return {'portal': name, **stats, 'search_results': search_results}
+        finally:
+            if driver is not None:
+                self.driver_pool.release(driver)
+
+    def run(self, keywords: str, location: Optional[str] = None,
+            filters: Optional[Dict[str, str]] = None, max_applications: int = 50) -> Dict:
+        """Run every portal concurrently. max_applications applies per portal."""
+        results = []
+        with ThreadPoolExecutor(max_workers=len(self.portals), thread_name_prefix='portal') as executor:
+            futures = {
+                executor.submit(self.run_portal, name, keywords, location, filters, max_applications): name
+                for name in self.portals
+            }
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    self.logger.error(f"{futures[future]} campaign failed: {str(e)}")
+        return self.aggregate(results)
+
+    @staticmethod
+    def aggregate(results: List[Dict]) -> Dict:
+        """Merge per-portal results into the application_data summary format."""
+        counters = ('applications_submitted', 'jobs_processed', 'jobs_skipped')
+        return {
+            'timestamp': datetime.now().isoformat(),
+            **{key: sum(r.get(key, 0) for r in results) for key in counters},
+            'portals': {r['portal']: {key: r.get(key, 0) for key in counters} for r in results},
+            'search_results': [
+                dict(entry, portal=r['portal']) for r in results for entry in r['search_results']
+            ]
+        }
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run job campaigns on several portals concurrently")
+    parser.add_argument('--portals', default=','.join(PORTALS),
+                        help="Comma-separated portals (default: all)")
+    parser.add_argument('--max-applications', type=int, default=50,
+                        help="Maximum applications per portal")
+    parser.add_argument('--config', default='config.ini', help="Path to config file")
+    parser.add_argument('--pool', action='store_true',
+                        help="Pre-spawn the portals' drivers in a DriverPool")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    config = configparser.ConfigParser()
+    config.read(args.config)
+    setup_logging(config)
+    portals = [name.strip() for name in args.portals.split(',') if name.strip()]
+
+    pool = DriverPool.from_config(config, size=len(portals)) if args.pool else None
+    try:
+        orchestrator = CampaignOrchestrator(args.config, portals, pool)
+        summary = orchestrator.run(
+            config.get('SearchCriteria', 'keywords', fallback='Software Engineer'),
+            config.get('SearchCriteria', 'location', fallback=None),
+            max_applications=args.max_applications
+        )
+        print(f"Results saved to {write_summary(summary)}")
+    finally:
+        if pool:
+            pool.close()
@@ -0,0 +1,117 @@
+"""
+Pipelined pagination.
+
+A PagePrefetcher walks a search's results pages in a browser of its own on
+a worker thread: it loads a page, extracts it, hands the result over
+through a bounded queue and moves on to the next page. The campaign works
+on page N while page N+1 loads; once `depth` pages are waiting the worker
+blocks, so it never runs further ahead than that.
+
+The worker is the only thread that touches its driver, and nothing it
+hands over (job records, URLs) refers to that driver's elements.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Tuple
+
+_DONE = object()
+
+class PrefetchedPage(NamedTuple):
+    """One results page: its number, its URL and what read_page extracted from it."""
+    number: int
+    url: Optional[str]
+    payload: Any
+
+class PagePrefetcher:
+    """
+    Loads results pages ahead of the caller in a second driver.
+
+    `read_page(driver)` returns (handle, payload) for the page the driver is
+    on; the payload is handed to the caller and the handle (e.g. the result
+    cards) to `next_page(driver, handle)`, which moves to the next page and
+    returns False after the last one. Iterating the prefetcher yields
+    PrefetchedPage tuples in order; an error in the worker is re-raised in
+    the caller once the pages read before it are consumed.
+
+    An optional `renew(driver)` runs on the worker after each move to a
+    new page and may return a replacement driver already on that page
+    (see recycling.RecyclePolicy).
+    """
+
+    def __init__(self, driver, start_url: str, read_page: Callable[[Any], Tuple[Any, Any]],
+                 next_page: Callable[[Any, Any], bool], depth: int = 1, first_page: int = 1,
+                 renew: Optional[Callable[[Any], Any]] = None, logger: Optional[logging.Logger] = None):
+        self.driver = driver
+        self.start_url = start_url
+        self.read_page = read_page
+        self.next_page = next_page
+        self.renew = renew
+        self.first_page = first_page
+        self.logger = logger or logging.getLogger(__name__)
+        self.pages = 0
+        # Time the caller spent blocked on a page that wasn't ready yet
+        self.wait_seconds = 0.0
+        self._queue = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._run, name='page-prefetch', daemon=True)
+
+    def start(self) -> 'PagePrefetcher':
+        self._worker.start()
+        return self
+
+    def _put(self, item) -> bool:
+        """Queue an item, waiting for room unless the prefetcher is closed."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        try:
+            self.driver.get(self.start_url)
+            number = self.first_page
+            while not self._stop.is_set():
+                handle, payload = self.read_page(self.driver)
+                if not self._put(PrefetchedPage(number, self.driver.current_url, payload)):
+                    return
+                if self._stop.is_set() or not self.next_page(self.driver, handle):
+                    break
+                # The old page's elements are stale; don't keep them alive
+                handle = None
+                if self.renew is not None:
+                    self.driver = self.renew(self.driver) or self.driver
+                number += 1
+        except Exception as e:
+            if not self._stop.is_set():
+                self.logger.error(f"Page prefetch failed: {str(e)}")
+                self._put(e)
+        finally:
+            self._put(_DONE)
+
+    def __iter__(self) -> Iterator[PrefetchedPage]:
+        while True:
+            started = time.perf_counter()
+            item = self._queue.get()
+            self.wait_seconds += time.perf_counter() - started
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            self.pages += 1
+            yield item
+
+    def close(self, timeout: float = 30) -> None:
+        """Stop the worker after the page it is on; the driver is left to its owner."""
+        self._stop.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        if self._worker.is_alive():
+            self._worker.join(timeout)
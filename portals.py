@@ -0,0 +1,501 @@
+"""
+Portal plugin interface.
+
+Each job portal is wrapped in a JobPortal plugin exposing the same steps:
+login, search, iterate result pages, fetch a job description and apply.
+The shared campaign loop (skip already-handled jobs, score, apply to the
+best matches first, record outcomes) lives in JobPortal.run_campaign, so
+the orchestrator can drive every portal the same way. A portal with a
+checkpoint (see open_checkpoint) can resume an interrupted campaign.
+"""
+import logging
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import Dict, Iterator, List, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from checkpoint import Checkpoint, fingerprint
+from description_cache import DescriptionCache
+from description_fetcher import DescriptionFetcher
+from job_index import JobIndex
+from log_setup import log_context
+from metrics import DESCRIPTION_FETCH_SECONDS, JOB_OUTCOMES, SKILL_MATCH_SECONDS
+from scoring import CandidatePool, JobScorer
+from skill_matcher import SkillMatcher
+
+class JobPortal(ABC):
+    """A job portal the orchestrator can run campaigns on."""
+
+    name = None
+
+    def __init__(self, config, job_index: JobIndex, journal, logger: Optional[logging.Logger] = None):
+        self.config = config
+        self.job_index = job_index
+        self.journal = journal
+        self.logger = logger or logging.getLogger(__name__)
+        self.skill_matcher = SkillMatcher.from_config(config)
+        self.scorer = JobScorer.from_config(config, self.skill_matcher)
+        self.candidate_pages = config.getint('Scoring', 'candidate_pages', fallback=3)
+        # Optional DescriptionFetcher for screening jobs over HTTP
+        self.fetcher = None
+        # Optional DescriptionCache consulted before any fetch
+        self.description_cache = None
+        # Optional DuplicateIndex collapsing reposts before they are opened
+        self.duplicates = None
+        # Optional metrics.CommandCounter for the portal's driver
+        self.command_counter = None
+        # Optional checkpoint.Checkpoint, set by open_checkpoint
+        self.checkpoint = None
+        self.stats = {'jobs_processed': 0, 'jobs_skipped': 0, 'applications_submitted': 0}
+
+    @property
+    @abstractmethod
+    def driver(self):
+        """The WebDriver the portal's bot is using."""
+
+    @abstractmethod
+    def login(self) -> bool:
+        """Log in, reusing a saved session where possible."""
+
+    @abstractmethod
+    def search(self, keywords: str, location: Optional[str] = None,
+               filters: Optional[Dict[str, str]] = None) -> bool:
+        """Run a search and leave the browser on its first results page."""
+
+    @abstractmethod
+    def iter_results(self) -> Iterator[List[Dict]]:
+        """Yield the job records (see job_extractor.RECORD_FIELDS) of each results page."""
+
+    @abstractmethod
+    def fetch_description(self, record: Dict) -> Optional[str]:
+        """Open a job and return its description text, or None if it could not be read."""
+
+    @abstractmethod
+    def apply(self, record: Dict) -> bool:
+        """Apply to the job most recently opened with open_job."""
+
+    @abstractmethod
+    def search_results(self) -> List[Dict]:
+        """Search entries collected so far, in application_data format."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release the bot, its journal and (if owned) its driver."""
+
+    def description_url(self, record: Dict) -> Optional[str]:
+        """Job detail page fetched over HTTP when prescreening."""
+        return record.get('url')
+
+    def maybe_recycle(self) -> bool:
+        """Restart the portal's browser if its recycle policy says it is due."""
+        return False
+
+    def open_checkpoint(self, keywords: str, location: Optional[str], resume: bool) -> Optional[Dict]:
+        """
+        Open the campaign's checkpoint and return the state to resume from, if
+        any. Portals that don't checkpoint leave self.checkpoint None.
+        """
+        return None
+
+    def resume_search(self, keywords: str, location: Optional[str],
+                      filters: Optional[Dict[str, str]], saved: Dict) -> bool:
+        """Reopen the results page a checkpoint was saved on (default: search again)."""
+        return self.search(keywords, location, filters)
+
+    def prefetch_descriptions(self, records: List[Dict]) -> Dict[str, str]:
+        """
+        Read the descriptions of a page of jobs from the cache, then fetch the
+        rest concurrently over HTTP with the browser's cookies. Returns
+        {job_id: description} for the jobs that could be read; the rest are
+        opened in the browser as usual.
+        """
+        job_ids = [record['job_id'] for record in records if record.get('job_id')]
+        descriptions = self.description_cache.get_many(self.name, job_ids) if self.description_cache else {}
+        if self.fetcher is None:
+            return descriptions
+        urls = {record['job_id']: self.description_url(record) for record in records
+                if record.get('job_id') and record['job_id'] not in descriptions}
+        urls = {job_id: url for job_id, url in urls.items() if url}
+        if not urls:
+            return descriptions
+        try:
+            self.fetcher.sync_cookies(self.driver)
+            fetched = self.fetcher.fetch_many(urls)
+        except Exception as e:
+            self.logger.warning(f"{self.name}: description prefetch failed, using the browser: {str(e)}")
+            return descriptions
+        fetched = {job_id: description for job_id, description in fetched.items() if description}
+        self.cache_descriptions(fetched)
+        descriptions.update(fetched)
+        return descriptions
+
+    def cache_descriptions(self, descriptions: Dict[str, str]) -> None:
+        """Keep {job_id: description} for later searches surfacing the same jobs."""
+        if self.description_cache and descriptions:
+            try:
+                self.description_cache.put_many(self.name, descriptions)
+            except Exception as e:
+                self.logger.warning(f"{self.name}: could not cache descriptions: {str(e)}")
+
+    def open_job(self, record: Dict) -> Optional[str]:
+        """
+        Open a pooled job again before applying to it, possibly after the
+        browser has moved on to later results pages.
+        """
+        return self.fetch_description(record)
+
+    def record_outcome(self, record: Dict, status: str, score: Optional[float] = None) -> None:
+        """Record a job's status in the job index and journal final outcomes with their score."""
+        job_id = record.get('job_id')
+        if status == JobIndex.APPLIED:
+            self.stats['applications_submitted'] += 1
+        JOB_OUTCOMES.inc(portal=self.name, status=status)
+        if job_id:
+            self.job_index.mark(self.name, job_id, status)
+        if status != JobIndex.SEEN:
+            self.journal.append('application', portal=self.name, job_id=job_id, status=status, score=score)
+
+    def collect_candidates(self, records: List[Dict], candidates: CandidatePool) -> None:
+        """
+        Score the new jobs of one results page and pool the ones that pass.
+        Descriptions come over HTTP where possible; the rest are opened in the
+        browser while their page is still loaded. Scores are stored on the records.
+        """
+        known = self.job_index.statuses(
+            self.name, [record['job_id'] for record in records if record.get('job_id')]
+        )
+        fresh = []
+        for record in records:
+            job_id = record.get('job_id')
+            # Skip jobs handled on a previous run without opening them
+            if known.get(job_id) in JobIndex.FINAL_STATUSES:
+                self.stats['jobs_skipped'] += 1
+            # Jobs without an ID can't be found again once the page changes
+            elif job_id and job_id not in candidates:
+                fresh.append(record)
+        with log_context(stage='prefetch'):
+            descriptions = self.prefetch_descriptions(fresh)
+        # Reposts of jobs already seen are dropped before any is opened
+        fresh = self.collapse_duplicates(fresh, descriptions)
+
+        for record in fresh:
+            self.stats['jobs_processed'] += 1
+            if record['job_id'] in descriptions:
+                continue
+            try:
+                with log_context(job_id=record['job_id'], stage='description'):
+                    description = self.fetch_description(record)
+            except Exception as e:
+                self.logger.error(f"{self.name}: failed to open job {record['job_id']}: {str(e)}")
+                continue
+            if description is not None:
+                descriptions[record['job_id']] = description
+                self.cache_descriptions({record['job_id']: description})
+
+        with log_context(stage='score'), SKILL_MATCH_SECONDS.time(portal=self.name):
+            scores = self.scorer.score_many(descriptions)
+        for record in fresh:
+            score = scores.get(record['job_id'])
+            if score is None:
+                continue
+            record['score'] = score.score
+            self.record_outcome(record, JobIndex.SEEN)
+            if score.passed:
+                candidates.push(record['job_id'], score.score, record)
+            else:
+                self.logger.info(f"{self.name}: job {record['job_id']} doesn't match required criteria "
+                                 f"(missing: {', '.join(sorted(score.match.missing_required)) or 'none'}, "
+                                 f"score {score.score})")
+                self.record_outcome(record, JobIndex.REJECTED, score.score)
+            if self.checkpoint:
+                self.checkpoint.update(last_job_id=record['job_id'], candidates=candidates.entries(), **self.stats)
+
+    def collapse_duplicates(self, records: List[Dict], descriptions: Dict[str, str]) -> List[Dict]:
+        """
+        Record the jobs that repost one already seen, on this portal or
+        another, as duplicates and return the rest.
+        """
+        if self.duplicates is None or not records:
+            return records
+        try:
+            clusters = self.duplicates.check_many(self.name, records, descriptions)
+        except Exception as e:
+            self.logger.warning(f"{self.name}: duplicate check failed: {str(e)}")
+            return records
+        kept = []
+        for record in records:
+            cluster = clusters.get(record['job_id'])
+            if cluster is None:
+                kept.append(record)
+                continue
+            record['duplicate_of'] = cluster
+            self.stats['jobs_skipped'] += 1
+            self.logger.info(f"{self.name}: job {record['job_id']} is a repost of {cluster}, skipping")
+            self.record_outcome(record, JobIndex.DUPLICATE)
+        return kept
+
+    def apply_candidate(self, record: Dict, score: float) -> bool:
+        """Reopen a pooled job and apply to it."""
+        with log_context(stage='apply'):
+            if self.open_job(record) is None:
+                return False
+            if not self.apply(record):
+                return False
+        self.record_outcome(record, JobIndex.APPLIED, score)
+        return True
+
+    def run_campaign(self, keywords: str, location: Optional[str] = None,
+                     filters: Optional[Dict[str, str]] = None, max_applications: int = 50,
+                     resume: bool = False) -> Dict:
+        """
+        Log in, search and score result pages, then apply to the best-scoring
+        jobs first until max_applications is reached. Progress and the pool
+        are checkpointed if the portal has a checkpoint; with resume=True a
+        matching checkpoint restores them and reopens the saved results page.
+        """
+        with log_context(portal=self.name):
+            return self._run_campaign(keywords, location, filters, max_applications, resume)
+
+    def _run_campaign(self, keywords, location, filters, max_applications, resume=False) -> Dict:
+        saved = self.open_checkpoint(keywords, location, resume)
+        with log_context(stage='login'):
+            if not self.login():
+                self.logger.error(f"{self.name}: login failed, skipping campaign")
+                return self.stats
+        with log_context(stage='search'):
+            if saved and saved.get('page_url'):
+                found = self.resume_search(keywords, location, filters, saved)
+            else:
+                found = self.search(keywords, location, filters)
+            if not found:
+                return self.stats
+
+        # Pool candidates over at least candidate_pages pages, and further
+        # while there are fewer candidates than applications left to send
+        candidates = CandidatePool(saved.get('candidates') if saved else None)
+        resume_after = saved.get('last_job_id') if saved else None
+        pages = self.iter_results()
+        try:
+            for page, records in enumerate(pages, 1):
+                # On the resumed page, drop the jobs before the checkpoint
+                if resume_after:
+                    job_ids = [record.get('job_id') for record in records]
+                    if resume_after in job_ids:
+                        records = records[job_ids.index(resume_after) + 1:]
+                    resume_after = None
+                self.collect_candidates(records, candidates)
+                remaining = max_applications - self.stats['applications_submitted']
+                if page >= self.candidate_pages and len(candidates) >= remaining:
+                    break
+        finally:
+            # Stop loading (or prefetching) pages that won't be read
+            pages.close()
+        candidates.rescore(self.scorer)
+
+        while candidates and self.stats['applications_submitted'] < max_applications:
+            job_id, score, record = candidates.pop()
+            # A resumed pool may hold jobs handled since it was saved, and
+            # keeps only the ids of the jobs, not their records
+            if self.job_index.get_status(self.name, job_id) in JobIndex.FINAL_STATUSES:
+                continue
+            record = record or {'job_id': job_id}
+            try:
+                # Each candidate is reopened by URL, so nothing needs resuming
+                self.maybe_recycle()
+                with log_context(job_id=job_id), \
+                        self.command_counter.job() if self.command_counter else nullcontext():
+                    self.apply_candidate(record, score)
+            except Exception as e:
+                self.logger.error(f"{self.name}: failed to apply to job {job_id}: {str(e)}")
+            if self.checkpoint:
+                self.checkpoint.update(candidates=candidates.entries(), **self.stats)
+
+        # Finished: the next run starts from the first page again
+        if self.checkpoint:
+            self.checkpoint.clear()
+            self.checkpoint = None
+        self.logger.info(f"{self.name} campaign completed: {self.stats}")
+        return self.stats
+
+class LinkedInPortal(JobPortal):
+    """JobApplicationBot as a portal plugin."""
+
+    name = 'linkedin'
+
+    DESCRIPTION_SELECTOR = '.show-more-less-html__markup, .jobs-description__content, #job-details'
+
+    def __init__(self, config_path: str = 'config.ini', driver=None):
+        from main import JobApplicationBot
+
+        self.bot = JobApplicationBot(config_path=config_path, autosave=False, driver=driver)
+        super().__init__(self.bot.config, JobIndex.from_config(self.bot.config),
+                         self.bot.journal, self.bot.logger)
+        self.fetcher = DescriptionFetcher.from_config(self.config, 'linkedin', self.bot.rate_limiter, self.logger)
+        self.description_cache = DescriptionCache.from_config(self.config)
+        self.duplicates = self.bot.duplicates
+        self.command_counter = self.bot.command_counter
+
+    @property
+    def driver(self):
+        return self.bot.driver
+
+    def login(self) -> bool:
+        return self.bot.login_to_linkedin()
+
+    def search(self, keywords, location=None, filters=None) -> bool:
+        return self.bot.search_linkedin_jobs(keywords, location, filters)
+
+    def iter_results(self) -> Iterator[List[Dict]]:
+        # The results list is extracted by search_linkedin_jobs; further
+        # pages load by infinite scroll and are not walked yet
+        if self.bot.search_results:
+            yield self.bot.search_results[-1]['jobs']
+
+    def fetch_description(self, record) -> Optional[str]:
+        if not record.get('url'):
+            return None
+        with DESCRIPTION_FETCH_SECONDS.time(portal=self.name, source='browser'):
+            self.bot.driver.get(record['url'])
+            self.bot.pages_since_recycle += 1
+            element = self.bot.waits.until(
+                'linkedin_job_description',
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.DESCRIPTION_SELECTOR))
+            )
+        return element.text if element else None
+
+    def apply(self, record) -> bool:
+        if record.get('easy_apply') is False:
+            self.logger.info(f"linkedin: job {record.get('job_id')} has no Easy Apply, leaving it for manual review")
+            return False
+        return self.bot.submit_easy_apply(record.get('job_id')).submitted
+
+    def maybe_recycle(self) -> bool:
+        return self.bot.maybe_recycle()
+
+    def search_results(self) -> List[Dict]:
+        return self.bot.search_results
+
+    def close(self) -> None:
+        self.bot.applications_submitted = self.stats['applications_submitted']
+        self.bot.jobs_processed = self.stats['jobs_processed']
+        if self.fetcher:
+            self.fetcher.close()
+        if self.description_cache:
+            self.description_cache.close()
+        self.job_index.close()
+        self.bot.cleanup()
+
+class IndeedPortal(JobPortal):
+    """
+    IndeedJobBot as a portal plugin. Pass `bot` to run the campaign on an
+    existing bot (see IndeedJobBot.run_job_search_campaign); the portal
+    shares its counters, and checkpoints each results page through it.
+    """
+
+    name = 'indeed'
+
+    def __init__(self, config_path: str = 'config.ini', driver=None, bot=None):
+        if bot is None:
+            from indeed_job_bot import IndeedJobBot
+            bot = IndeedJobBot(config_path=config_path, driver=driver)
+        self.bot = bot
+        super().__init__(self.bot.config, self.bot.job_index, self.bot.journal)
+        self.stats = self.bot.stats
+        self.fetcher = self.bot.fetcher
+        self.description_cache = self.bot.description_cache
+        self.duplicates = self.bot.duplicates
+        self.command_counter = self.bot.command_counter
+        self._search = None
+        self._start_url = None
+        self._cards = {}
+
+    @property
+    def driver(self):
+        return self.bot.driver
+
+    def login(self) -> bool:
+        return self.bot.login_to_indeed()
+
+    def open_checkpoint(self, keywords, location, resume) -> Optional[Dict]:
+        self.checkpoint = self.bot.checkpoint = Checkpoint.from_config(
+            self.config, 'indeed_campaign', fingerprint({'keywords': keywords, 'location': location})
+        )
+        saved = self.checkpoint.load() if resume else None
+        # Journal runs of this campaign so far, so compact() merges them
+        parents = saved.get('runs', []) if saved else []
+        if parents:
+            self.journal.append('resume', parents=parents)
+        self.bot.run_lineage = parents + [self.journal.run_id]
+        return saved
+
+    def search(self, keywords, location=None, filters=None) -> bool:
+        # With prefetching the results pages are opened in a second browser
+        if not self.bot.search_jobs(keywords, location, filters, navigate=not self.bot.prefetch_pages):
+            return False
+        self._search = self.bot.begin_search(keywords, location, filters)
+        self._start_url = self.bot.search_plan.url
+        return True
+
+    def resume_search(self, keywords, location, filters, saved) -> bool:
+        self.bot.resume_search(keywords, location, saved, navigate=not self.bot.prefetch_pages)
+        self._search = self.bot.begin_search(keywords, location, filters)
+        self._start_url = saved['page_url']
+        return True
+
+    def iter_results(self) -> Iterator[List[Dict]]:
+        if self._search is None:
+            return
+        if self.bot.prefetch_pages:
+            pages = self.bot.iter_prefetched_pages(*self._search, self._start_url)
+        else:
+            pages = self.bot.iter_result_pages(*self._search)
+        try:
+            for job_cards, records in pages:
+                # Cards are only valid until the next page loads
+                self._cards = {id(record): card for card, record in zip(job_cards, records)}
+                yield records
+        finally:
+            self._cards = {}
+            pages.close()
+
+    def description_url(self, record) -> Optional[str]:
+        return self.bot.description_url(record['job_id']) if record.get('job_id') else None
+
+    def fetch_description(self, record) -> Optional[str]:
+        card = self._cards.get(id(record))
+        if card is None:
+            # Prefetched pages have no cards in this browser; open the job's page
+            if self.bot.prefetch_pages and record.get('job_id'):
+                return self.bot.open_job_page(record['job_id'])
+            return None
+        return self.bot.open_job(card)
+
+    def open_job(self, record) -> Optional[str]:
+        # Cards go stale once another page loads; reopen the job by its URL
+        self._cards = {}
+        if not record.get('job_id'):
+            return None
+        return self.bot.open_job_page(record['job_id'])
+
+    def apply(self, record) -> bool:
+        try:
+            return self.bot.submit_application(record.get('job_id')).submitted
+        except Exception as e:
+            self.logger.error(f"indeed: failed to apply to job {record.get('job_id')}: {str(e)}")
+            return False
+
+    def maybe_recycle(self) -> bool:
+        return self.bot.maybe_recycle()
+
+    def search_results(self) -> List[Dict]:
+        return self.bot.search_results
+
+    def close(self) -> None:
+        self.bot.close()
+
+PORTALS = {
+    LinkedInPortal.name: LinkedInPortal,
+    IndeedPortal.name: IndeedPortal,
+}
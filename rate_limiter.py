@@ -0,0 +1,346 @@
+import configparser
+import logging
+import threading
+import time
+from collections import deque
+from multiprocessing.managers import BaseManager
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.events import AbstractEventListener, EventFiringWebDriver
+
+from log_setup import setup_logging
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        self._refill(time.monotonic())
+        self.rate = rate
+
+class _HostState:
+    def __init__(self, rate: float, burst: float, window: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.outcomes = deque(maxlen=window)
+        self.streak = 0
+        self.requests = 0
+        self.timeouts = 0
+        self.captchas = 0
+
+class AdaptiveRateLimiter:
+    """
+    Per-host token buckets whose rates adapt AIMD-style.
+
+    Every navigation and click takes a token from its host's bucket. After
+    `increase_after` consecutive successful actions the host's rate grows by
+    `increase` requests/s; a CAPTCHA cuts it by `captcha_factor` and a
+    timeout rate above `timeout_threshold` over the last `window` actions
+    cuts it by `timeout_factor`. Rates stay within [min_rate, max_rate].
+    """
+
+    def __init__(self, initial_rate: float = 1.0, min_rate: float = 0.1, max_rate: float = 5.0,
+                 burst: float = 3.0, increase: float = 0.1, increase_after: int = 10,
+                 captcha_factor: float = 0.5, timeout_factor: float = 0.75,
+                 timeout_threshold: float = 0.2, window: int = 20, log_interval: float = 60.0,
+                 logger: Optional[logging.Logger] = None):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.increase_after = increase_after
+        self.captcha_factor = captcha_factor
+        self.timeout_factor = timeout_factor
+        self.timeout_threshold = timeout_threshold
+        self.window = window
+        self.log_interval = log_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_log = time.monotonic()
+
+    @classmethod
+    def from_config(cls, config, logger: Optional[logging.Logger] = None) -> 'AdaptiveRateLimiter':
+        """Build a limiter from the optional [RateLimit] config section."""
+        section = 'RateLimit'
+        return cls(
+            initial_rate=config.getfloat(section, 'initial_rate', fallback=1.0),
+            min_rate=config.getfloat(section, 'min_rate', fallback=0.1),
+            max_rate=config.getfloat(section, 'max_rate', fallback=5.0),
+            burst=config.getfloat(section, 'burst', fallback=3.0),
+            increase=config.getfloat(section, 'increase', fallback=0.1),
+            increase_after=config.getint(section, 'increase_after', fallback=10),
+            captcha_factor=config.getfloat(section, 'captcha_factor', fallback=0.5),
+            timeout_factor=config.getfloat(section, 'timeout_factor', fallback=0.75),
+            timeout_threshold=config.getfloat(section, 'timeout_threshold', fallback=0.2),
+            window=config.getint(section, 'window', fallback=20),
+            log_interval=config.getfloat(section, 'log_interval', fallback=60.0),
+            logger=logger
+        )
+
+    @staticmethod
+    def host_of(target: str) -> str:
+        """Host of a URL; anything that isn't a URL is used as the host key as-is."""
+        return urlparse(target).netloc or target
+
+    def _host(self, target: Optional[str]) -> Optional[str]:
+        """
+        Host key for `target`. Without one, the host of this thread's last
+        action: a click belongs to the page its own thread navigated to, not
+        to a URL another thread (prefetch, description fetches) just used.
+        """
+        if target:
+            host = self.host_of(target)
+            self._local.host = host
+            return host
+        return getattr(self._local, 'host', None)
+
+    def _state(self, host: str) -> _HostState:
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(self.initial_rate, self.burst, self.window)
+        return self._hosts[host]
+
+    def reserve(self, target: Optional[str] = None) -> float:
+        """Take a token for the host of `target` and return how long to wait before using it."""
+        host = self._host(target)
+        if host is None:
+            return 0.0
+        with self._lock:
+            state = self._state(host)
+            state.requests += 1
+            return state.bucket.reserve()
+
+    def acquire(self, target: Optional[str] = None) -> float:
+        """
+        Block until the host of `target` (default: this thread's last host)
+        may take another action. Returns the seconds spent waiting.
+        """
+        delay = self.reserve(target)
+        with self._lock:
+            log_state = time.monotonic() - self._last_log >= self.log_interval
+            if log_state:
+                self._last_log = time.monotonic()
+        if log_state:
+            self.log_state()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def _set_rate(self, host: str, state: _HostState, rate: float, reason: str) -> None:
+        rate = max(self.min_rate, min(self.max_rate, rate))
+        if rate == state.bucket.rate:
+            return
+        self.logger.info(f"Rate limit {host}: {state.bucket.rate:.2f} -> {rate:.2f} req/s ({reason})")
+        state.bucket.set_rate(rate)
+
+    def on_success(self, target: Optional[str] = None) -> None:
+        """Additive increase after a run of successful actions."""
+        host = self._host(target)
+        if host is None:
+            return
+        with self._lock:
+            state = self._state(host)
+            state.outcomes.append(False)
+            state.streak += 1
+            if state.streak >= self.increase_after:
+                state.streak = 0
+                self._set_rate(host, state, state.bucket.rate + self.increase, 'steady')
+
+    def on_timeout(self, target: Optional[str] = None) -> None:
+        """Multiplicative decrease once timeouts exceed the threshold rate."""
+        host = self._host(target)
+        if host is None:
+            return
+        with self._lock:
+            state = self._state(host)
+            state.timeouts += 1
+            state.streak = 0
+            state.outcomes.append(True)
+            timeout_rate = sum(state.outcomes) / len(state.outcomes)
+            if len(state.outcomes) >= min(5, self.window) and timeout_rate > self.timeout_threshold:
+                self._set_rate(host, state, state.bucket.rate * self.timeout_factor,
+                               f'timeout rate {timeout_rate:.0%}')
+                state.outcomes.clear()
+
+    def on_captcha(self, target: Optional[str] = None) -> None:
+        """Multiplicative decrease on a CAPTCHA; the bucket is drained as well."""
+        host = self._host(target)
+        if host is None:
+            return
+        with self._lock:
+            state = self._state(host)
+            state.captchas += 1
+            state.streak = 0
+            state.bucket.tokens = min(state.bucket.tokens, 0)
+            self._set_rate(host, state, state.bucket.rate * self.captcha_factor, 'captcha')
+
+    def interval(self, target: Optional[str] = None) -> float:
+        """Current spacing between actions for a host, in seconds."""
+        host = self._host(target)
+        if host is None:
+            return 1.0 / self.initial_rate
+        with self._lock:
+            return 1.0 / self._state(host).bucket.rate
+
+    def state(self) -> Dict[str, Dict]:
+        """Per-host rate, available tokens and feedback counters."""
+        with self._lock:
+            return {
+                host: {
+                    'rate': round(state.bucket.rate, 3),
+                    'tokens': round(state.bucket.tokens, 2),
+                    'requests': state.requests,
+                    'timeouts': state.timeouts,
+                    'captchas': state.captchas
+                }
+                for host, state in self._hosts.items()
+            }
+
+    def log_state(self) -> None:
+        for host, state in self.state().items():
+            self.logger.info(
+                f"Rate limit {host}: {state['rate']} req/s, {state['requests']} requests, "
+                f"{state['timeouts']} timeouts, {state['captchas']} captchas"
+            )
+
+class SharedRateLimiter(AdaptiveRateLimiter):
+    """
+    An AdaptiveRateLimiter whose per-host state lives in another process
+    (see RateLimitManager), so all workers of a run draw on the same buckets
+    and a CAPTCHA or timeout seen by one worker slows every worker. The
+    fallback host and the wait for a token stay in the calling process.
+    """
+
+    def __init__(self, remote, log_interval: float = 60.0, logger: Optional[logging.Logger] = None):
+        super().__init__(log_interval=log_interval, logger=logger)
+        self.remote = remote
+
+    def reserve(self, target: Optional[str] = None) -> float:
+        host = self._host(target)
+        return self.remote.reserve(host) if host else 0.0
+
+    def on_success(self, target: Optional[str] = None) -> None:
+        host = self._host(target)
+        if host:
+            self.remote.on_success(host)
+
+    def on_timeout(self, target: Optional[str] = None) -> None:
+        host = self._host(target)
+        if host:
+            self.remote.on_timeout(host)
+
+    def on_captcha(self, target: Optional[str] = None) -> None:
+        host = self._host(target)
+        if host:
+            self.remote.on_captcha(host)
+
+    def interval(self, target: Optional[str] = None) -> float:
+        return self.remote.interval(self._host(target))
+
+    def state(self) -> Dict[str, Dict]:
+        return self.remote.state()
+
+def _limiter_from_config(config_path: str) -> AdaptiveRateLimiter:
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    # The manager is a process of its own; its rate changes go to its own log
+    setup_logging(config)
+    return AdaptiveRateLimiter.from_config(config)
+
+class RateLimitManager(BaseManager):
+    """
+    Serves one AdaptiveRateLimiter to every worker process of a run:
+
+        with RateLimitManager() as manager:
+            remote = manager.limiter(config_path)
+            # each worker uses SharedRateLimiter(remote)
+    """
+
+RateLimitManager.register(
+    'limiter', _limiter_from_config,
+    exposed=('reserve', 'on_success', 'on_timeout', 'on_captcha', 'interval', 'state')
+)
+
+class RateLimitListener(AbstractEventListener):
+    """
+    Routes every navigation and click through an AdaptiveRateLimiter.
+    `on_page_change`, if given, is called after each navigation and click,
+    e.g. to drop page-level caches.
+    """
+
+    def __init__(self, limiter: AdaptiveRateLimiter, on_page_change: Optional[Callable[[], None]] = None):
+        self.limiter = limiter
+        self.on_page_change = on_page_change
+
+    def _page_changed(self) -> None:
+        if self.on_page_change is not None:
+            self.on_page_change()
+
+    def before_navigate_to(self, url, driver) -> None:
+        self.limiter.acquire(url)
+
+    def after_navigate_to(self, url, driver) -> None:
+        self.limiter.on_success(url)
+        self._page_changed()
+
+    def before_navigate_back(self, driver) -> None:
+        self.limiter.acquire()
+
+    def after_navigate_back(self, driver) -> None:
+        self._page_changed()
+
+    def before_navigate_forward(self, driver) -> None:
+        self.limiter.acquire()
+
+    def after_navigate_forward(self, driver) -> None:
+        self._page_changed()
+
+    def before_click(self, element, driver) -> None:
+        # Clicks count against the host of the last navigation
+        self.limiter.acquire()
+
+    def after_click(self, element, driver) -> None:
+        self.limiter.on_success()
+        # A click may submit a form or follow a link
+        self._page_changed()
+
+    def on_exception(self, exception, driver) -> None:
+        if isinstance(exception, TimeoutException):
+            self.limiter.on_timeout()
+
+def unwrap(element):
+    """
+    The plain WebElement behind an element returned by a throttled driver.
+    Needed where Selenium serialises the element itself, e.g. switch_to.frame.
+    """
+    return getattr(element, 'wrapped_element', element)
+
+def throttled(driver, limiter: AdaptiveRateLimiter, on_page_change: Optional[Callable[[], None]] = None):
+    """
+    Wrap a driver so its navigations and clicks are rate limited. Drivers
+    that are already wrapped, or aren't real WebDrivers (test doubles), are
+    returned unchanged.
+    """
+    if isinstance(driver, EventFiringWebDriver) or not isinstance(driver, WebDriver):
+        return driver
+    return EventFiringWebDriver(driver, RateLimitListener(limiter, on_page_change))
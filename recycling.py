@@ -0,0 +1,139 @@
+"""
+Browser recycling and memory bounds for long campaigns.
+
+Chrome's memory grows steadily over hundreds of pages. A RecyclePolicy
+says when a campaign should restart its browser: after `max_pages` page
+loads, or once the browser's process tree crosses `max_rss_mb`. The bots
+restart it with restart_driver(), which carries the session over to the
+new browser and reopens the page it was on, so the campaign continues
+where it was.
+
+The policy also caps the job records kept in memory, per search entry
+(spill_jobs) or across a bot's entries (spill_searches). Every record is
+journaled when its page is read, so the records dropped from memory stay
+on disk and journal.compact() still returns all of them.
+"""
+import logging
+from typing import Callable, Dict, List, Optional
+
+from browser import chrome_rss_mb, process_rss_mb
+from session_store import COOKIE_FIELDS
+
+class RecyclePolicy:
+    """When to restart the browser, and how many job records to keep in memory per search."""
+
+    def __init__(self, max_pages: int = 100, max_rss_mb: float = 1500.0, max_buffered_jobs: int = 500):
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.max_buffered_jobs = max_buffered_jobs
+
+    @classmethod
+    def from_config(cls, config) -> Optional['RecyclePolicy']:
+        """Build a policy from [Recycling], or None if recycling is disabled."""
+        section = 'Recycling'
+        if not config.getboolean(section, 'enabled', fallback=True):
+            return None
+        return cls(
+            max_pages=config.getint(section, 'max_pages', fallback=100),
+            max_rss_mb=config.getfloat(section, 'max_rss_mb', fallback=1500.0),
+            max_buffered_jobs=config.getint(section, 'max_buffered_jobs', fallback=500)
+        )
+
+    def reason(self, pages: int, rss_mb: Optional[float]) -> Optional[str]:
+        """Why the browser is due for a restart, or None if it isn't (0 disables a limit)."""
+        if self.max_pages and pages >= self.max_pages:
+            return "page limit reached"
+        if self.max_rss_mb and rss_mb is not None and rss_mb >= self.max_rss_mb:
+            return f"Chrome RSS {rss_mb} MB"
+        return None
+
+def _spill(entry: Dict, keep: int) -> int:
+    excess = len(entry['jobs']) - keep
+    if excess <= 0:
+        return 0
+    del entry['jobs'][:excess]
+    entry['jobs_spilled'] = entry.get('jobs_spilled', 0) + excess
+    return excess
+
+def spill_jobs(entry: Dict, limit: int) -> int:
+    """
+    Keep only the newest `limit` job records of a search entry in memory,
+    counting the rest in entry['jobs_spilled']. Returns how many were dropped.
+    """
+    return _spill(entry, limit) if limit > 0 else 0
+
+def spill_searches(entries: List[Dict], limit: int) -> int:
+    """
+    Keep at most `limit` job records across a list of search entries, the
+    newest searches' first. The last entry is still being worked on and
+    keeps all of its records. Returns how many were dropped.
+    """
+    if limit <= 0 or not entries:
+        return 0
+    budget = max(0, limit - len(entries[-1]['jobs']))
+    dropped = 0
+    for index in range(len(entries) - 2, -1, -1):
+        entry = entries[index]
+        if not budget and not entry['jobs'] and entry.get('jobs_spilled'):
+            # Emptied by an earlier call, which emptied everything older too
+            break
+        dropped += _spill(entry, budget)
+        budget -= len(entry['jobs'])
+    return dropped
+
+def memory_snapshot(driver=None) -> Dict[str, Optional[float]]:
+    """Chrome's and this process's resident memory, in MB."""
+    return {
+        'chrome_rss_mb': chrome_rss_mb(driver) if driver is not None else None,
+        'bot_rss_mb': process_rss_mb()
+    }
+
+def add_cookies(driver, base_url: str, cookies: List[Dict]) -> None:
+    """Open base_url and set cookies read from another browser on it (nothing to do without cookies)."""
+    if not cookies:
+        return
+    driver.get(f"{base_url}/")
+    for cookie in cookies:
+        try:
+            driver.add_cookie({k: v for k, v in cookie.items() if k in COOKIE_FIELDS})
+        except Exception:
+            # Cookies for a sibling subdomain are rejected; the rest still apply
+            continue
+
+def restart_driver(old, start: Callable[[], object], base_url: str, resume_url: Optional[str] = None,
+                   login: Optional[Callable[[], object]] = None, logger: Optional[logging.Logger] = None):
+    """
+    Quit `old` and return the browser start() opens in its place, signed
+    in with old's cookies and back on resume_url. Without cookies to carry
+    over, login() (if given) signs the new browser in instead.
+    """
+    logger = logger or logging.getLogger()
+    try:
+        cookies = old.get_cookies()
+    except Exception as e:
+        logger.warning(f"Could not read cookies before recycling the browser: {str(e)}")
+        cookies = []
+    try:
+        old.quit()
+    except Exception:
+        pass
+
+    driver = start()
+    if cookies:
+        add_cookies(driver, base_url, cookies)
+    elif login is not None:
+        login()
+    if resume_url:
+        driver.get(resume_url)
+    return driver
+
+def log_recycle(logger: logging.Logger, journal, browser: str, reason: str, pages: int,
+                before: Dict, driver, detail: str = '') -> Dict:
+    """Log and journal the memory a browser restart released; returns the new snapshot."""
+    after = memory_snapshot(driver)
+    logger.info(
+        f"Recycled {browser} browser ({reason}) after {pages} pages: Chrome RSS "
+        f"{before['chrome_rss_mb']} -> {after['chrome_rss_mb']} MB, bot RSS {after['bot_rss_mb']} MB{detail}"
+    )
+    journal.append('recycle', browser=browser, reason=reason, pages=pages, before=before, after=after)
+    return after
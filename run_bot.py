@@ -1,9 +1,17 @@
 # run_bot.py
 from main import JobApplicationBot
+from checkpoint import Checkpoint, fingerprint
+from journal import compact
+from log_setup import log_context, setup_logging
+from rate_limiter import RateLimitManager, SharedRateLimiter
 import logging
 import argparse
-from typing import Dict
+import configparser
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 import json
+import os
 
 def load_search_config(config_file: str = 'search_config.json') -> Dict:
     """Load search configuration from JSON file"""
@@ -31,48 +39,190 @@ def load_search_config(config_file: str = 'search_config.json') -> Dict:
             ]
         }
 
-def run_job_search():
+def shard_searches(searches: List[Dict], workers: int) -> List[List[Dict]]:
+    """Split searches round-robin into at most `workers` non-empty shards"""
+    shards = [searches[i::workers] for i in range(workers)]
+    return [shard for shard in shards if shard]
+
+def resume_point(bot: JobApplicationBot, name: str, searches: List[Dict], resume: bool,
+                 logger: logging.Logger) -> Tuple[Checkpoint, int]:
+    """Open the checkpoint for a list of searches; on resume restore the bot's progress from it"""
+    checkpoint = Checkpoint.from_config(bot.config, name, fingerprint(searches))
+    saved = checkpoint.load() if resume else None
+    if not saved:
+        return checkpoint, 0
+
+    bot.applications_submitted = saved.get('applications_submitted', 0)
+    bot.jobs_processed = saved.get('jobs_processed', 0)
+    # The interrupted runs' results stay in their journals; the summary of
+    # this run covers them through its lineage
+    bot.parent_runs = saved.get('runs', [])
+    bot.journal.append('resume', parents=bot.parent_runs)
+    start = saved.get('next_search', 0)
+    logger.info(f"Resuming at search {start + 1}/{len(searches)} from checkpoint {checkpoint.path}")
+    return checkpoint, start
+
+def execute_searches(bot: JobApplicationBot, searches: List[Dict], logger: logging.Logger,
+                     checkpoint: Optional[Checkpoint] = None, start: int = 0) -> None:
+    """
+    Run each search in order on an already logged-in bot, checkpointing after
+    each one. The checkpoint holds the next search's offset and the journal
+    runs, not the results, so it stays the same size however many searches run.
+    """
+    for index, search in enumerate(searches[start:], start):
+        try:
+            logger.info(f"Starting search for {search['keywords']} in {search['location']}")
+
+            with log_context(portal='linkedin', stage='search'):
+                success = bot.search_linkedin_jobs(
+                    keywords=search["keywords"],
+                    location=search["location"],
+                    filters=search["filters"]
+                )
+
+            if success:
+                logger.info(f"Successfully completed search for {search['keywords']}")
+            else:
+                logger.error(f"Failed to complete search for {search['keywords']}")
+
+        except Exception as e:
+            logger.error(f"Error during search for {search['keywords']}: {str(e)}")
+
+        if checkpoint:
+            checkpoint.save(
+                runs=bot.parent_runs + [bot.journal.run_id],
+                next_search=index + 1,
+                applications_submitted=bot.applications_submitted,
+                jobs_processed=bot.jobs_processed
+            )
+        bot.maybe_recycle()
+
+    # All searches done: the next run starts from the beginning
+    if checkpoint:
+        checkpoint.clear()
+
+def run_search_shard(searches: List[Dict], config_path: str = 'config.ini',
+                     checkpoint_name: str = 'run_bot_shard', resume: bool = False,
+                     rate_limiter=None, worker: Optional[int] = None) -> Dict:
+    """
+    Worker entry point: run a shard of searches with its own bot, driver and login.
+    `rate_limiter` is the parent's RateLimitManager limiter, shared by all workers;
+    `worker` is the shard's index.
+
+    Returns the worker's counters and journal run so the parent can merge them.
+    """
+    logger = logging.getLogger(f"{__name__}.worker{os.getpid()}")
+    result = {
+        'worker': os.getpid(),
+        'applications_submitted': 0,
+        'jobs_processed': 0,
+        'journal': None,
+        'run_id': None
+    }
+
+    shared = SharedRateLimiter(rate_limiter) if rate_limiter is not None else None
+    with JobApplicationBot(config_path=config_path, autosave=False, rate_limiter=shared,
+                           worker=worker) as bot:
+        result['journal'] = bot.journal.directory
+        result['run_id'] = bot.journal.run_id
+        if not bot.login_to_linkedin():
+            logger.error("Failed to login to LinkedIn")
+            return result
+
+        logger.info("Successfully logged in to LinkedIn")
+        checkpoint, start = resume_point(bot, checkpoint_name, searches, resume, logger)
+        execute_searches(bot, searches, logger, checkpoint, start)
+
+        result['applications_submitted'] = bot.applications_submitted
+        result['jobs_processed'] = bot.jobs_processed
+
+    return result
+
+def save_merged_results(worker_results: List[Dict]) -> str:
+    """Merge per-worker results into a single application data file, reading the searches from their journals"""
+    data = {
+        'timestamp': datetime.now().isoformat(),
+        'applications_submitted': sum(r['applications_submitted'] for r in worker_results),
+        'jobs_processed': sum(r['jobs_processed'] for r in worker_results),
+        'search_results': [item for r in worker_results if r['run_id']
+                           for item in compact(r['journal'], r['run_id'])['search_results']]
+    }
+
+    os.makedirs('data', exist_ok=True)
+
+    filename = os.path.join('data', f'application_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
+    with open(filename, 'w') as f:
+        json.dump(data, f, indent=4)
+
+    return filename
+
+def run_parallel_job_search(searches: List[Dict], workers: int, config_path: str,
+                            logger: logging.Logger, resume: bool = False) -> None:
+    """Shard searches across a process pool, one browser per worker"""
+    shards = shard_searches(searches, workers)
+    logger.info(f"Running {len(searches)} searches across {len(shards)} workers")
+
+    worker_results = []
+    # One set of per-host buckets for all workers, so together they stay
+    # within the configured rate and back off together
+    with RateLimitManager() as manager, ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        rate_limiter = manager.limiter(config_path)
+        futures = {
+            executor.submit(run_search_shard, shard, config_path,
+                            f'run_bot_shard{index}of{len(shards)}', resume, rate_limiter, index): index
+            for index, shard in enumerate(shards)
+        }
+        for future in as_completed(futures):
+            try:
+                worker_results.append(future.result())
+            except Exception as e:
+                logger.error(f"Worker {futures[future]} failed: {str(e)}")
+
+    filename = save_merged_results(worker_results)
+    logger.info(f"Merged results from {len(worker_results)} workers saved to {filename}")
+
+def run_job_search(workers: int = 1, config_path: str = 'config.ini', resume: bool = False):
     """Execute job searches based on configuration"""
-    # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s'
-    )
+    # Set up logging (the bots reuse it; forked workers set up their own)
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    setup_logging(config)
     logger = logging.getLogger(__name__)
-    
+
     # Load search configuration
     search_config = load_search_config()
-    
+
     try:
-        with JobApplicationBot() as bot:
+        if workers > 1:
+            run_parallel_job_search(search_config["searches"], workers, config_path, logger, resume)
+            return
+
+        with JobApplicationBot(config_path=config_path) as bot:
             # Attempt to login
             if not bot.login_to_linkedin():
                 logger.error("Failed to login to LinkedIn")
                 return
-            
+
             logger.info("Successfully logged in to LinkedIn")
-            
+
             # Execute each search from the configuration
-            for search in search_config["searches"]:
-                try:
-                    logger.info(f"Starting search for {search['keywords']} in {search['location']}")
-                    
-                    success = bot.search_linkedin_jobs(
-                        keywords=search["keywords"],
-                        location=search["location"],
-                        filters=search["filters"]
-                    )
-                    
-                    if success:
-                        logger.info(f"Successfully completed search for {search['keywords']}")
-                    else:
-                        logger.error(f"Failed to complete search for {search['keywords']}")
-                        
-                except Exception as e:
-                    logger.error(f"Error during search for {search['keywords']}: {str(e)}")
-                    
+            checkpoint, start = resume_point(bot, 'run_bot', search_config["searches"], resume, logger)
+            execute_searches(bot, search_config["searches"], logger, checkpoint, start)
+
     except Exception as e:
         logger.error(f"Bot execution failed: {str(e)}")
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Run LinkedIn job searches from search_config.json")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of parallel browser workers (default: 1)")
+    parser.add_argument('--config', default='config.ini',
+                        help="Path to the bot configuration file")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue from the last checkpoint of an interrupted run")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    run_job_search()
\ No newline at end of file
+    args = parse_args()
+    run_job_search(workers=max(1, args.workers), config_path=args.config, resume=args.resume)
@@ -0,0 +1,150 @@
+"""
+Relevance scoring for job descriptions.
+
+Each description gets a BM25 score against the skill profile: the skills
+are the query terms, required skills weigh more than preferred ones, and
+term statistics (document frequencies, average length) accumulate over
+every description scored in the run. Campaigns pool the passing jobs in a
+CandidatePool, re-score the pool once all pages are read (so early pages
+are judged by the same statistics as late ones) and apply best first.
+"""
+import heapq
+import itertools
+import math
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from skill_matcher import SkillMatch, SkillMatcher
+
+_WORD = re.compile(r'\w+')
+
+class JobScore(NamedTuple):
+    """BM25 relevance of one description, plus its skill match."""
+    score: float
+    match: SkillMatch
+
+    @property
+    def passed(self) -> bool:
+        return self.match.passed
+
+class JobScorer:
+    """BM25 scorer over the skills of a SkillMatcher."""
+
+    def __init__(self, skill_matcher: SkillMatcher, k1: float = 1.2, b: float = 0.75,
+                 required_weight: float = 2.0, min_score: float = 0.0):
+        self.skill_matcher = skill_matcher
+        self.k1 = k1
+        self.b = b
+        self.min_score = min_score
+        self.weights = {skill: required_weight for skill in skill_matcher.required}
+        self.weights.update({skill: 1.0 for skill in skill_matcher.preferred})
+        self.documents = 0
+        self.total_length = 0
+        self.document_frequency = Counter()
+        # job_id -> (skill counts, length), kept for rescore
+        self._terms: Dict[str, Tuple[Counter, int]] = {}
+
+    @classmethod
+    def from_config(cls, config, skill_matcher: Optional[SkillMatcher] = None) -> 'JobScorer':
+        """Build a scorer from the optional [Scoring] config section."""
+        section = 'Scoring'
+        return cls(
+            skill_matcher or SkillMatcher.from_config(config),
+            k1=config.getfloat(section, 'k1', fallback=1.2),
+            b=config.getfloat(section, 'b', fallback=0.75),
+            required_weight=config.getfloat(section, 'required_weight', fallback=2.0),
+            min_score=config.getfloat(section, 'min_score', fallback=0.0)
+        )
+
+    def idf(self, skill: str) -> float:
+        df = self.document_frequency[skill]
+        return math.log(1 + (self.documents - df + 0.5) / (df + 0.5))
+
+    def score_many(self, descriptions: Dict[str, str]) -> Dict[str, JobScore]:
+        """
+        Score a batch of {job_id: description}. The batch is added to the
+        corpus statistics first, so its own jobs inform the IDF weights.
+        """
+        counted = {
+            job_id: (self.skill_matcher.count_skills(text), len(_WORD.findall(text or '')))
+            for job_id, text in descriptions.items()
+        }
+        for counts, length in counted.values():
+            self.documents += 1
+            self.total_length += length
+            self.document_frequency.update(counts.keys())
+        self._terms.update(counted)
+
+        bm25 = self._bm25_scores(counted)
+        scores = {}
+        for job_id, (counts, _) in counted.items():
+            match = self.skill_matcher.match_counts(counts)
+            if bm25[job_id] < self.min_score:
+                match = match._replace(passed=False)
+            scores[job_id] = JobScore(bm25[job_id], match)
+        return scores
+
+    def rescore(self, job_ids) -> Dict[str, float]:
+        """Scores of already-scored jobs under the current corpus statistics."""
+        return self._bm25_scores({job_id: self._terms[job_id] for job_id in job_ids if job_id in self._terms})
+
+    def _bm25_scores(self, counted: Dict[str, Tuple[Counter, int]]) -> Dict[str, float]:
+        average_length = (self.total_length / self.documents if self.documents else 0) or 1.0
+        term_weights = {skill: weight * self.idf(skill) for skill, weight in self.weights.items()}
+        scores = {}
+        for job_id, (counts, length) in counted.items():
+            norm = self.k1 * (1 - self.b + self.b * length / average_length)
+            scores[job_id] = round(sum(
+                term_weights[skill] * tf * (self.k1 + 1) / (tf + norm)
+                for skill, tf in counts.items() if skill in term_weights
+            ), 4)
+        return scores
+
+class CandidatePool:
+    """Jobs that passed screening, popped highest score first (ties in arrival order)."""
+
+    def __init__(self, entries: Optional[List] = None):
+        self._heap = []
+        self._ids = set()
+        self._sequence = itertools.count()
+        for job_id, score, *payload in entries or []:
+            self.push(job_id, score, payload[0] if payload else None)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, job_id) -> bool:
+        return job_id in self._ids
+
+    def push(self, job_id: str, score: float, payload=None) -> None:
+        if job_id in self._ids:
+            return
+        self._ids.add(job_id)
+        heapq.heappush(self._heap, (-score, next(self._sequence), job_id, payload))
+
+    def pop(self) -> Tuple[str, float, object]:
+        """Best remaining candidate as (job_id, score, payload)."""
+        negated, _, job_id, payload = heapq.heappop(self._heap)
+        self._ids.discard(job_id)
+        return job_id, -negated, payload
+
+    def rescore(self, scorer: JobScorer) -> None:
+        """
+        Re-rank the pool with the scorer's current statistics. Record
+        payloads get their new score; jobs the scorer hasn't seen (restored
+        from a checkpoint) keep theirs.
+        """
+        scores = scorer.rescore(self._ids)
+        heap = []
+        for negated, sequence, job_id, payload in self._heap:
+            score = scores.get(job_id, -negated)
+            if isinstance(payload, dict):
+                payload['score'] = score
+            heap.append((-score, sequence, job_id, payload))
+        heapq.heapify(heap)
+        self._heap = heap
+
+    def entries(self) -> List[List]:
+        """[job_id, score] pairs in rank order, for checkpoints."""
+        return [[job_id, -negated] for negated, _, job_id, _ in sorted(self._heap)]
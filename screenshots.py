@@ -0,0 +1,159 @@
+"""
+Background screenshot capture.
+
+The driver thread only asks Chrome for the frame (Page.captureScreenshot,
+JPEG by default, optionally clipped to an element) and hands the base64
+payload to a worker thread that decodes and writes it. A frame identical
+to the previous one is not written again, and the screenshot directory is
+kept within a file count, byte and age budget.
+"""
+import base64
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+class ScreenshotPipeline:
+    """Captures screenshots on the caller's thread and writes them on a worker thread."""
+
+    PREFIX = 'screenshot_'
+
+    def __init__(self, directory: str = os.path.join('logs', 'screenshots'), image_format: str = 'jpeg',
+                 quality: int = 60, max_files: int = 200, max_bytes: int = 50 * 1024 * 1024,
+                 max_age_days: float = 7.0, queue_size: int = 16, logger: Optional[logging.Logger] = None):
+        self.directory = directory
+        self.image_format = image_format.lower()
+        self.quality = quality
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.logger = logger or logging.getLogger(__name__)
+        self.written = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self._last_hash = None
+        self._last_path = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._run, name='screenshot-writer', daemon=True)
+        self._worker.start()
+
+    @classmethod
+    def from_config(cls, config, logger: Optional[logging.Logger] = None) -> 'ScreenshotPipeline':
+        """Build a pipeline from the optional [Screenshots] config section."""
+        section = 'Screenshots'
+        return cls(
+            directory=config.get(section, 'directory', fallback=os.path.join('logs', 'screenshots')),
+            image_format=config.get(section, 'format', fallback='jpeg'),
+            quality=config.getint(section, 'quality', fallback=60),
+            max_files=config.getint(section, 'max_files', fallback=200),
+            max_bytes=config.getint(section, 'max_mb', fallback=50) * 1024 * 1024,
+            max_age_days=config.getfloat(section, 'max_age_days', fallback=7.0),
+            logger=logger
+        )
+
+    @property
+    def extension(self) -> str:
+        return 'jpg' if self.image_format == 'jpeg' else self.image_format
+
+    def _grab(self, driver, element=None) -> Tuple[Optional[str], Optional[str]]:
+        """Base64 frame from the DevTools protocol, falling back to WebDriver's PNG."""
+        params = {'format': self.image_format}
+        if self.image_format == 'jpeg':
+            params['quality'] = self.quality
+        if element is not None:
+            rect = element.rect
+            params['clip'] = {'x': rect['x'], 'y': rect['y'], 'width': rect['width'],
+                              'height': rect['height'], 'scale': 1}
+        try:
+            data = driver.execute_cdp_cmd('Page.captureScreenshot', params).get('data')
+            extension = self.extension
+        except Exception:
+            data = driver.get_screenshot_as_base64()
+            extension = 'png'
+        return (data, extension) if isinstance(data, str) else (None, None)
+
+    def capture(self, driver, name: str, element=None) -> Optional[str]:
+        """
+        Queue a screenshot of the current page (or just `element`) and return
+        the path it will be written to. A frame identical to the last one
+        returns the earlier path; None if nothing could be captured.
+        """
+        try:
+            data, extension = self._grab(driver, element)
+        except Exception as e:
+            self.logger.error(f"Failed to take screenshot: {str(e)}")
+            return None
+        if data is None:
+            return None
+
+        digest = hashlib.sha1(data.encode()).hexdigest()
+        if digest == self._last_hash:
+            self.duplicates += 1
+            self.logger.debug(f"Screenshot {name} identical to {self._last_path}, not saved")
+            return self._last_path
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = os.path.join(self.directory, f"{self.PREFIX}{name}_{timestamp}.{extension}")
+        try:
+            self._queue.put_nowait((path, data))
+        except queue.Full:
+            self.dropped += 1
+            self.logger.warning(f"Screenshot queue full, dropped {name}")
+            return None
+        self._last_hash, self._last_path = digest, path
+        return path
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                self.logger.error(f"Failed to write screenshot: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, path: str, data: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(base64.b64decode(data))
+        os.replace(tmp_path, path)
+        self.written += 1
+        self.logger.info(f"Screenshot saved: {path}")
+        self.enforce_budget()
+
+    def enforce_budget(self) -> Dict[str, int]:
+        """Delete screenshots past max_age_days, then the oldest until within max_files and max_bytes."""
+        entries = []
+        for filename in os.listdir(self.directory):
+            if filename.startswith(self.PREFIX) and not filename.endswith('.tmp'):
+                stat = os.stat(os.path.join(self.directory, filename))
+                entries.append((stat.st_mtime, stat.st_size, filename))
+        entries.sort()
+
+        cutoff = time.time() - self.max_age_days * 86400
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        while entries and (entries[0][0] < cutoff or len(entries) > self.max_files or total > self.max_bytes):
+            _, size, filename = entries.pop(0)
+            os.remove(os.path.join(self.directory, filename))
+            total -= size
+            removed += 1
+        return {'files': len(entries), 'bytes': total, 'removed': removed}
+
+    def flush(self) -> None:
+        """Block until every queued screenshot is written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write what is queued and stop the worker."""
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
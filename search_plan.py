@@ -0,0 +1,112 @@
+from typing import Dict, List, NamedTuple, Optional, Union
+from urllib.parse import urlencode
+
+# Filter name -> (query parameter, {normalized filter value: parameter value})
+LINKEDIN_FILTERS = {
+    'experience_level': ('f_E', {
+        'internship': '1', 'entry level': '2', 'associate': '3',
+        'mid-senior level': '4', 'director': '5', 'executive': '6'
+    }),
+    'job_type': ('f_JT', {
+        'full-time': 'F', 'part-time': 'P', 'contract': 'C', 'temporary': 'T',
+        'volunteer': 'V', 'internship': 'I', 'other': 'O'
+    }),
+    'remote': ('f_WT', {'on-site': '1', 'remote': '2', 'hybrid': '3'}),
+    'date_posted': ('f_TPR', {
+        'past 24 hours': 'r86400', 'past week': 'r604800', 'past month': 'r2592000'
+    }),
+}
+
+INDEED_FILTERS = {
+    'date_posted': ('fromage', {
+        'past 24 hours': '1', 'last 24 hours': '1', 'past 3 days': '3', 'last 3 days': '3',
+        'past week': '7', 'last 7 days': '7', 'past 14 days': '14', 'last 14 days': '14',
+        'past month': '30'
+    }),
+    'job_type': ('jt', {
+        'full-time': 'fulltime', 'part-time': 'parttime', 'contract': 'contract',
+        'temporary': 'temporary', 'internship': 'internship'
+    }),
+}
+
+# Indeed folds remote and experience level into one "sc" attribute list
+INDEED_ATTRIBUTES = {
+    'remote': {'remote': 'attr(DSQF7)', 'hybrid': 'attr(PAXZC)'},
+    'experience_level': {
+        'entry level': 'explvl(ENTRY_LEVEL)', 'mid level': 'explvl(MID_LEVEL)',
+        'mid-senior level': 'explvl(SENIOR_LEVEL)', 'senior level': 'explvl(SENIOR_LEVEL)'
+    },
+}
+
+class SearchPlan(NamedTuple):
+    """A search as one results URL, plus any filters the URL cannot express."""
+    portal: str
+    url: str
+    params: Dict[str, str]
+    unmapped: Dict[str, str]
+
+def _values(value: Union[str, List[str]]) -> List[str]:
+    values = value if isinstance(value, (list, tuple)) else str(value).split(',')
+    return [' '.join(v.lower().split()) for v in values if str(v).strip()]
+
+def _map_filter(mapping: Dict[str, str], value) -> Optional[List[str]]:
+    """Parameter values for a filter value, or None if any part is unknown."""
+    mapped = [mapping.get(v) for v in _values(value)]
+    return mapped if mapped and None not in mapped else None
+
+def linkedin_plan(base_url: str, keywords: str, location: Optional[str] = None,
+                  filters: Optional[Dict[str, str]] = None) -> SearchPlan:
+    """LinkedIn /jobs/search/ URL with keywords, location and f_E/f_JT/f_WT/f_TPR filters."""
+    params = {'keywords': keywords}
+    if location:
+        params['location'] = location
+    unmapped = {}
+    for name, value in (filters or {}).items():
+        param, mapping = LINKEDIN_FILTERS.get(name, (None, {}))
+        mapped = _map_filter(mapping, value)
+        if mapped is None:
+            unmapped[name] = value
+        else:
+            # LinkedIn accepts several values per filter, comma-separated
+            params[param] = ','.join(mapped)
+    url = f"{base_url.rstrip('/')}/jobs/search/?{urlencode(params)}"
+    return SearchPlan('linkedin', url, params, unmapped)
+
+def indeed_plan(base_url: str, keywords: str, location: Optional[str] = None,
+                filters: Optional[Dict[str, str]] = None) -> SearchPlan:
+    """Indeed /jobs URL with q, l, fromage, jt and sc (remote, experience level) parameters."""
+    params = {'q': keywords}
+    if location:
+        params['l'] = location
+    unmapped = {}
+    attributes = []
+    for name, value in (filters or {}).items():
+        if name in INDEED_ATTRIBUTES:
+            mapped = _map_filter(INDEED_ATTRIBUTES[name], value)
+            if mapped is not None:
+                attributes.extend(mapped)
+                continue
+        elif name in INDEED_FILTERS:
+            param, mapping = INDEED_FILTERS[name]
+            mapped = _map_filter(mapping, value)
+            # Indeed takes a single value per parameter
+            if mapped is not None and len(mapped) == 1:
+                params[param] = mapped[0]
+                continue
+        unmapped[name] = value
+    if attributes:
+        params['sc'] = '0kf:' + ''.join(attributes) + ';'
+    url = f"{base_url.rstrip('/')}/jobs?{urlencode(params)}"
+    return SearchPlan('indeed', url, params, unmapped)
+
+PLANNERS = {
+    'linkedin': linkedin_plan,
+    'indeed': indeed_plan,
+}
+
+def build_search_plan(portal: str, base_url: str, keywords: str, location: Optional[str] = None,
+                      filters: Optional[Dict[str, str]] = None) -> SearchPlan:
+    """Turn a search_config.json search into the portal's results URL."""
+    if portal not in PLANNERS:
+        raise ValueError(f"No search planner for portal: {portal}")
+    return PLANNERS[portal](base_url, keywords, location, filters)
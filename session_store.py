@@ -0,0 +1,101 @@
+import json
+import os
+import re
+from datetime import datetime
+from typing import Iterable, Optional
+
+# Cookie fields accepted by WebDriver's add_cookie
+COOKIE_FIELDS = ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry', 'sameSite')
+
+LOCAL_STORAGE_READ = "return Object.assign({}, window.localStorage);"
+LOCAL_STORAGE_WRITE = """
+var items = arguments[0];
+for (var key in items) { window.localStorage.setItem(key, items[key]); }
+"""
+
+class SessionStore:
+    """
+    Persists authenticated browser sessions (cookies and localStorage) per
+    portal and account so a run can skip the login form while the session
+    is still valid.
+
+    Session files hold live auth cookies; they are written owner-only.
+    """
+
+    def __init__(self, directory: str = os.path.join('data', 'sessions')):
+        self.directory = directory
+
+    @classmethod
+    def from_config(cls, config) -> Optional['SessionStore']:
+        """Build a store from [Session], or None if sessions are disabled."""
+        if not config.getboolean('Session', 'enabled', fallback=True):
+            return None
+        return cls(config.get('Session', 'directory', fallback=os.path.join('data', 'sessions')))
+
+    def _path(self, portal: str, account: str) -> str:
+        safe_account = re.sub(r'[^\w.-]', '_', account)
+        return os.path.join(self.directory, f'{portal}_{safe_account}.json')
+
+    def save(self, driver, portal: str, account: str) -> str:
+        """Snapshot the current domain's cookies and localStorage."""
+        data = {
+            'saved_at': datetime.now().isoformat(),
+            'url': driver.current_url,
+            'cookies': [
+                {k: v for k, v in cookie.items() if k in COOKIE_FIELDS}
+                for cookie in driver.get_cookies()
+            ],
+            'local_storage': driver.execute_script(LOCAL_STORAGE_READ) or {}
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(portal, account)
+        tmp_path = path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        return path
+
+    def restore(self, driver, portal: str, account: str, base_url: str) -> bool:
+        """
+        Load a saved session into the browser. `base_url` must be on the
+        session's domain since cookies can only be set for the current one.
+        Returns False if there is no saved session.
+        """
+        path = self._path(portal, account)
+        if not os.path.exists(path):
+            return False
+
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+        driver.get(base_url)
+        for cookie in data.get('cookies', []):
+            if cookie.get('sameSite') not in (None, 'Strict', 'Lax', 'None'):
+                cookie = {k: v for k, v in cookie.items() if k != 'sameSite'}
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                # Cookies for a sibling subdomain are rejected; the rest still apply
+                continue
+
+        if data.get('local_storage'):
+            driver.execute_script(LOCAL_STORAGE_WRITE, data['local_storage'])
+        return True
+
+    @staticmethod
+    def validate(driver, check_url: str, login_markers: Iterable[str]) -> bool:
+        """
+        Cheap session check: load a page that requires login and confirm we
+        were not redirected to a sign-in URL.
+        """
+        driver.get(check_url)
+        current_url = driver.current_url or ''
+        return not any(marker in current_url for marker in login_markers)
+
+    def clear(self, portal: str, account: str) -> None:
+        """Forget a saved session, e.g. after it failed validation."""
+        path = self._path(portal, account)
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,89 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+class SkillMatch(NamedTuple):
+    """Result of matching one job description against the skill profile."""
+    required: Set[str]
+    preferred: Set[str]
+    missing_required: Set[str]
+    passed: bool
+
+class SkillMatcher:
+    """
+    Skill matching engine compiled once from the [Skills] config section.
+
+    All skills are folded into a single alternation regex anchored on word
+    boundaries, so one pass over a description finds every skill and "go" no
+    longer matches inside "google" (nor "java" inside "javascript").
+    """
+
+    def __init__(self, required: Iterable[str], preferred: Iterable[str], min_preferred: int = 0):
+        self.required = self._normalize(required)
+        self.preferred = self._normalize(preferred) - self.required
+        self.min_preferred = min_preferred
+        self._pattern = self._compile(self.required | self.preferred)
+
+    @classmethod
+    def from_config(cls, config) -> 'SkillMatcher':
+        """Build a matcher from a ConfigParser holding a [Skills] section."""
+        skills = config['Skills']
+        return cls(
+            required=skills.get('required', '').split(','),
+            preferred=skills.get('preferred', '').split(','),
+            min_preferred=skills.getint('min_preferred', fallback=0)
+        )
+
+    @staticmethod
+    def _normalize(skills: Iterable[str]) -> Set[str]:
+        return {' '.join(skill.lower().split()) for skill in skills if skill.strip()}
+
+    @staticmethod
+    def _compile(skills: Set[str]):
+        if not skills:
+            return None
+        # Longest first so "machine learning" wins over "machine"; whitespace
+        # inside a skill matches any run of whitespace in the description.
+        alternatives = [
+            r'\s+'.join(re.escape(word) for word in skill.split())
+            for skill in sorted(skills, key=len, reverse=True)
+        ]
+        # Treat +, # and . as word characters at the edges so "c" does not
+        # match in "c++" and "node.js" is not found inside "node.jsx".
+        return re.compile(
+            r'(?<![\w+#])(?:' + '|'.join(alternatives) + r')(?![\w+#]|\.\w)',
+            re.IGNORECASE
+        )
+
+    def find_skills(self, description: str) -> Set[str]:
+        """Return the set of configured skills present in the description."""
+        if self._pattern is None or not description:
+            return set()
+        return {' '.join(m.group(0).lower().split()) for m in self._pattern.finditer(description)}
+
+    def count_skills(self, description: str) -> Counter:
+        """How many times each configured skill occurs in the description."""
+        if self._pattern is None or not description:
+            return Counter()
+        return Counter(' '.join(m.group(0).lower().split()) for m in self._pattern.finditer(description))
+
+    def match_counts(self, counts: Counter) -> SkillMatch:
+        """Match from skill counts already taken with count_skills."""
+        found = set(counts)
+        required = found & self.required
+        preferred = found & self.preferred
+        missing = self.required - required
+        passed = not missing and len(preferred) >= self.min_preferred
+        return SkillMatch(required, preferred, missing, passed)
+
+    def match(self, description: str) -> SkillMatch:
+        """Score a single description in one pass."""
+        return self.match_counts(self.count_skills(description))
+
+    def match_many(self, descriptions: Iterable[str]) -> List[SkillMatch]:
+        """Score a batch of descriptions, e.g. every card on a results page."""
+        return [self.match(description) for description in descriptions]
+
+    def filter_many(self, descriptions: Dict[str, str]) -> Dict[str, SkillMatch]:
+        """Score a mapping of job ID to description, keeping the keys."""
+        return {job_id: self.match(text) for job_id, text in descriptions.items()}
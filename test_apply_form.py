@@ -0,0 +1,143 @@
+import configparser
+import json
+import shutil
+import subprocess
+import unittest
+from unittest.mock import MagicMock
+from apply_form import FLOWS, STATE_SCRIPT, STEP_SCRIPT, AnswerBook, ApplyFormEngine, normalize_question
+
+# A minimal DOM for running the form scripts under node: each element lists
+# the selectors it matches, its text and its children.
+FAKE_DOM = """
+function build(spec, parent) {
+    const el = {matches: spec.matches || [], innerText: spec.text || '', parent,
+                offsetWidth: 1, offsetHeight: 1, getClientRects: () => [1]};
+    el.children = (spec.children || []).map(child => build(child, el));
+    const descendants = () => el.children.flatMap(child => [child, ...child.descendants()]);
+    el.descendants = descendants;
+    const hits = selectors => selectors.split(',').map(s => s.trim());
+    el.querySelectorAll = selectors => descendants().filter(node => hits(selectors).some(s => node.matches.includes(s)));
+    el.querySelector = selectors => el.querySelectorAll(selectors)[0] || null;
+    el.closest = selectors => {
+        for (let node = el; node; node = node.parent) {
+            if (hits(selectors).some(s => node.matches.includes(s))) { return node; }
+        }
+        return null;
+    };
+    return el;
+}
+const body = build(JSON.parse(process.argv[1]), null);
+globalThis.document = {body, querySelectorAll: body.querySelectorAll, querySelector: body.querySelector};
+"""
+
+class TestAnswerBook(unittest.TestCase):
+    def test_lookup_by_exact_and_contained_question(self):
+        book = AnswerBook({'Years of experience': '5', 'Years of experience with Python': '3',
+                           'Phone': '555-0100'})
+
+        self.assertEqual(normalize_question('Phone number *'), 'phone number')
+        self.assertEqual(book.lookup('PHONE (required)'), '555-0100')
+        self.assertEqual(book.lookup('How many years of experience with Python do you have?'), '3')
+        self.assertEqual(book.lookup('Years of experience in Java?'), '5')
+        self.assertIsNone(book.lookup('Desired salary'))
+        # Whole words only
+        self.assertIsNone(book.lookup('Headphones provided?'))
+        self.assertEqual(book.compiled['contains'][0][0], 'years of experience with python')
+
+    def test_from_config(self):
+        config = configparser.ConfigParser()
+        config.read_string('[Answers]\nauthorized to work = Yes\n')
+        book = AnswerBook.from_config(config)
+        self.assertEqual(book.lookup('Are you legally authorized to work in the US?'), 'Yes')
+        self.assertEqual(len(AnswerBook.from_config(configparser.ConfigParser())), 0)
+
+class FakeForm:
+    """execute_script stand-in returning scripted step and state results."""
+
+    def __init__(self, steps, states):
+        self.steps = list(steps)
+        self.states = list(states)
+        self.calls = []
+
+    def __call__(self, script, *args):
+        self.calls.append('step' if script == STEP_SCRIPT else 'state')
+        if script == STEP_SCRIPT:
+            return self.steps.pop(0)
+        assert script == STATE_SCRIPT
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+class TestApplyFormEngine(unittest.TestCase):
+    def run_form(self, steps, states, **kwargs):
+        driver = MagicMock()
+        driver.execute_script.side_effect = form = FakeForm(steps, states)
+        result = ApplyFormEngine(AnswerBook({'phone': '555'}), step_timeout=0.5, **kwargs).run(driver, 'indeed')
+        return result, form
+
+    def test_submits_without_waiting_for_a_timeout(self):
+        result, form = self.run_form(
+            [{'state': 'advanced', 'filled': ['Phone'], 'errors': [], 'signature': 'contact'},
+             {'state': 'submitted', 'filled': [], 'errors': [], 'signature': 'review'}],
+            [{'state': 'open', 'errors': [], 'signature': 'review'}, {'state': 'success'}]
+        )
+        self.assertTrue(result.submitted)
+        self.assertEqual((result.steps, result.filled), (2, 1))
+        self.assertEqual(form.calls, ['step', 'state', 'step', 'state'])
+
+    def test_unanswered_required_question_blocks(self):
+        result, form = self.run_form(
+            [{'state': 'blocked', 'filled': [], 'unanswered': ['Desired salary'], 'errors': [], 'signature': 's'}],
+            []
+        )
+        self.assertEqual(result.status, ApplyFormEngine.BLOCKED)
+        self.assertEqual(result.unanswered, ['Desired salary'])
+        self.assertEqual(form.calls, ['step'])
+
+    def test_new_error_after_a_step(self):
+        result, _ = self.run_form(
+            [{'state': 'advanced', 'filled': [], 'errors': ['Old notice'], 'signature': 's'}],
+            [{'state': 'open', 'errors': ['Old notice'], 'signature': 's'},
+             {'state': 'open', 'errors': ['Old notice', 'Enter a valid phone number'], 'signature': 's'}]
+        )
+        self.assertEqual(result.status, ApplyFormEngine.ERROR)
+        self.assertEqual(result.errors, ['Enter a valid phone number'])
+
+    def test_form_closing_after_submit_counts_as_submitted(self):
+        result, _ = self.run_form(
+            [{'state': 'submitted', 'filled': [], 'errors': [], 'signature': 's'}],
+            [{'state': 'closed'}]
+        )
+        self.assertTrue(result.submitted)
+
+    def test_step_that_never_changes_is_stuck(self):
+        result, _ = self.run_form(
+            [{'state': 'advanced', 'filled': [], 'errors': [], 'signature': 's'}],
+            [{'state': 'open', 'errors': [], 'signature': 's'}]
+        )
+        self.assertEqual(result.status, ApplyFormEngine.STUCK)
+
+@unittest.skipUnless(shutil.which('node'), 'node is not installed')
+class TestStateScript(unittest.TestCase):
+    def state(self, page, portal='linkedin'):
+        script = FAKE_DOM + f'console.log(JSON.stringify(new Function({json.dumps(STATE_SCRIPT)})({json.dumps(FLOWS[portal])})));'
+        output = subprocess.run(['node', '-e', script, json.dumps(page)], capture_output=True, text=True, check=True)
+        return json.loads(output.stdout)['state']
+
+    def page(self, modal_text='Contact info', banner=None):
+        children = [{'matches': ['.jobs-easy-apply-modal'], 'text': modal_text}]
+        if banner:
+            children.append(banner)
+        return {'matches': ['body'], 'text': 'Your application was sent to Globex ' + modal_text,
+                'children': children}
+
+    def test_success_text_behind_the_modal_is_ignored(self):
+        self.assertEqual(self.state(self.page()), 'open')
+        feedback = {'matches': ['.artdeco-inline-feedback--success'], 'text': 'Saved'}
+        self.assertEqual(self.state(self.page(banner=feedback)), 'open')
+        self.assertEqual(self.state(self.page(modal_text='Your application was sent to Acme')), 'success')
+
+    def test_confirmation_dialog_counts(self):
+        dialog = {'matches': ['div[role="dialog"]', '[data-test-modal-id="post-apply-modal"]'], 'text': 'Done'}
+        self.assertEqual(self.state({'matches': ['body'], 'children': [dialog]}), 'success')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import configparser
+import unittest
+from unittest.mock import MagicMock
+from selenium import webdriver
+from browser import apply_browser_options, blocked_url_patterns, enable_resource_blocking, page_metrics
+
+def make_config(text):
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return config
+
+class TestLeanMode(unittest.TestCase):
+    def test_standard_mode_is_unchanged(self):
+        config = make_config('[Browser]\nheadless = false\n')
+        options = webdriver.ChromeOptions()
+        apply_browser_options(options, config)
+        self.assertEqual(options.arguments, [])
+        self.assertEqual(options.page_load_strategy, 'normal')
+        
+        driver = MagicMock()
+        self.assertEqual(enable_resource_blocking(driver, config), [])
+        driver.execute_cdp_cmd.assert_not_called()
+
+    def test_lean_mode(self):
+        config = make_config('[Browser]\nlean = true\nblock_resource_types = font\nblock_url_patterns = *tracker.example*\n')
+        options = webdriver.ChromeOptions()
+        apply_browser_options(options, config)
+        self.assertIn('--headless=new', options.arguments)
+        self.assertEqual(options.page_load_strategy, 'eager')
+        
+        patterns = blocked_url_patterns(config)
+        self.assertIn('*.woff2*', patterns)
+        self.assertIn('*tracker.example*', patterns)
+        self.assertNotIn('*.png*', patterns)
+        
+        driver = MagicMock()
+        enable_resource_blocking(driver, config)
+        driver.execute_cdp_cmd.assert_called_with('Network.setBlockedURLs', {'urls': patterns})
+
+    def test_page_metrics(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = {'load_ms': 120, 'bytes': 2048, 'resources': 3}
+        driver.service.process.pid = -1
+        metrics = page_metrics(driver, 'lean')
+        self.assertEqual(metrics['mode'], 'lean')
+        self.assertIn('chrome_rss_mb', metrics)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import MagicMock
+from captcha_detector import CaptchaDetector
+
+class TestCaptchaDetector(unittest.TestCase):
+    def test_probe_result_and_cache(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = {'state': 'hCaptcha', 'generation': 3, 'installed': True}
+        detector = CaptchaDetector(driver, cache_ttl=60)
+        
+        self.assertEqual(detector.check(), (True, 'hCaptcha'))
+        self.assertEqual(detector.check(), (True, 'hCaptcha'))
+        driver.execute_script.assert_called_once()
+        
+        # Forced checks always go to the browser
+        driver.execute_script.return_value = {'state': '', 'generation': 4, 'installed': False}
+        self.assertEqual(detector.check(force=True), (False, ''))
+        self.assertEqual(driver.execute_script.call_count, 2)
+
+    def test_invalidate_after_navigation(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = {'state': '', 'generation': 0, 'installed': True}
+        detector = CaptchaDetector(driver, cache_ttl=60)
+        self.assertEqual(detector.check(), (False, ''))
+        
+        # The next page shows a CAPTCHA; the cached result must not hide it
+        detector.invalidate()
+        driver.execute_script.return_value = {'state': 'reCAPTCHA', 'generation': 0, 'installed': True}
+        self.assertEqual(detector.check(), (True, 'reCAPTCHA'))
+        self.assertEqual(driver.execute_script.call_count, 2)
+
+    def test_unusable_probe_result(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = None
+        self.assertIsNone(CaptchaDetector(driver).check())
+
+    def test_episode_tracking(self):
+        detector = CaptchaDetector(MagicMock())
+        self.assertTrue(detector.is_new_episode('reCAPTCHA'))
+        self.assertFalse(detector.is_new_episode('reCAPTCHA'))
+        detector.reset_episode()
+        self.assertTrue(detector.is_new_episode('reCAPTCHA'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import configparser
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from checkpoint import Checkpoint, fingerprint
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'checkpoints', 'campaign.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_update_writes_every_n(self):
+        checkpoint = Checkpoint(self.path, 'key1', every=3)
+        checkpoint.update(last_job_id='a')
+        checkpoint.update(last_job_id='b')
+        self.assertFalse(os.path.exists(self.path))
+
+        checkpoint.update(last_job_id='c', jobs_processed=3)
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)['last_job_id'], 'c')
+
+    def test_resume_only_matching_run(self):
+        Checkpoint(self.path, 'key1').save(page=14, page_url='https://www.indeed.com/jobs?q=python&start=130')
+
+        state = Checkpoint(self.path, 'key1').load()
+        self.assertEqual(state['page'], 14)
+        self.assertIsNone(Checkpoint(self.path, 'key2').load())
+
+        checkpoint = Checkpoint(self.path, 'key1')
+        checkpoint.clear()
+        self.assertIsNone(checkpoint.load())
+
+    def test_from_config_and_fingerprint(self):
+        config = configparser.ConfigParser()
+        config.read_string(f'[Checkpoint]\ndirectory = {self.tmp_dir}\nevery = 2\n')
+        checkpoint = Checkpoint.from_config(config, 'run_bot', fingerprint([{'keywords': 'Python'}]))
+
+        self.assertEqual(checkpoint.path, os.path.join(self.tmp_dir, 'run_bot.json'))
+        self.assertEqual(checkpoint.every, 2)
+        self.assertEqual(fingerprint({'a': 1, 'b': 2}), fingerprint({'b': 2, 'a': 1}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from description_cache import DescriptionCache
+
+class TestDescriptionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip_and_shared_bodies(self):
+        cache = DescriptionCache(self.path)
+        text = 'Python developer. ' * 100
+        cache.put_many('indeed', {'a': text, 'b': text})
+        cache.put('linkedin', 'a', 'Another posting')
+
+        self.assertEqual(cache.get_many('indeed', ['a', 'b', 'c']), {'a': text, 'b': text})
+        self.assertEqual(cache.get('linkedin', 'a'), 'Another posting')
+        # Identical text is stored once, compressed
+        self.assertLess(cache.size, len(text) // 4)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+        cache.close()
+
+        reopened = DescriptionCache(self.path)
+        self.assertEqual(reopened.get('indeed', 'b'), text)
+        self.assertEqual(reopened.size, cache.size)
+        reopened.close()
+
+    def test_ttl_and_revalidation(self):
+        cache = DescriptionCache(self.path, ttl=60)
+        cache.put('indeed', 'a', 'old text')
+        cache._conn.execute('UPDATE entries SET fetched_at = ?', (time.time() - 120,))
+
+        self.assertIsNone(cache.get('indeed', 'a'))
+
+        cache.put('indeed', 'a', 'new text')
+        self.assertEqual(cache.get('indeed', 'a'), 'new text')
+        # The replaced body is dropped
+        self.assertEqual(cache._conn.execute('SELECT COUNT(*) FROM bodies').fetchone()[0], 1)
+        cache.close()
+
+    def test_lru_eviction(self):
+        texts = {job_id: os.urandom(300).hex() for job_id in ('a', 'b', 'c')}
+        cache = DescriptionCache(self.path, max_bytes=700)
+        cache.put('indeed', 'a', texts['a'])
+        time.sleep(0.01)
+        cache.put('indeed', 'b', texts['b'])
+        time.sleep(0.01)
+        cache.get('indeed', 'a')
+        time.sleep(0.01)
+        cache.put('indeed', 'c', texts['c'])
+
+        self.assertEqual(set(cache.get_many('indeed', texts)), {'a', 'c'})
+        self.assertLessEqual(cache.size, 700)
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from unittest.mock import MagicMock
+from description_fetcher import DESCRIPTION_SELECTORS, DescriptionFetcher, parse_description
+from fixture_portal import FixturePortal
+from rate_limiter import AdaptiveRateLimiter
+
+class TestParseDescription(unittest.TestCase):
+    def test_extracts_nested_text(self):
+        html = '''<html><body><div class="header">Python jobs</div>
+            <div id="jobDescriptionText"><p>Build <b>Selenium</b> tools.</p><br><ul><li>Python</li><li>Docker</li></ul></div>
+            <footer>Apply now</footer></body></html>'''
+
+        self.assertEqual(
+            parse_description(html, DESCRIPTION_SELECTORS['indeed']),
+            'Build Selenium tools.\nPython\nDocker'
+        )
+
+    def test_missing_container(self):
+        self.assertIsNone(parse_description('<div>Captcha</div>', DESCRIPTION_SELECTORS['linkedin']))
+
+class TestDescriptionFetcher(unittest.TestCase):
+    def test_fetch_many_against_fixture(self):
+        with FixturePortal(pages=1, jobs_per_page=3) as portal:
+            jobs = [portal.job('indeed', 0, index) for index in range(3)]
+            limiter = AdaptiveRateLimiter(initial_rate=100, burst=10)
+            fetcher = DescriptionFetcher('indeed', max_workers=3, rate_limiter=limiter)
+            try:
+                driver = MagicMock()
+                driver.execute_script.return_value = 'JobBot Test'
+                driver.get_cookies.return_value = [{'name': 'session', 'value': 'abc', 'path': '/'}]
+                fetcher.sync_cookies(driver)
+
+                urls = {job['job_id']: f"{portal.base_url}/indeed/viewjob?jk={job['job_id']}" for job in jobs}
+                urls['missing'] = f"{portal.base_url}/indeed/viewjob?jk=missing"
+                descriptions = fetcher.fetch_many(urls)
+            finally:
+                fetcher.close()
+
+        for job in jobs:
+            self.assertEqual(descriptions[job['job_id']], job['description'])
+        self.assertIsNone(descriptions['missing'])
+        self.assertEqual(fetcher.session.headers['User-Agent'], 'JobBot Test')
+        self.assertEqual(limiter.state()[portal.base_url.split('//')[1]]['requests'], 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import configparser
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from driver_pool import DriverPool, chrome_factory, resolve_chromedriver
+from metrics import CommandCounter
+
+def healthy_driver():
+    driver = MagicMock()
+    driver.execute_script.return_value = 1
+    driver.window_handles = ['main']
+    return driver
+
+class TestDriverPool(unittest.TestCase):
+    def test_prespawn_and_reuse(self):
+        factory = MagicMock(side_effect=lambda: healthy_driver())
+        pool = DriverPool(factory, size=2, max_uses=10)
+        try:
+            first = pool.acquire(timeout=5)
+            second = pool.acquire(timeout=5)
+            self.assertIsNot(first, second)
+            self.assertEqual(factory.call_count, 2)
+            
+            pool.release(first)
+            first.get.assert_called_with('about:blank')
+            self.assertIs(pool.acquire(timeout=5), first)
+        finally:
+            pool.close()
+
+    def test_release_clears_cookies_and_storage(self):
+        driver = healthy_driver()
+        pool = DriverPool(MagicMock(return_value=driver), size=1)
+        try:
+            pool.acquire(timeout=5)
+            driver.execute_script.return_value = 'https://www.linkedin.com'
+            pool.release(driver)
+            driver.delete_all_cookies.assert_called_once()
+            driver.execute_cdp_cmd.assert_any_call('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd.assert_any_call(
+                'Storage.clearDataForOrigin', {'origin': 'https://www.linkedin.com', 'storageTypes': 'all'}
+            )
+            driver.get.assert_called_with('about:blank')
+        finally:
+            pool.close()
+
+    def test_release_removes_command_hook(self):
+        driver = healthy_driver()
+        execute = driver.execute
+        pool = DriverPool(MagicMock(return_value=driver), size=1)
+        try:
+            CommandCounter(pool.acquire(timeout=5), 'test_pool')
+            pool.release(driver)
+            self.assertIs(driver.execute, execute)
+        finally:
+            pool.close()
+
+    def test_unhealthy_and_worn_out_drivers_are_replaced(self):
+        sick = healthy_driver()
+        sick.execute_script.side_effect = Exception("browser crashed")
+        drivers = [sick, healthy_driver(), healthy_driver()]
+        pool = DriverPool(MagicMock(side_effect=drivers), size=1, max_uses=1)
+        try:
+            driver = pool.acquire(timeout=5)
+            self.assertIs(driver, drivers[1])
+            sick.quit.assert_called_once()
+            
+            # max_uses=1: released driver is retired and a fresh one spawned
+            pool.release(driver)
+            driver.quit.assert_called_once()
+            self.assertIs(pool.acquire(timeout=5), drivers[2])
+        finally:
+            pool.close()
+
+class TestChromeFactory(unittest.TestCase):
+    @patch('driver_pool.resolve_chromedriver', return_value='/usr/bin/chromedriver')
+    @patch('driver_pool.webdriver.Chrome')
+    def test_pooled_drivers_use_lean_settings(self, mock_chrome, mock_resolve):
+        config = configparser.ConfigParser()
+        config.read_string('[Browser]\nlean = true\n')
+        chrome_factory(config)()
+        
+        options = mock_chrome.call_args.kwargs['options']
+        self.assertEqual(options.page_load_strategy, 'eager')
+        self.assertIn('--blink-settings=imagesEnabled=false', options.arguments)
+        self.assertIn('--headless=new', options.arguments)
+
+    @patch('driver_pool.resolve_chromedriver', return_value='/usr/bin/chromedriver')
+    @patch('driver_pool.webdriver.Chrome')
+    def test_pooled_drivers_match_bot_options(self, mock_chrome, mock_resolve):
+        config = configparser.ConfigParser()
+        config.read_string('[BrowserOptions]\n--disable-gpu = true\n[Session]\nuser_data_dir = /tmp/profiles\n')
+        running = MagicMock()
+        running.service.process.poll.return_value = None
+        mock_chrome.return_value = running
+        create = chrome_factory(config)
+        create()
+        create()
+        
+        first, second = (call.kwargs['options'].arguments for call in mock_chrome.call_args_list)
+        self.assertIn('--disable-gpu', first)
+        # Live browsers never share a profile directory
+        self.assertIn('--user-data-dir=/tmp/profiles/pool-0', first)
+        self.assertIn('--user-data-dir=/tmp/profiles/pool-1', second)
+        
+        # Once a browser has quit its profile slot is reused
+        running.service.process.poll.return_value = 0
+        create()
+        self.assertIn('--user-data-dir=/tmp/profiles/pool-0', mock_chrome.call_args.kwargs['options'].arguments)
+
+class TestResolveChromedriver(unittest.TestCase):
+    @patch('driver_pool.detect_chrome_version', return_value='120.0.1.2')
+    def test_cached_per_chrome_version(self, mock_version):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            cache_file = os.path.join(tmp_dir, 'cache.json')
+            binary = os.path.join(tmp_dir, 'chromedriver')
+            open(binary, 'w').close()
+            
+            with patch('webdriver_manager.chrome.ChromeDriverManager') as manager:
+                manager.return_value.install.return_value = binary
+                self.assertEqual(resolve_chromedriver(cache_file), binary)
+                self.assertEqual(resolve_chromedriver(cache_file), binary)
+                manager.return_value.install.assert_called_once()
+            
+            with open(cache_file) as f:
+                self.assertIn('120.0.1.2', json.load(f))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
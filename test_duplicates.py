@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+from duplicates import DuplicateIndex, card_shingles, minhash, similarity
+
+DESCRIPTION = (
+    'We are looking for a backend engineer to design and run the Python services behind our '
+    'payments platform. You will work with Django, Postgres and Kafka, own features from design '
+    'to production, and mentor two junior engineers. Five years of experience required.'
+)
+
+class TestMinHash(unittest.TestCase):
+    def test_similarity_tracks_overlap(self):
+        a = minhash(card_shingles('Senior Python Developer'))
+        self.assertEqual(similarity(a, minhash(card_shingles('senior python developer!'))), 1.0)
+        self.assertLess(similarity(a, minhash(card_shingles('Registered Nurse'))), 0.3)
+        self.assertIsNone(minhash(card_shingles('')))
+
+class TestDuplicateIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'duplicates.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_repost_at_same_company(self):
+        index = DuplicateIndex(self.path)
+        self.assertIsNone(index.check('indeed', 'a', 'Senior Python Developer', 'Acme Corp'))
+        # Weekly reposts under new IDs
+        self.assertEqual(index.check('indeed', 'b', 'Senior Python Developer', 'ACME corp.'), 'indeed:a')
+        self.assertEqual(index.check('indeed', 'c', 'Senior Python Developer -', 'Acme Corp'), 'indeed:a')
+        # Same title elsewhere is a different job
+        self.assertIsNone(index.check('indeed', 'd', 'Senior Python Developer', 'Globex'))
+        self.assertIsNone(index.check('indeed', 'e', 'Data Analyst', 'Acme Corp'))
+        index.close()
+
+    def test_cross_portal_by_content(self):
+        index = DuplicateIndex(self.path)
+        index.check('linkedin', '1', 'Backend Engineer', 'Acme', DESCRIPTION)
+        reworded = DESCRIPTION + ' Apply today!'
+        self.assertEqual(index.check('indeed', 'x', 'Python Backend Engineer (Payments)', 'Acme Inc', reworded),
+                         'linkedin:1')
+        self.assertIsNone(index.check('indeed', 'y', 'Backend Engineer', 'Acme',
+                                      'Nursing role on a busy surgical ward, nights and weekends.'))
+        index.close()
+
+    def test_check_many_is_idempotent_and_persistent(self):
+        index = DuplicateIndex(self.path)
+        records = [{'job_id': 'a', 'title': 'QA Engineer', 'company': 'Initech'},
+                   {'job_id': 'b', 'title': 'QA Engineer', 'company': 'Initech'}]
+        self.assertEqual(index.check_many('indeed', records), {'b': 'indeed:a'})
+        self.assertEqual(index.check_many('indeed', records), {'b': 'indeed:a'})
+        index.close()
+
+        reopened = DuplicateIndex(self.path)
+        self.assertEqual(reopened.count(), 2)
+        self.assertEqual(reopened.check('linkedin', '9', 'QA Engineer', 'Initech'), 'indeed:a')
+        reopened.close()
+
+    def test_old_postings_fall_out_of_the_window(self):
+        index = DuplicateIndex(self.path, window_days=30)
+        self.assertIsNone(index.check('indeed', 'a', 'QA Engineer', 'Initech'))
+        # Backdate the posting: the same title months later is a new opening
+        index._conn.execute('UPDATE postings SET created_at = created_at - 90 * 86400')
+        index._conn.commit()
+        self.assertIsNone(index.check('indeed', 'b', 'QA Engineer', 'Initech'))
+        self.assertEqual(index.check('indeed', 'c', 'QA Engineer', 'Initech'), 'indeed:b')
+        # A job seen again keeps its cluster, and its buckets are pruned on reopen
+        self.assertIsNone(index.check('indeed', 'a', 'QA Engineer', 'Initech'))
+        self.assertEqual(index.check('indeed', 'c', 'QA Engineer', 'Initech'), 'indeed:b')
+        index.close()
+
+        reopened = DuplicateIndex(self.path, window_days=30)
+        rows = reopened._conn.execute("SELECT COUNT(*) FROM buckets WHERE key = 'indeed:a'").fetchone()[0]
+        self.assertEqual(rows, 0)
+        self.assertEqual(reopened.count(), 3)
+        reopened.close()
+
+    def test_old_bucket_rows_dont_crowd_out_recent_postings(self):
+        index = DuplicateIndex(self.path, window_days=30)
+        index.MAX_CANDIDATES = 5
+        for job_id in range(10):
+            index.check('indeed', f'old{job_id}', 'QA Engineer', 'Initech')
+        # Outside the window, but their bucket rows stay until the next prune
+        index._conn.execute('UPDATE postings SET created_at = created_at - 90 * 86400')
+        index._conn.commit()
+        self.assertIsNone(index.check('indeed', 'a', 'QA Engineer', 'Initech'))
+        self.assertEqual(index.check('indeed', 'b', 'QA Engineer', 'Initech'), 'indeed:a')
+        index.close()
+
+if __name__ == '__main__':
+    unittest.main()
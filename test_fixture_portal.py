@@ -0,0 +1,39 @@
+import re
+import unittest
+import urllib.request
+from fixture_portal import FixturePortal
+
+class TestFixturePortal(unittest.TestCase):
+    def fetch(self, portal, path):
+        with urllib.request.urlopen(portal.base_url + path) as response:
+            return response.read().decode()
+
+    def test_pagination(self):
+        with FixturePortal(pages=2, jobs_per_page=4) as portal:
+            first = self.fetch(portal, '/indeed/jobs?q=python')
+            self.assertEqual(first.count('class="job_seen_beacon"'), 4)
+            self.assertIn("aria-label=\"Next Page\"", first)
+            
+            last = self.fetch(portal, '/indeed/jobs?q=python&start=4')
+            self.assertNotIn('Next Page', last)
+            
+            linkedin = self.fetch(portal, '/linkedin/jobs/search/?keywords=python')
+            self.assertEqual(linkedin.count('urn:li:jobPosting:'), 4)
+
+    def test_description_matches_results(self):
+        with FixturePortal(pages=1, jobs_per_page=2) as portal:
+            page = self.fetch(portal, '/indeed/jobs')
+            job_id = re.search(r'data-jk="(\w+)"', page).group(1)
+            
+            description = self.fetch(portal, f'/indeed/viewjob?jk={job_id}')
+            self.assertIn('jobsearch-JobComponent-description', description)
+            self.assertIn(portal.job('indeed', 0, 0)['description'], description)
+
+    def test_captcha_injection(self):
+        with FixturePortal(pages=1, captcha_rate=1.0) as portal:
+            self.assertIn('Security Check', self.fetch(portal, '/indeed/jobs'))
+            # The same page is served normally once the CAPTCHA was shown
+            self.assertNotIn('Security Check', self.fetch(portal, '/indeed/jobs'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, call, patch
+from selenium.common.exceptions import TimeoutException
+from indeed_job_bot import IndeedJobBot
+from recycling import RecyclePolicy
+
+RESULTS_URL = 'https://www.indeed.com/jobs?q=python&start=20'
+
+class TestIndeedJobBot(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.tmp_dir, 'config.ini')
+        with open(self.config_path, 'w') as f:
+            f.write(f'''
+[Indeed]
+email = test@example.com
+password = testpass
+
+[Skills]
+required = python
+preferred = docker
+min_preferred = 0
+
+[Storage]
+job_index = {self.tmp_dir}/job_index.db
+
+[Journal]
+directory = {self.tmp_dir}/journal
+
+[Waits]
+latency_file = {self.tmp_dir}/latency.json
+
+[Session]
+enabled = false
+
+[Fetcher]
+enabled = false
+
+[DescriptionCache]
+enabled = false
+
+[Duplicates]
+enabled = false
+
+[Checkpoint]
+directory = {self.tmp_dir}/checkpoints
+''')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def make_bot(self, driver=None):
+        bot = IndeedJobBot(self.config_path, driver=driver or MagicMock())
+        self.addCleanup(bot.close)
+        return bot
+
+    @patch('indeed_job_bot.WebDriverWait')
+    def test_login_fails_if_still_on_sign_in_page(self, mock_wait):
+        bot = self.make_bot()
+        bot.waits.until_url_changes = MagicMock(return_value=False)
+        self.assertFalse(bot.login_to_indeed())
+        
+        bot.waits.until_url_changes.return_value = True
+        self.assertTrue(bot.login_to_indeed())
+
+    def test_pooled_driver_restores_saved_cookies_despite_managed_profile(self):
+        bot = self.make_bot()
+        bot.config.set('Session', 'user_data_dir', os.path.join(self.tmp_dir, 'profiles'))
+        bot.session_store = MagicMock()
+        bot.session_store.restore.return_value = True
+        bot.session_store.validate.return_value = True
+        # A pooled browser doesn't run in the Indeed profile
+        self.assertTrue(bot._restore_session())
+        bot.session_store.restore.assert_called_once()
+
+    def campaign_bot(self, submit):
+        """A bot whose one results page holds jobs a, b and c, all matching"""
+        bot = IndeedJobBot(self.config_path, driver=MagicMock())
+        bot.driver.current_url = RESULTS_URL
+        bot.login_to_indeed = MagicMock(return_value=True)
+        bot.search_jobs = MagicMock(return_value=True)
+        bot.search_plan = MagicMock(url=RESULTS_URL)
+        records = [{'job_id': job_id, 'title': 'Python Developer'} for job_id in 'abc']
+        bot.read_results_page = MagicMock(return_value=([MagicMock()] * 3, records, True))
+        bot.next_results_page = MagicMock(return_value=False)
+        bot.open_job = MagicMock(return_value='python')
+        bot.open_job_page = MagicMock(return_value='python')
+        bot.submit_application = MagicMock(side_effect=submit)
+        return bot
+
+    def test_campaign_resumes_through_the_portal_loop(self):
+        # The first run dies while sending its second application
+        bot = self.campaign_bot([MagicMock(submitted=True), KeyboardInterrupt()])
+        with self.assertRaises(KeyboardInterrupt):
+            bot.run_job_search_campaign('python', 'Remote', max_applications=5)
+        self.assertEqual(bot.stats, {'jobs_processed': 3, 'jobs_skipped': 0, 'applications_submitted': 1})
+        
+        resumed = self.campaign_bot(lambda job_id: MagicMock(submitted=True))
+        resumed.run_job_search_campaign('python', 'Remote', max_applications=5, resume=True)
+        # The saved page is reopened; its jobs were all read, so only the
+        # pooled candidates are left to apply to
+        resumed.driver.get.assert_any_call(RESULTS_URL)
+        resumed.search_jobs.assert_not_called()
+        resumed.open_job.assert_not_called()
+        self.assertEqual(resumed.submit_application.call_count, 2)
+        self.assertEqual(resumed.stats, {'jobs_processed': 3, 'jobs_skipped': 0, 'applications_submitted': 3})
+        self.assertFalse(os.listdir(os.path.join(self.tmp_dir, 'checkpoints')))
+
+    def test_next_page_that_never_loads_ends_the_search(self):
+        bot = self.make_bot()
+        waits = MagicMock()
+        waits.tracker.max_timeout = 30
+        waits.until_stale.side_effect = [False, False]
+        self.assertFalse(bot.next_results_page(bot.driver, waits, [MagicMock()]))
+        # The second wait gets the longest timeout
+        self.assertEqual(waits.until_stale.call_args.kwargs['timeout'], 30)
+        
+        waits.until_stale.side_effect = [False, True]
+        self.assertTrue(bot.next_results_page(bot.driver, waits, [MagicMock()]))
+
+    def test_captcha_after_navigation_slows_the_rate_limit(self):
+        bot = self.make_bot()
+        bot.rate_limiter.on_captcha = MagicMock()
+        bot.driver.execute_script.return_value = {'state': 'hCaptcha', 'generation': 0, 'installed': True}
+        self.assertTrue(bot.search_jobs('python', 'Remote'))
+        bot.rate_limiter.on_captcha.assert_called_once_with(bot.base_url)
+        
+        # Still the same CAPTCHA after the next page change: one episode, one report
+        bot._page_changed()
+        self.assertEqual(bot.check_for_captcha(), (True, 'hCaptcha'))
+        bot.rate_limiter.on_captcha.assert_called_once()
+
+    @patch('indeed_job_bot.WebDriverWait')
+    def test_results_timeout_checks_for_captcha(self, mock_wait):
+        bot = self.make_bot()
+        bot.rate_limiter.on_captcha = MagicMock()
+        mock_wait.return_value.until.side_effect = TimeoutException()
+        page_driver = MagicMock()
+        page_driver.execute_script.return_value = {'state': 'reCAPTCHA', 'generation': 0, 'installed': True}
+        with self.assertRaises(TimeoutException):
+            bot.read_results_page(page_driver)
+        bot.rate_limiter.on_captcha.assert_called_once_with(bot.base_url)
+        
+        # A description that never loads on a clear page isn't a CAPTCHA
+        bot.driver.execute_script.return_value = {'state': '', 'generation': 0, 'installed': True}
+        with self.assertRaises(TimeoutException):
+            bot.open_job_page('abc')
+        bot.rate_limiter.on_captcha.assert_called_once()
+
+    def recycling_bot(self, cookies, owned=True):
+        for target in ('indeed_job_bot.chrome_rss_mb', 'recycling.chrome_rss_mb'):
+            patcher = patch(target, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.old = MagicMock()
+        self.old.get_cookies.return_value = cookies
+        self.new = MagicMock()
+        bot = self.make_bot(self.old)
+        bot._owns_driver = owned
+        bot.driver_factory = MagicMock(return_value=self.new)
+        bot.recycle_policy = RecyclePolicy(max_pages=2, max_rss_mb=0)
+        bot.login_to_indeed = MagicMock(return_value=True)
+        return bot
+
+    def test_session_carries_over_and_results_page_reopens(self):
+        bot = self.recycling_bot([{'name': 'CTK', 'value': '1', 'domain': '.indeed.com', 'size': 4}])
+        bot.pages_since_recycle = 1
+        self.assertFalse(bot.maybe_recycle(RESULTS_URL))
+        bot.driver_factory.assert_not_called()
+
+        bot.pages_since_recycle = 2
+        self.assertTrue(bot.maybe_recycle(RESULTS_URL))
+        self.old.quit.assert_called_once()
+        self.new.add_cookie.assert_called_once_with({'name': 'CTK', 'value': '1', 'domain': '.indeed.com'})
+        self.assertEqual(self.new.get.call_args_list, [call('https://www.indeed.com/'), call(RESULTS_URL)])
+        bot.login_to_indeed.assert_not_called()
+        self.assertIs(bot.driver, self.new)
+        self.assertIs(bot.waits.driver, self.new)
+        self.assertEqual((bot.recycles, bot.pages_since_recycle), (1, 0))
+
+    def test_without_cookies_signs_in_again(self):
+        bot = self.recycling_bot([])
+        bot.pages_since_recycle = 2
+        self.assertTrue(bot.maybe_recycle(RESULTS_URL))
+        bot.login_to_indeed.assert_called_once()
+        self.new.add_cookie.assert_not_called()
+        self.assertEqual(self.new.get.call_args_list[-1], call(RESULTS_URL))
+
+    def test_pooled_driver_is_not_restarted(self):
+        bot = self.recycling_bot([{'name': 'CTK', 'value': '1'}], owned=False)
+        bot.pages_since_recycle = 50
+        self.assertFalse(bot.maybe_recycle(RESULTS_URL))
+        bot.driver_factory.assert_not_called()
+        self.old.quit.assert_not_called()
+        self.assertIs(bot.driver, self.old)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,16 @@
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, call
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.event_firing_webdriver import EventFiringWebDriver
 from main import JobApplicationBot
+from rate_limiter import AdaptiveRateLimiter
+from journal import ApplicationJournal, compact
 import os
 import shutil
 import time
@@ -100,6 +105,17 @@ headless = true
         self.assertTrue(result)
         self.assertIn(captcha_type, ['reCAPTCHA', 'hCaptcha', 'Generic'])
 
+    @patch('selenium.webdriver.Chrome')
+    def test_page_change_drops_cached_captcha_result(self, mock_chrome):
+        bot = JobApplicationBot(config_path=self.test_config)
+        bot.driver.execute_script = Mock(return_value={'state': '', 'generation': 0, 'installed': True})
+        self.assertEqual(bot.check_for_captcha(), (False, ""))
+        
+        # Called by the throttled driver after a navigation
+        bot._page_changed()
+        bot.driver.execute_script.return_value = {'state': 'hCaptcha', 'generation': 0, 'installed': True}
+        self.assertEqual(bot.check_for_captcha(), (True, 'hCaptcha'))
+
     # ... other existing test methods ...
 
     # New LinkedIn test methods
@@ -161,26 +177,31 @@ headless = true
         self.assertFalse(result)
 
     @patch('selenium.webdriver.Chrome')
-    def test_search_linkedin_jobs_success(self, mock_chrome):
-        """Test successful LinkedIn job search"""
+    def test_login_to_linkedin_warm_session(self, mock_chrome):
+        """A valid saved session skips the login form"""
         bot = JobApplicationBot(config_path=self.test_config)
+        bot.session_store = MagicMock()
+        bot.session_store.restore.return_value = True
+        bot.session_store.validate.return_value = True
+        bot.wait_for_element = Mock()
         
-        # Create mock elements
-        mock_search_box = MagicMock()
-        mock_location_box = MagicMock()
-        mock_results = MagicMock()
+        self.assertTrue(bot.login_to_linkedin())
+        bot.wait_for_element.assert_not_called()
+        self.assertEqual(bot.login_stats['LinkedIn']['mode'], 'warm')
         
-        # Configure wait_for_element
-        def mock_wait_for_element(by, value, clickable=False):
-            if 'search' in str(value).lower():
-                return mock_search_box
-            elif 'city' in str(value).lower():
-                return mock_location_box
-            elif 'results' in str(value).lower():
-                return mock_results
-            return None
-            
-        bot.wait_for_element = Mock(side_effect=mock_wait_for_element)
+        # Expired session falls back to the form
+        bot.session_store.validate.return_value = False
+        bot.wait_for_element = Mock(return_value=None)
+        self.assertFalse(bot.login_to_linkedin())
+        bot.session_store.clear.assert_called_once()
+        bot.wait_for_element.assert_called()
+
+    @patch('selenium.webdriver.Chrome')
+    def test_search_linkedin_jobs_success(self, mock_chrome):
+        """Test successful LinkedIn job search"""
+        bot = JobApplicationBot(config_path=self.test_config)
+        bot.wait_for_element = Mock(return_value=MagicMock())
+        bot._apply_linkedin_filters = Mock()
         
         # Execute search
         result = bot.search_linkedin_jobs("Python Developer", "San Francisco")
@@ -188,59 +209,209 @@ headless = true
         # Verify success
         self.assertTrue(result)
         
-        # Verify element interactions
-        mock_search_box.clear.assert_called_once()
-        mock_search_box.send_keys.assert_any_call("Python Developer")
-        mock_location_box.clear.assert_called_once()
-        mock_location_box.send_keys.assert_called_with("San Francisco")
+        # The search is a single navigation; no form is filled in
+        bot.driver.get.assert_called_once_with(
+            "https://www.linkedin.com/jobs/search/?keywords=Python+Developer&location=San+Francisco"
+        )
+        bot._apply_linkedin_filters.assert_not_called()
+        self.assertEqual(bot.search_results[-1]['url'], bot.driver.get.call_args[0][0])
 
     @patch('selenium.webdriver.Chrome')
-    def test_search_linkedin_jobs_with_filters(self, mock_chrome):
-        """Test LinkedIn job search with filters"""
+    def test_search_does_not_count_cards_as_processed(self, mock_chrome):
+        """Extracted cards are only counted once a job is evaluated"""
+        bot = JobApplicationBot(config_path=self.test_config)
+        bot.wait_for_element = Mock(return_value=MagicMock())
+        cards = [{'job_id': '1', 'title': 'Dev'}, {'job_id': '2', 'title': 'Dev'}]
+        with patch('main.extract_job_cards', return_value=cards):
+            self.assertTrue(bot.search_linkedin_jobs("Python Developer"))
+        self.assertEqual(bot.search_results[-1]['jobs'], cards)
+        self.assertEqual(bot.jobs_processed, 0)
+
+    @patch('selenium.webdriver.Chrome')
+    def test_searches_keep_only_the_newest_jobs_in_memory(self, mock_chrome):
+        """Older searches' records are dropped from memory once over max_buffered_jobs"""
         bot = JobApplicationBot(config_path=self.test_config)
+        bot.recycle_policy.max_buffered_jobs = 3
+        bot.wait_for_element = Mock(return_value=MagicMock())
+        for keywords in ('a', 'b'):
+            cards = [{'job_id': f'{keywords}{n}', 'title': 'Dev'} for n in range(2)]
+            with patch('main.extract_job_cards', return_value=cards):
+                self.assertTrue(bot.search_linkedin_jobs(keywords))
+        self.assertEqual([len(entry['jobs']) for entry in bot.search_results], [1, 2])
+        self.assertEqual(bot.search_results[0]['jobs_spilled'], 1)
+        self.assertEqual(bot.pages_since_recycle, 2)
+        # The journal still has every record
+        bot.journal.flush()
+        summary = compact(bot.journal.directory, bot.journal.run_id)
+        self.assertEqual([len(entry['jobs']) for entry in summary['search_results']], [2, 2])
+
+    @patch('main.chrome_rss_mb', return_value=None)
+    @patch('selenium.webdriver.Chrome')
+    def test_recycle_carries_the_session_over(self, mock_chrome, _):
+        """A restarted browser gets the old one's cookies and reopens the page"""
+        old, new = MagicMock(), MagicMock()
+        mock_chrome.side_effect = [old, new]
+        old.get_cookies.return_value = [{'name': 'li_at', 'value': 'x', 'domain': '.linkedin.com', 'size': 1}]
+        bot = JobApplicationBot(config_path=self.test_config)
+        bot.login_to_linkedin = Mock()
+        bot.pages_since_recycle = bot.recycle_policy.max_pages
         
-        # Create mock elements
-        mock_elements = {
-            'search_box': MagicMock(),
-            'location_box': MagicMock(),
-            'filter_button': MagicMock(),
-            'filter_option': MagicMock(),
-            'apply_button': MagicMock(),
-            'results': MagicMock()
-        }
+        url = 'https://www.linkedin.com/jobs/view/1/'
+        with patch('recycling.chrome_rss_mb', return_value=None):
+            self.assertTrue(bot.maybe_recycle(url))
+        old.quit.assert_called_once()
+        new.add_cookie.assert_called_once_with({'name': 'li_at', 'value': 'x', 'domain': '.linkedin.com'})
+        self.assertEqual(new.get.call_args[0][0], url)
+        bot.login_to_linkedin.assert_not_called()
+        self.assertIs(bot.waits.driver, bot.driver)
+        self.assertIs(bot.captcha_detector.driver, bot.driver)
+        self.assertEqual(bot.pages_since_recycle, 0)
+        # A driver the bot was given is never restarted
+        pooled = JobApplicationBot(config_path=self.test_config, driver=MagicMock())
+        pooled.pages_since_recycle = 1000
+        self.assertFalse(pooled.maybe_recycle(url))
+        self.assertEqual(mock_chrome.call_count, 2)
+
+    def test_navigations_and_clicks_are_throttled(self):
+        """A real-looking driver is wrapped, so the bot's own get and click go through the limiter"""
+        raw = MagicMock(spec=WebDriver)
+        dismiss = MagicMock(spec=WebElement)
+        raw.find_elements.return_value = [dismiss]
+        limiter = AdaptiveRateLimiter()
+        with patch.object(limiter, 'acquire', return_value=0.0) as acquire:
+            bot = JobApplicationBot(config_path=self.test_config, driver=raw, rate_limiter=limiter)
+            self.assertIsInstance(bot.driver, EventFiringWebDriver)
+            bot.wait_for_element = Mock(return_value=MagicMock())
+            bot.search_linkedin_jobs("Python Developer", "Remote")
+            bot._close_easy_apply(discard=False)
         
-        # Configure wait_for_element
-        def mock_wait_for_element(by, value, clickable=False):
-            if 'search' in str(value).lower():
-                return mock_elements['search_box']
-            elif 'city' in str(value).lower():
-                return mock_elements['location_box']
-            elif 'filters' in str(value).lower():
-                return mock_elements['filter_button']
-            elif 'entry level' in str(value).lower():
-                return mock_elements['filter_option']
-            elif 'apply' in str(value).lower():
-                return mock_elements['apply_button']
-            elif 'results' in str(value).lower():
-                return mock_elements['results']
-            return None
-            
-        bot.wait_for_element = Mock(side_effect=mock_wait_for_element)
+        raw.get.assert_called()
+        dismiss.click.assert_called_once()
+        urls = [call.args[0] for call in acquire.call_args_list if call.args]
+        self.assertTrue(any('linkedin.com/jobs' in url for url in urls))
+        # The click is paced against the last navigation's host
+        self.assertIn(call(), acquire.call_args_list)
+
+    @patch('selenium.webdriver.Chrome')
+    def test_timeout_is_reported_once(self, mock_chrome):
+        bot = JobApplicationBot(config_path=self.test_config)
+        bot.wait = MagicMock()
+        bot.wait.until.side_effect = TimeoutException()
+        bot.check_for_captcha = Mock(return_value=(False, ""))
+        bot.rate_limiter.on_timeout = Mock()
+        with patch('main.time.sleep'):
+            self.assertIsNone(bot.wait_for_element(By.ID, "missing", retries=2))
+            self.assertTrue(bot.handle_timeout("loading page"))
+        self.assertEqual(bot.rate_limiter.on_timeout.call_count, 2)
+
+    @patch('selenium.webdriver.Chrome')
+    def test_workers_get_their_own_profile(self, mock_chrome):
+        """Chrome locks a profile, so each run_bot worker starts in its own"""
+        with open(self.test_config, 'a') as f:
+            f.write('\n[Session]\nuser_data_dir = data/profiles\n')
+        JobApplicationBot(config_path=self.test_config, worker=2)
+        JobApplicationBot(config_path=self.test_config)
+        profiles = [next(arg for arg in call.kwargs['options'].arguments if arg.startswith('--user-data-dir='))
+                    for call in mock_chrome.call_args_list]
+        self.assertEqual([os.path.basename(arg) for arg in profiles], ['linkedin-2', 'linkedin'])
+
+    @patch('selenium.webdriver.Chrome')
+    def test_search_linkedin_jobs_with_filters(self, mock_chrome):
+        """Test LinkedIn job search with filters"""
+        bot = JobApplicationBot(config_path=self.test_config)
+        bot.wait_for_element = Mock(return_value=MagicMock())
+        bot._apply_linkedin_filters = Mock()
         
         # Execute search with filters
         filters = {
             "experience_level": "Entry level",
-            "job_type": "Full-time"
+            "job_type": "Full-time",
+            "salary": "$100,000+"
         }
         result = bot.search_linkedin_jobs("Python Developer", "San Francisco", filters)
         
         # Verify success
         self.assertTrue(result)
         
-        # Verify filter interactions
-        mock_elements['filter_button'].click.assert_called()
-        mock_elements['filter_option'].click.assert_called()
-        mock_elements['apply_button'].click.assert_called()
+        # Mapped filters go into the URL; the rest fall back to the modal
+        url = bot.driver.get.call_args[0][0]
+        self.assertIn("f_E=2", url)
+        self.assertIn("f_JT=F", url)
+        bot._apply_linkedin_filters.assert_called_once_with({"salary": "$100,000+"})
+
+class TestRunBot(unittest.TestCase):
+    def test_execute_searches_resume(self):
+        """Searches after the checkpoint run on resume with restored progress"""
+        from run_bot import execute_searches, resume_point
+        import configparser
+        import logging
+        import tempfile
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        config = configparser.ConfigParser()
+        config.read_string(f"[Checkpoint]\ndirectory = {tmp_dir}\n")
+        logger = logging.getLogger(__name__)
+        searches = [{"keywords": f"k{i}", "location": "Remote", "filters": None} for i in range(3)]
+        
+        journal_dir = os.path.join(tmp_dir, 'journal')
+        
+        def make_bot(run_id):
+            bot = MagicMock(config=config, applications_submitted=0, jobs_processed=0, search_results=[],
+                            parent_runs=[], journal=ApplicationJournal(journal_dir, run_id=run_id))
+            self.addCleanup(bot.journal.close)
+            
+            def search(keywords, location, filters):
+                bot.journal.append('search_result', search_id=keywords, entry={'keywords': keywords})
+                return True
+            bot.search_linkedin_jobs.side_effect = search
+            return bot
+        
+        bot = make_bot('run1')
+        # The process dies during the second search
+        bot.search_linkedin_jobs.side_effect = [bot.search_linkedin_jobs.side_effect(**searches[0]),
+                                                KeyboardInterrupt()]
+        checkpoint, start = resume_point(bot, 'run_bot', searches, False, logger)
+        self.assertEqual(start, 0)
+        bot.jobs_processed = 7
+        with self.assertRaises(KeyboardInterrupt):
+            execute_searches(bot, searches, logger, checkpoint, start)
+        # The checkpoint holds where to resume, not the results
+        saved = checkpoint.load()
+        self.assertEqual((saved['next_search'], saved['runs']), (1, ['run1']))
+        self.assertNotIn('search_results', saved)
+        bot.journal.append('counters', applications_submitted=0, jobs_processed=7)
+        
+        resumed = make_bot('run2')
+        checkpoint, start = resume_point(resumed, 'run_bot', searches, True, logger)
+        self.assertEqual(start, 1)
+        self.assertEqual(resumed.jobs_processed, 7)
+        self.assertEqual(resumed.parent_runs, ['run1'])
+        execute_searches(resumed, searches, logger, checkpoint, start)
+        self.assertEqual([c.kwargs["keywords"] for c in resumed.search_linkedin_jobs.call_args_list], ["k1", "k2"])
+        self.assertFalse(os.path.exists(checkpoint.path))
+        resumed.jobs_processed = 9
+        resumed.journal.append('counters', applications_submitted=0, jobs_processed=9)
+        
+        # The summary covers the interrupted run too, and its counters once
+        with patch('main.write_summary') as write_summary:
+            JobApplicationBot.save_application_data(resumed)
+        summary = write_summary.call_args[0][0]
+        self.assertEqual([e['keywords'] for e in summary['search_results']], ["k0", "k1", "k2"])
+        self.assertEqual(summary['jobs_processed'], 9)
+        self.assertEqual(compact(journal_dir)['jobs_processed'], 9)
+
+    def test_shard_searches(self):
+        """Searches are spread round-robin and empty shards are dropped"""
+        from run_bot import shard_searches
+        searches = [{"keywords": f"k{i}"} for i in range(5)]
+        
+        shards = shard_searches(searches, 2)
+        self.assertEqual([len(s) for s in shards], [3, 2])
+        self.assertEqual(sorted(s["keywords"] for shard in shards for s in shard),
+                         [f"k{i}" for i in range(5)])
+        
+        # More workers than searches
+        self.assertEqual(len(shard_searches(searches[:2], 4)), 2)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,31 @@
+import unittest
+from unittest.mock import MagicMock
+from job_extractor import extract_job_cards, RECORD_FIELDS
+
+class TestExtractJobCards(unittest.TestCase):
+    def test_single_roundtrip_records(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = [
+            {'job_id': '123', 'title': 'Python Developer', 'company': 'Acme', 'easy_apply': True},
+            {'title': 'No ID'},
+            'garbage'
+        ]
+        
+        records = extract_job_cards(driver, 'Indeed')
+        
+        driver.execute_script.assert_called_once()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['job_id'], '123')
+        self.assertEqual(records[0]['portal'], 'indeed')
+        self.assertTrue(set(RECORD_FIELDS) <= set(records[0]))
+
+    def test_unusable_result(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = None
+        self.assertEqual(extract_job_cards(driver, 'linkedin'), [])
+        
+        with self.assertRaises(ValueError):
+            extract_job_cards(driver, 'monster')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+from job_index import JobIndex
+
+class TestJobIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'index.db')
+        self.index = JobIndex(self.path)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_mark_and_status(self):
+        self.assertIsNone(self.index.get_status('indeed', 'abc'))
+        
+        self.index.mark('indeed', 'abc', JobIndex.SEEN)
+        self.assertEqual(self.index.get_status('indeed', 'abc'), JobIndex.SEEN)
+        self.assertFalse(self.index.is_processed('indeed', 'abc'))
+        
+        self.index.mark('indeed', 'abc', JobIndex.APPLIED)
+        self.assertTrue(self.index.is_processed('indeed', 'abc'))
+        
+        # Same ID on another portal is a different job
+        self.assertFalse(self.index.is_processed('linkedin', 'abc'))
+
+    def test_persists_across_instances(self):
+        self.index.mark('indeed', 'a', JobIndex.REJECTED)
+        self.index.close()
+        
+        self.index = JobIndex(self.path)
+        self.assertTrue(self.index.is_processed('indeed', 'a'))
+
+    def test_filter_unprocessed(self):
+        self.index.mark('indeed', 'a', JobIndex.REJECTED)
+        self.index.mark('indeed', 'b', JobIndex.SEEN)
+        self.index.mark('indeed', 'c', JobIndex.APPLIED)
+        
+        self.assertEqual(
+            self.index.filter_unprocessed('indeed', ['d', 'c', 'b', 'a']),
+            ['d', 'b']
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from journal import ApplicationJournal, compact, lineage, read_events, write_summary
+
+class TestApplicationJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_events_survive_without_close(self):
+        """Events are readable before close, as after a crash"""
+        journal = ApplicationJournal(self.tmp_dir, fsync_every=100, run_id='run1')
+        journal.append('search_result', search_id=1, entry={'keywords': 'Python'})
+        journal.append('jobs_found', search_id=1, jobs=[{'job_id': 'a'}])
+        
+        events = list(read_events(self.tmp_dir))
+        self.assertEqual([e['event'] for e in events], ['search_result', 'jobs_found'])
+        journal.close()
+
+    def test_rotation_and_torn_line(self):
+        journal = ApplicationJournal(self.tmp_dir, max_bytes=200, run_id='run1')
+        for i in range(10):
+            journal.append('application', job_id=str(i), status='applied')
+        journal.close()
+        
+        segments = sorted(os.listdir(self.tmp_dir))
+        self.assertGreater(len(segments), 1)
+        
+        # Simulate a crash mid-write on the last segment
+        with open(os.path.join(self.tmp_dir, segments[-1]), 'a') as f:
+            f.write('{"event": "applica')
+        
+        job_ids = [e['job_id'] for e in read_events(self.tmp_dir)]
+        self.assertEqual(job_ids, [str(i) for i in range(10)])
+
+    def test_compact(self):
+        for run in ('run1', 'run2'):
+            journal = ApplicationJournal(self.tmp_dir, run_id=run)
+            journal.append('search_result', search_id=1, entry={'keywords': run, 'jobs': []})
+            journal.append('jobs_found', search_id=1, jobs=[{'job_id': f'{run}-a'}])
+            journal.append('jobs_found', search_id=1, jobs=[{'job_id': f'{run}-b'}])
+            journal.append('counters', applications_submitted=1, jobs_processed=2)
+            journal.append('counters', applications_submitted=2, jobs_processed=5)
+            journal.close()
+        
+        summary = compact(self.tmp_dir)
+        self.assertEqual(summary['applications_submitted'], 4)
+        self.assertEqual(summary['jobs_processed'], 10)
+        self.assertEqual(len(summary['search_results']), 2)
+        self.assertEqual(len(summary['search_results'][0]['jobs']), 2)
+        
+        # Restrict to one run
+        self.assertEqual(len(compact(self.tmp_dir, 'run2')['search_results']), 1)
+        
+        output = write_summary(summary, os.path.join(self.tmp_dir, 'summary.json'))
+        with open(output) as f:
+            self.assertEqual(json.load(f)['jobs_processed'], 10)
+
+    def test_compact_resumed_run(self):
+        first = ApplicationJournal(self.tmp_dir, run_id='run1')
+        first.append('search_result', search_id=1, entry={'keywords': 'k1'})
+        first.append('counters', applications_submitted=1, jobs_processed=3)
+        first.close()
+        
+        # The resumed run restores run1's counters and carries on from them
+        second = ApplicationJournal(self.tmp_dir, run_id='run2')
+        second.append('resume', parents=['run1'])
+        second.append('search_result', search_id=2, entry={'keywords': 'k2'})
+        second.append('counters', applications_submitted=2, jobs_processed=5)
+        second.close()
+        
+        self.assertEqual(lineage(self.tmp_dir, 'run2'), ['run1', 'run2'])
+        for summary in (compact(self.tmp_dir, 'run2'), compact(self.tmp_dir)):
+            self.assertEqual([e['keywords'] for e in summary['search_results']], ['k1', 'k2'])
+            self.assertEqual(summary['applications_submitted'], 2)
+            self.assertEqual(summary['jobs_processed'], 5)
+
+if __name__ == '__main__':
+    unittest.main()
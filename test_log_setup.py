@@ -0,0 +1,68 @@
+import configparser
+import json
+import logging
+import shutil
+import tempfile
+import unittest
+import log_setup
+from log_setup import ContextQueueHandler, log_context, setup_logging, shutdown_logging
+
+class TestLogSetup(unittest.TestCase):
+    def setUp(self):
+        shutdown_logging()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.config = configparser.ConfigParser()
+        self.config.read_string(
+            f'[Logging]\ndirectory = {self.tmp_dir}\nconsole = false\nbuffer_size = 2\n'
+        )
+        self.logger = logging.getLogger('test_log_setup')
+
+    def tearDown(self):
+        shutdown_logging()
+        shutil.rmtree(self.tmp_dir)
+
+    def read_records(self):
+        path = log_setup.log_file()
+        shutdown_logging()
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_setup_is_idempotent(self):
+        setup_logging(self.config)
+        setup_logging(self.config)
+
+        queue_handlers = [h for h in logging.getLogger().handlers if isinstance(h, ContextQueueHandler)]
+        self.assertEqual(len(queue_handlers), 1)
+
+    def test_context_fields(self):
+        setup_logging(self.config)
+        with log_context(portal='indeed', job_id='abc'):
+            with log_context(stage='apply'):
+                self.logger.info('Applied %s', 'ok')
+        self.logger.info('outside')
+
+        records = self.read_records()
+        self.assertEqual(records[0]['message'], 'Applied ok')
+        self.assertEqual((records[0]['portal'], records[0]['job_id'], records[0]['stage']),
+                         ('indeed', 'abc', 'apply'))
+        self.assertNotIn('job_id', records[1])
+
+    def test_ring_buffer_flushed_on_error(self):
+        setup_logging(self.config)
+        for i in range(3):
+            self.logger.debug(f'detail {i}')
+        self.logger.info('kept')
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            self.logger.exception('failed')
+        self.logger.debug('after')
+
+        records = self.read_records()
+        # Only the last two debug records survive the ring, written before the error
+        self.assertEqual([r['message'] for r in records], ['kept', 'detail 1', 'detail 2', 'failed'])
+        self.assertTrue(records[1]['replayed'])
+        self.assertIn('ValueError: boom', records[3]['exc'])
+
+if __name__ == '__main__':
+    unittest.main()
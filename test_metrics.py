@@ -0,0 +1,143 @@
+import configparser
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import MagicMock
+from metrics import WEBDRIVER_COMMANDS, CommandCounter, Counter, Histogram, MetricsExporter, MetricsRegistry
+
+def export_from_worker(config_text, worker):
+    """run_bot worker stand-in: counts a command in its own process and exports it"""
+    config = configparser.ConfigParser()
+    config.read_string(config_text)
+    exporter = MetricsExporter.from_config(config, worker).start()
+    try:
+        WEBDRIVER_COMMANDS.inc(portal=f'worker{worker}', command='get')
+        with urllib.request.urlopen(f'http://127.0.0.1:{exporter.port}/metrics') as response:
+            body = response.read().decode()
+    finally:
+        exporter.stop()
+    return exporter.path, body
+
+class TestMetrics(unittest.TestCase):
+    def test_counter_render(self):
+        counter = Counter('jobs_total', 'Jobs')
+        counter.inc(portal='indeed', status='applied')
+        counter.inc(2, portal='indeed', status='applied')
+        counter.inc(portal='linkedin', status='seen')
+
+        self.assertEqual(counter.value(portal='indeed', status='applied'), 3)
+        self.assertIn('jobs_total{portal="indeed",status="applied"} 3', counter.render())
+        self.assertIn('# TYPE jobs_total counter', counter.render())
+
+    def test_histogram_buckets(self):
+        histogram = Histogram('step_seconds', 'Step', buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, portal='indeed')
+
+        lines = histogram.render().splitlines()
+        self.assertIn('step_seconds_bucket{portal="indeed",le="0.1"} 1', lines)
+        self.assertIn('step_seconds_bucket{portal="indeed",le="1"} 3', lines)
+        self.assertIn('step_seconds_bucket{portal="indeed",le="+Inf"} 4', lines)
+        self.assertIn('step_seconds_count{portal="indeed"} 4', lines)
+        self.assertEqual(histogram.count(portal='indeed'), 4)
+
+    def test_command_counter_per_job(self):
+        driver = MagicMock()
+        counter = CommandCounter(driver, 'test_portal')
+        with counter.job():
+            driver.execute('get', {'url': 'https://www.indeed.com/'})
+            driver.execute('findElement', {})
+        self.assertEqual(counter.total, 2)
+
+        # A replacement browser keeps counting into the same counter
+        replacement = MagicMock()
+        counter.attach(replacement)
+        replacement.execute('findElements', {})
+        self.assertEqual(counter.total, 3)
+
+    def test_command_counter_attach_is_idempotent(self):
+        driver = MagicMock()
+        execute = driver.execute
+        # A pooled driver leased by one bot, then by the next
+        first = CommandCounter(driver, 'test_first')
+        second = CommandCounter(driver, 'test_second')
+        before = WEBDRIVER_COMMANDS.value(portal='test_first', command='get')
+        driver.execute('get', {'url': 'https://www.indeed.com/'})
+        
+        # Counted once, for the bot that attached last
+        self.assertEqual((first.total, second.total), (0, 1))
+        self.assertEqual(WEBDRIVER_COMMANDS.value(portal='test_first', command='get'), before)
+        self.assertEqual(WEBDRIVER_COMMANDS.value(portal='test_second', command='get'), 1)
+        execute.assert_called_once_with('get', {'url': 'https://www.indeed.com/'})
+        
+        # The earlier counter no longer owns the hook; the current one restores execute
+        first.detach()
+        self.assertIsNot(driver.execute, execute)
+        second.detach()
+        self.assertIs(driver.execute, execute)
+        
+        CommandCounter(driver, 'test_third')
+        CommandCounter.unhook(driver)
+        self.assertIs(driver.execute, execute)
+
+    def test_exporter_file(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        registry = MetricsRegistry()
+        registry.counter('applications_total', 'Applications').inc(portal='indeed')
+
+        config = configparser.ConfigParser()
+        config.read_string(f"[Metrics]\nenabled = true\nfile = {os.path.join(tmp_dir, 'metrics.prom')}\n")
+        exporter = MetricsExporter.from_config(config)
+        exporter.registry = registry
+        exporter.start()
+        exporter.stop()
+
+        with open(exporter.path) as f:
+            self.assertIn('applications_total{portal="indeed"} 1', f.read())
+
+    def test_exporter_http(self):
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        registry = MetricsRegistry()
+        registry.histogram('fetch_seconds', 'Fetch').observe(0.2, source='http')
+
+        exporter = MetricsExporter(registry, port=port).start()
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics') as response:
+                body = response.read().decode()
+        finally:
+            exporter.stop()
+        self.assertIn('fetch_seconds_count{source="http"} 1', body)
+
+    def test_workers_export_to_their_own_file_and_port(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        config_text = (f"[Metrics]\nenabled = true\nfile = {os.path.join(tmp_dir, 'metrics.prom')}\n"
+                       f"port = {port}\n")
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(export_from_worker, [config_text] * 2, [0, 1]))
+
+        for worker, (path, body) in enumerate(results):
+            self.assertEqual(path, os.path.join(tmp_dir, f'metrics.worker{worker}.prom'))
+            with open(path) as f:
+                written = f.read()
+            other = f'portal="worker{1 - worker}"'
+            for text in (written, body):
+                self.assertIn(f'portal="worker{worker}"', text)
+                self.assertNotIn(other, text)
+
+    def test_exporter_disabled_by_default(self):
+        self.assertIsNone(MetricsExporter.from_config(configparser.ConfigParser()))
+
+if __name__ == '__main__':
+    unittest.main()
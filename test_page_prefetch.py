@@ -0,0 +1,120 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from page_prefetch import PagePrefetcher, PrefetchedPage
+
+class FakeResults:
+    """Driver stand-in walking a list of result pages."""
+
+    def __init__(self, pages, load_seconds=0.0):
+        self.pages = pages
+        self.load_seconds = load_seconds
+        self.index = None
+        self.threads = set()
+        self.loaded = []
+
+    @property
+    def current_url(self):
+        return f'https://jobs.example.com/?page={self.index + 1}'
+
+    def get(self, url):
+        self.index = 0
+
+    def read_page(self, driver):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.load_seconds)
+        self.loaded.append(self.index)
+        return self.index, list(self.pages[self.index])
+
+    def next_page(self, driver, handle):
+        if handle + 1 >= len(self.pages):
+            return False
+        self.index = handle + 1
+        return True
+
+class TestPagePrefetcher(unittest.TestCase):
+    def test_yields_pages_in_order_from_the_worker(self):
+        results = FakeResults([['a', 'b'], ['c'], ['d']])
+        prefetcher = PagePrefetcher(results, 'https://jobs.example.com/', results.read_page,
+                                    results.next_page).start()
+
+        pages = list(prefetcher)
+        prefetcher.close()
+
+        self.assertEqual(pages[1], PrefetchedPage(2, 'https://jobs.example.com/?page=2', ['c']))
+        self.assertEqual([page.payload for page in pages], [['a', 'b'], ['c'], ['d']])
+        self.assertEqual(results.threads, {'page-prefetch'})
+        self.assertEqual(prefetcher.pages, 3)
+
+    def test_runs_at_most_depth_pages_ahead(self):
+        results = FakeResults([[n] for n in range(10)])
+        prefetcher = PagePrefetcher(results, 'https://jobs.example.com/', results.read_page,
+                                    results.next_page, depth=2).start()
+
+        first = next(iter(prefetcher))
+        time.sleep(0.3)
+        # Two pages queued plus the one waiting for room
+        self.assertEqual(first.number, 1)
+        self.assertEqual(len(results.loaded), 4)
+
+        prefetcher.close()
+        self.assertLessEqual(len(results.loaded), 4)
+
+    def test_page_loads_overlap_with_processing(self):
+        results = FakeResults([[n] for n in range(4)], load_seconds=0.1)
+        prefetcher = PagePrefetcher(results, 'https://jobs.example.com/', results.read_page,
+                                    results.next_page).start()
+
+        started = time.monotonic()
+        for _ in prefetcher:
+            time.sleep(0.1)
+        elapsed = time.monotonic() - started
+        prefetcher.close()
+
+        # Serially this would take 0.8s
+        self.assertLess(elapsed, 0.7)
+
+    def test_renewed_driver_reads_the_following_pages(self):
+        results = FakeResults([['a'], ['b'], ['c']])
+        replacement = FakeResults(results.pages)
+        drivers = []
+
+        def read_page(driver):
+            drivers.append(driver)
+            return driver.index, list(driver.pages[driver.index])
+
+        def next_page(driver, handle):
+            if handle + 1 >= len(driver.pages):
+                return False
+            driver.index = handle + 1
+            return True
+
+        def renew(driver):
+            # Replace the driver once, on page 2
+            if driver is results and driver.index == 1:
+                replacement.index = driver.index
+                return replacement
+            return None
+
+        prefetcher = PagePrefetcher(results, 'https://jobs.example.com/', read_page, next_page,
+                                    renew=renew).start()
+
+        self.assertEqual([page.payload for page in prefetcher], [['a'], ['b'], ['c']])
+        prefetcher.close()
+        self.assertEqual(drivers, [results, replacement, replacement])
+        self.assertIs(prefetcher.driver, replacement)
+
+    def test_worker_error_is_raised_after_earlier_pages(self):
+        results = FakeResults([['a'], ['b']])
+        next_page = MagicMock(side_effect=RuntimeError('next button vanished'))
+        prefetcher = PagePrefetcher(results, 'https://jobs.example.com/', results.read_page, next_page).start()
+
+        pages = iter(prefetcher)
+        self.assertEqual(next(pages).payload, ['a'])
+        with self.assertRaises(RuntimeError):
+            next(pages)
+        prefetcher.close()
+
+if __name__ == '__main__':
+    unittest.main()
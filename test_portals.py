@@ -0,0 +1,160 @@
+import configparser
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from job_index import JobIndex
+from description_cache import DescriptionCache
+from duplicates import DuplicateIndex
+from journal import ApplicationJournal, read_events
+from orchestrator import CampaignOrchestrator
+from portals import JobPortal
+
+class FakePortal(JobPortal):
+    name = 'fake'
+
+    def __init__(self, config, job_index, journal, pages):
+        super().__init__(config, job_index, journal)
+        self.pages = pages
+        self.applied = []
+        self.opened = []
+
+    @property
+    def driver(self):
+        return None
+
+    def login(self):
+        return True
+
+    def search(self, keywords, location=None, filters=None):
+        return True
+
+    def iter_results(self):
+        for page in self.pages:
+            yield [{'job_id': job_id} for job_id, _ in page]
+
+    def description_url(self, record):
+        return f"https://jobs.example.com/{record['job_id']}"
+
+    def fetch_description(self, record):
+        self.opened.append(record['job_id'])
+        for page in self.pages:
+            for job_id, description in page:
+                if job_id == record['job_id']:
+                    return description
+        return None
+
+    def apply(self, record):
+        self.applied.append(record['job_id'])
+        return True
+
+    def search_results(self):
+        return []
+
+    def close(self):
+        pass
+
+class TestJobPortal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.config = configparser.ConfigParser()
+        self.config.read_string('[Skills]\nrequired = python\npreferred = docker\nmin_preferred = 0\n')
+        self.index = JobIndex(os.path.join(self.tmp_dir, 'index.db'))
+        self.journal = ApplicationJournal(os.path.join(self.tmp_dir, 'journal'), run_id='run1')
+
+    def tearDown(self):
+        self.journal.close()
+        self.index.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_run_campaign(self):
+        self.index.mark('fake', 'old', JobIndex.APPLIED)
+        portal = FakePortal(self.config, self.index, self.journal, [
+            [('old', 'python'), ('a', 'python'), ('b', 'java only')],
+            [('c', 'python and docker'), ('d', 'python')],
+        ])
+        portal.maybe_recycle = MagicMock(return_value=False)
+
+        stats = portal.run_campaign('Python Developer', max_applications=2)
+
+        # The best match on page 2 goes first; a beats d on arrival order
+        self.assertEqual(portal.applied, ['c', 'a'])
+        # The browser may be restarted before each application
+        self.assertEqual(portal.maybe_recycle.call_count, 2)
+        self.assertEqual(stats, {'jobs_processed': 4, 'jobs_skipped': 1, 'applications_submitted': 2})
+        self.assertEqual(self.index.get_status('fake', 'b'), JobIndex.REJECTED)
+        self.assertEqual(self.index.get_status('fake', 'd'), JobIndex.SEEN)
+
+        self.journal.flush()
+        outcomes = [(e['job_id'], e['status']) for e in read_events(self.journal.directory)
+                    if e['event'] == 'application']
+        self.assertEqual(outcomes, [('b', 'rejected'), ('c', 'applied'), ('a', 'applied')])
+        scores = {e['job_id']: e['score'] for e in read_events(self.journal.directory) if e['event'] == 'application'}
+        self.assertGreater(scores['c'], scores['a'])
+
+    def test_prefetched_rejections_skip_the_browser(self):
+        portal = FakePortal(self.config, self.index, self.journal, [
+            [('a', 'python'), ('b', 'java only'), ('c', 'python')],
+        ])
+        portal.fetcher = MagicMock()
+        portal.fetcher.fetch_many.return_value = {'a': 'python', 'b': 'java only', 'c': None}
+
+        portal.run_campaign('Python Developer')
+
+        # b was rejected from its HTTP description; c's fetch failed so it was
+        # read in the browser, then both matches were reopened to apply
+        self.assertEqual(portal.opened, ['c', 'a', 'c'])
+        self.assertEqual(portal.applied, ['a', 'c'])
+        self.assertEqual(self.index.get_status('fake', 'b'), JobIndex.REJECTED)
+
+    def test_cached_descriptions_skip_the_browser(self):
+        portal = FakePortal(self.config, self.index, self.journal, [[('a', 'python'), ('b', 'java only')]])
+        portal.description_cache = DescriptionCache(os.path.join(self.tmp_dir, 'cache.db'))
+        portal.description_cache.put('fake', 'b', 'java only')
+
+        portal.run_campaign('Python Developer')
+
+        # b came from the cache; a was read in the browser and cached for next time
+        self.assertEqual(portal.opened, ['a', 'a'])
+        self.assertEqual(portal.description_cache.get('fake', 'a'), 'python')
+        portal.description_cache.close()
+
+    def test_reposts_are_not_opened(self):
+        text = 'Senior Python developer building data pipelines with Docker and Postgres'
+        portal = FakePortal(self.config, self.index, self.journal, [[('a', text), ('b', 'python')]])
+        portal.description_cache = DescriptionCache(os.path.join(self.tmp_dir, 'cache.db'))
+        portal.description_cache.put('fake', 'a', text)
+        portal.duplicates = DuplicateIndex(os.path.join(self.tmp_dir, 'duplicates.db'))
+        portal.duplicates.check('linkedin', '1', 'Senior Python Developer', 'Acme', text)
+
+        stats = portal.run_campaign('Python Developer')
+
+        # a reposts the LinkedIn job already seen, so only b is opened
+        self.assertEqual(portal.applied, ['b'])
+        self.assertNotIn('a', portal.opened)
+        self.assertEqual(stats['jobs_skipped'], 1)
+        self.assertEqual(self.index.get_status('fake', 'a'), JobIndex.DUPLICATE)
+        portal.duplicates.close()
+        portal.description_cache.close()
+
+class TestCampaignOrchestrator(unittest.TestCase):
+    def test_unknown_portal(self):
+        with self.assertRaises(ValueError):
+            CampaignOrchestrator(portals=['monster'])
+
+    def test_aggregate(self):
+        summary = CampaignOrchestrator.aggregate([
+            {'portal': 'linkedin', 'applications_submitted': 0, 'jobs_processed': 4, 'jobs_skipped': 1,
+             'search_results': [{'keywords': 'Python', 'jobs': []}]},
+            {'portal': 'indeed', 'applications_submitted': 3, 'jobs_processed': 5, 'jobs_skipped': 0,
+             'search_results': [{'keywords': 'Python', 'jobs': []}]},
+        ])
+
+        self.assertEqual(summary['applications_submitted'], 3)
+        self.assertEqual(summary['jobs_processed'], 9)
+        self.assertEqual(summary['portals']['linkedin']['jobs_skipped'], 1)
+        self.assertEqual([entry['portal'] for entry in summary['search_results']], ['linkedin', 'indeed'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import TimeoutException
+from rate_limiter import (AdaptiveRateLimiter, RateLimitListener, RateLimitManager, SharedRateLimiter,
+                          TokenBucket, throttled, unwrap)
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=10.0, capacity=2)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.limiter = AdaptiveRateLimiter(initial_rate=1.0, min_rate=0.1, max_rate=2.0,
+                                           increase=0.5, increase_after=3, window=10)
+
+    def rate(self, host):
+        return self.limiter.state()[host]['rate']
+
+    def test_additive_increase_capped(self):
+        for _ in range(9):
+            self.limiter.on_success('https://www.indeed.com/jobs?q=python')
+        self.assertEqual(self.rate('www.indeed.com'), 2.0)
+
+    def test_captcha_halves_rate_per_host(self):
+        self.limiter.on_success('https://www.linkedin.com/feed/')
+        self.limiter.on_success('https://www.indeed.com/')
+        self.limiter.on_captcha('https://www.linkedin.com/jobs/')
+        self.assertEqual(self.rate('www.linkedin.com'), 0.5)
+        self.assertEqual(self.rate('www.indeed.com'), 1.0)
+
+    def test_timeout_rate_threshold(self):
+        for _ in range(4):
+            self.limiter.on_success('www.indeed.com')
+        self.limiter.on_timeout()
+        # One timeout in five actions is at the threshold, not above it
+        self.assertEqual(self.rate('www.indeed.com'), 1.5)
+        self.limiter.on_timeout()
+        self.assertEqual(self.rate('www.indeed.com'), 1.125)
+        self.assertEqual(self.limiter.state()['www.indeed.com']['timeouts'], 2)
+
+    def test_acquire_paces_requests(self):
+        limiter = AdaptiveRateLimiter(initial_rate=20.0, burst=1)
+        started = time.monotonic()
+        for _ in range(3):
+            limiter.acquire('https://www.indeed.com/')
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_listener_routes_navigation_and_clicks(self):
+        limiter = MagicMock()
+        listener = RateLimitListener(limiter)
+        listener.before_navigate_to('https://www.indeed.com/', None)
+        listener.before_click(None, None)
+        listener.on_exception(TimeoutException(), None)
+        limiter.acquire.assert_any_call('https://www.indeed.com/')
+        self.assertEqual(limiter.acquire.call_count, 2)
+        limiter.on_timeout.assert_called_once()
+
+    def test_listener_reports_page_changes(self):
+        changed = MagicMock()
+        listener = RateLimitListener(MagicMock(), on_page_change=changed)
+        listener.after_navigate_to('https://www.linkedin.com/jobs/', None)
+        listener.after_click(None, None)
+        listener.after_navigate_back(None)
+        self.assertEqual(changed.call_count, 3)
+        
+        # Without a callback the listener only rate limits
+        RateLimitListener(MagicMock()).after_navigate_to('https://www.linkedin.com/', None)
+
+    def test_unwrap(self):
+        element = MagicMock(spec=['click'])
+        self.assertIs(unwrap(element), element)
+        wrapper = MagicMock(wrapped_element=element)
+        self.assertIs(unwrap(wrapper), element)
+
+    def test_fallback_host_is_per_thread(self):
+        self.limiter.acquire('https://www.linkedin.com/jobs/')
+        # Another thread (e.g. a description fetch) uses a different host
+        worker = threading.Thread(target=self.limiter.acquire, args=('https://api.example.com/',))
+        worker.start()
+        worker.join()
+        
+        # This thread's click still counts against its own page's host
+        self.limiter.acquire()
+        state = self.limiter.state()
+        self.assertEqual(state['www.linkedin.com']['requests'], 2)
+        self.assertEqual(state['api.example.com']['requests'], 1)
+
+    def test_throttled_leaves_test_doubles_alone(self):
+        driver = MagicMock()
+        self.assertIs(throttled(driver, self.limiter), driver)
+
+def _worker_captcha(remote):
+    SharedRateLimiter(remote).on_captcha('https://www.linkedin.com/jobs/')
+
+class TestSharedRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.tmp_dir, 'config.ini')
+        with open(self.config_path, 'w') as f:
+            f.write(f'[RateLimit]\ninitial_rate = 2.0\nburst = 2\n'
+                    f'[Logging]\ndirectory = {self.tmp_dir}/logs\nconsole = false\n')
+        self.manager = RateLimitManager()
+        self.manager.start()
+        self.remote = self.manager.limiter(self.config_path)
+
+    def tearDown(self):
+        self.manager.shutdown()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_workers_share_buckets(self):
+        first, second = SharedRateLimiter(self.remote), SharedRateLimiter(self.remote)
+        # Two workers together get the burst once, not once each
+        self.assertEqual(first.acquire('https://www.linkedin.com/'), 0.0)
+        self.assertEqual(second.acquire('https://www.linkedin.com/'), 0.0)
+        self.assertGreater(first.reserve('https://www.linkedin.com/'), 0.0)
+        self.assertEqual(second.state()['www.linkedin.com']['requests'], 3)
+
+    def test_captcha_in_one_process_slows_all(self):
+        local = SharedRateLimiter(self.remote)
+        self.assertEqual(local.interval('https://www.linkedin.com/'), 0.5)
+        worker = multiprocessing.Process(target=_worker_captcha, args=(self.remote,))
+        worker.start()
+        worker.join(10)
+        self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(local.interval(), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import configparser
+import unittest
+from unittest.mock import MagicMock, call
+from recycling import RecyclePolicy, restart_driver, spill_jobs, spill_searches
+
+class TestRecyclePolicy(unittest.TestCase):
+    def test_reason(self):
+        policy = RecyclePolicy(max_pages=50, max_rss_mb=1000)
+        self.assertIsNone(policy.reason(10, 400.0))
+        self.assertIsNone(policy.reason(10, None))
+        self.assertEqual(policy.reason(50, 400.0), 'page limit reached')
+        self.assertEqual(policy.reason(10, 1200.5), 'Chrome RSS 1200.5 MB')
+        self.assertIsNone(RecyclePolicy(max_pages=0, max_rss_mb=0).reason(1000, 5000.0))
+
+    def test_from_config(self):
+        config = configparser.ConfigParser()
+        config.read_string('[Recycling]\nmax_pages = 20\n')
+        policy = RecyclePolicy.from_config(config)
+        self.assertEqual((policy.max_pages, policy.max_rss_mb), (20, 1500.0))
+
+        config.read_string('[Recycling]\nenabled = false\n')
+        self.assertIsNone(RecyclePolicy.from_config(config))
+
+    def test_spill_jobs_keeps_the_newest(self):
+        entry = {'jobs': [{'job_id': str(n)} for n in range(5)]}
+        self.assertEqual(spill_jobs(entry, 3), 2)
+        self.assertEqual([job['job_id'] for job in entry['jobs']], ['2', '3', '4'])
+        entry['jobs'].append({'job_id': '5'})
+        spill_jobs(entry, 3)
+        self.assertEqual(entry['jobs_spilled'], 3)
+        self.assertEqual(spill_jobs(entry, 0), 0)
+
+    def test_spill_searches_keeps_the_newest_searches(self):
+        def search(count):
+            return {'jobs': [{'job_id': str(n)} for n in range(count)]}
+        entries = [search(10), search(0), search(10)]
+        self.assertEqual(spill_searches(entries, 15), 5)
+        self.assertEqual([len(entry['jobs']) for entry in entries], [5, 0, 10])
+        # The search being worked on is never cut, even past the limit
+        entries.append(search(20))
+        self.assertEqual(spill_searches(entries, 15), 15)
+        self.assertEqual([len(entry['jobs']) for entry in entries], [0, 0, 0, 20])
+        self.assertEqual(sum(entry.get('jobs_spilled', 0) for entry in entries), 20)
+
+class TestRestartDriver(unittest.TestCase):
+    URL = 'https://www.indeed.com/jobs?q=python'
+
+    def test_session_carries_over(self):
+        old, new, login = MagicMock(), MagicMock(), MagicMock()
+        old.get_cookies.return_value = [{'name': 'CTK', 'value': '1', 'size': 4}, {'name': 'other', 'value': '2'}]
+        new.add_cookie.side_effect = [None, Exception('invalid cookie domain')]
+        self.assertIs(restart_driver(old, lambda: new, 'https://www.indeed.com', self.URL, login=login), new)
+        old.quit.assert_called_once()
+        self.assertEqual(new.add_cookie.call_args_list[0], call({'name': 'CTK', 'value': '1'}))
+        self.assertEqual(new.get.call_args_list, [call('https://www.indeed.com/'), call(self.URL)])
+        login.assert_not_called()
+
+    def test_without_cookies_signs_in_again(self):
+        old, new, login = MagicMock(), MagicMock(), MagicMock()
+        old.get_cookies.side_effect = Exception('browser is gone')
+        old.quit.side_effect = Exception('browser is gone')
+        restart_driver(old, lambda: new, 'https://www.indeed.com', self.URL, login=login)
+        login.assert_called_once()
+        new.add_cookie.assert_not_called()
+        self.assertEqual(new.get.call_args_list, [call(self.URL)])
+
+if __name__ == '__main__':
+    unittest.main()
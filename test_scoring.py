@@ -0,0 +1,68 @@
+import configparser
+import unittest
+from scoring import CandidatePool, JobScorer
+from skill_matcher import SkillMatcher
+
+class TestJobScorer(unittest.TestCase):
+    def setUp(self):
+        self.scorer = JobScorer(SkillMatcher(['python'], ['docker', 'aws']))
+
+    def test_scores_rank_by_relevance(self):
+        scores = self.scorer.score_many({
+            'both': 'Python developer working with Docker and AWS',
+            'python': 'Python developer',
+            'long': 'Python developer ' + 'meetings and paperwork ' * 20,
+            'java': 'Java developer with Docker',
+        })
+
+        self.assertGreater(scores['both'].score, scores['python'].score)
+        self.assertGreater(scores['python'].score, scores['long'].score)
+        self.assertFalse(scores['java'].passed)
+        self.assertTrue(scores['long'].passed)
+
+    def test_min_score(self):
+        config = configparser.ConfigParser()
+        config.read_string('[Skills]\nrequired = python\npreferred = docker\n[Scoring]\nmin_score = 1.0\n')
+        scorer = JobScorer.from_config(config)
+
+        scores = scorer.score_many({'a': 'python docker', 'b': 'python ' + 'filler ' * 50, 'c': 'nothing'})
+
+        self.assertTrue(scores['a'].passed)
+        self.assertFalse(scores['b'].passed)
+
+    def test_rescore_uses_final_statistics(self):
+        first = self.scorer.score_many({'early': 'python developer'})
+        self.scorer.score_many({'late%d' % i: 'python docker developer' for i in range(5)})
+
+        self.assertNotEqual(self.scorer.rescore(['early'])['early'], first['early'].score)
+
+class TestCandidatePool(unittest.TestCase):
+    def test_pops_best_first(self):
+        pool = CandidatePool([['restored', 0.5]])
+        pool.push('a', 1.0, {'job_id': 'a'})
+        pool.push('b', 2.0)
+        pool.push('c', 1.0)
+        pool.push('a', 9.0)
+
+        self.assertIn('a', pool)
+        self.assertEqual(pool.entries(), [['b', 2.0], ['a', 1.0], ['c', 1.0], ['restored', 0.5]])
+        self.assertEqual(pool.pop(), ('b', 2.0, None))
+        self.assertEqual(pool.pop(), ('a', 1.0, {'job_id': 'a'}))
+        self.assertNotIn('a', pool)
+        self.assertEqual(len(pool), 2)
+
+    def test_rescore(self):
+        scorer = JobScorer(SkillMatcher(['python'], ['docker']))
+        scorer.score_many({'a': 'python', 'b': 'python docker'})
+        record = {'job_id': 'a'}
+        pool = CandidatePool([['restored', 5.0]])
+        pool.push('a', 100.0, record)
+        pool.push('b', 0.0)
+
+        pool.rescore(scorer)
+
+        self.assertEqual([job_id for job_id, _ in pool.entries()], ['restored', 'b', 'a'])
+        self.assertEqual(record['score'], scorer.rescore(['a'])['a'])
+
+if __name__ == '__main__':
+    unittest.main()
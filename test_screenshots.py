@@ -0,0 +1,68 @@
+import base64
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+from screenshots import ScreenshotPipeline
+
+def frame(content):
+    return {'data': base64.b64encode(content).decode()}
+
+class TestScreenshotPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.driver = MagicMock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_capture_dedupes_identical_frames(self):
+        pipeline = ScreenshotPipeline(self.tmp_dir, quality=40)
+        self.driver.execute_cdp_cmd.side_effect = [frame(b'one'), frame(b'one'), frame(b'two')]
+
+        first = pipeline.capture(self.driver, 'captcha')
+        repeat = pipeline.capture(self.driver, 'captcha_retry')
+        second = pipeline.capture(self.driver, 'solved')
+        pipeline.close()
+
+        self.assertEqual(repeat, first)
+        self.assertNotEqual(second, first)
+        self.assertTrue(first.endswith('.jpg'))
+        with open(first, 'rb') as f:
+            self.assertEqual(f.read(), b'one')
+        self.assertEqual((pipeline.written, pipeline.duplicates), (2, 1))
+        self.driver.execute_cdp_cmd.assert_called_with(
+            'Page.captureScreenshot', {'format': 'jpeg', 'quality': 40})
+
+    def test_falls_back_to_webdriver_png(self):
+        pipeline = ScreenshotPipeline(self.tmp_dir)
+        self.driver.execute_cdp_cmd.side_effect = Exception('not a Chromium driver')
+        self.driver.get_screenshot_as_base64.return_value = frame(b'png')['data']
+
+        path = pipeline.capture(self.driver, 'page')
+        pipeline.close()
+
+        self.assertTrue(path.endswith('.png'))
+        self.assertTrue(os.path.exists(path))
+
+    def test_enforce_budget(self):
+        pipeline = ScreenshotPipeline(self.tmp_dir, max_files=2, max_bytes=1000, max_age_days=1)
+        now = time.time()
+        for i, (age, size) in enumerate([(2 * 86400, 10), (300, 10), (200, 10), (100, 10)]):
+            path = os.path.join(self.tmp_dir, f'screenshot_{i}.jpg')
+            with open(path, 'wb') as f:
+                f.write(b'x' * size)
+            os.utime(path, (now - age, now - age))
+        with open(os.path.join(self.tmp_dir, 'keep.txt'), 'w') as f:
+            f.write('not a screenshot')
+
+        usage = pipeline.enforce_budget()
+        pipeline.close()
+
+        self.assertEqual(usage, {'files': 2, 'bytes': 20, 'removed': 2})
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ['keep.txt', 'screenshot_2.jpg', 'screenshot_3.jpg'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from urllib.parse import parse_qs, urlparse
+from search_plan import build_search_plan, indeed_plan, linkedin_plan
+
+class TestSearchPlan(unittest.TestCase):
+    def test_linkedin_plan(self):
+        plan = linkedin_plan('https://www.linkedin.com/', 'Software Engineer', 'San Francisco', {
+            'experience_level': 'Entry level',
+            'job_type': ['Full-time', 'Contract'],
+            'remote': 'Remote',
+            'date_posted': 'Past 24 hours'
+        })
+
+        url = urlparse(plan.url)
+        self.assertEqual(url.path, '/jobs/search/')
+        self.assertEqual(parse_qs(url.query), {
+            'keywords': ['Software Engineer'], 'location': ['San Francisco'],
+            'f_E': ['2'], 'f_JT': ['F,C'], 'f_WT': ['2'], 'f_TPR': ['r86400']
+        })
+        self.assertEqual(plan.unmapped, {})
+
+    def test_indeed_plan(self):
+        plan = indeed_plan('https://www.indeed.com', 'Python Developer', 'Remote', {
+            'date_posted': 'Past 24 hours',
+            'job_type': 'Full-time',
+            'remote': 'Remote',
+            'experience_level': 'Entry level'
+        })
+
+        self.assertEqual(plan.params, {
+            'q': 'Python Developer', 'l': 'Remote', 'fromage': '1', 'jt': 'fulltime',
+            'sc': '0kf:attr(DSQF7)explvl(ENTRY_LEVEL);'
+        })
+        self.assertTrue(plan.url.startswith('https://www.indeed.com/jobs?q=Python+Developer'))
+
+    def test_unmapped_filters(self):
+        plan = build_search_plan('indeed', 'https://www.indeed.com', 'Python', filters={
+            'salary': '$100,000+',
+            'job_type': ['Full-time', 'Contract'],
+            'date_posted': 'Yesterday-ish'
+        })
+        self.assertEqual(set(plan.unmapped), {'salary', 'job_type', 'date_posted'})
+        self.assertEqual(plan.params, {'q': 'Python'})
+
+        with self.assertRaises(ValueError):
+            build_search_plan('monster', 'https://www.monster.com', 'Python')
+
+if __name__ == '__main__':
+    unittest.main()
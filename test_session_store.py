@@ -0,0 +1,48 @@
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from session_store import SessionStore
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = SessionStore(self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_save_and_restore(self):
+        driver = MagicMock()
+        driver.current_url = 'https://www.linkedin.com/feed/'
+        driver.get_cookies.return_value = [
+            {'name': 'li_at', 'value': 'token', 'domain': '.linkedin.com', 'sameSite': 'Bogus', 'extra': 1}
+        ]
+        driver.execute_script.return_value = {'key': 'value'}
+        
+        path = self.store.save(driver, 'linkedin', 'me@example.com')
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+        
+        restored = MagicMock()
+        self.assertTrue(self.store.restore(restored, 'linkedin', 'me@example.com', 'https://www.linkedin.com/'))
+        restored.get.assert_called_once_with('https://www.linkedin.com/')
+        restored.add_cookie.assert_called_once_with({'name': 'li_at', 'value': 'token', 'domain': '.linkedin.com'})
+        restored.execute_script.assert_called_once()
+
+    def test_missing_session(self):
+        driver = MagicMock()
+        self.assertFalse(self.store.restore(driver, 'indeed', 'nobody', 'https://www.indeed.com/'))
+        driver.get.assert_not_called()
+
+    def test_validate(self):
+        driver = MagicMock()
+        driver.current_url = 'https://www.linkedin.com/login?session_redirect=x'
+        self.assertFalse(SessionStore.validate(driver, 'https://www.linkedin.com/feed/', ('/login',)))
+        
+        driver.current_url = 'https://www.linkedin.com/feed/'
+        self.assertTrue(SessionStore.validate(driver, 'https://www.linkedin.com/feed/', ('/login',)))
+
+if __name__ == '__main__':
+    unittest.main()
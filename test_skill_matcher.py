@@ -0,0 +1,42 @@
+import unittest
+import configparser
+from skill_matcher import SkillMatcher
+
+class TestSkillMatcher(unittest.TestCase):
+    def setUp(self):
+        config = configparser.ConfigParser()
+        config.read_string('''
+[Skills]
+required = python,selenium
+preferred = go,docker,c++,machine learning
+min_preferred = 1
+''')
+        self.matcher = SkillMatcher.from_config(config)
+
+    def test_word_boundaries(self):
+        """Short skills must not match inside longer words"""
+        found = self.matcher.find_skills("Python and Selenium at Google, some C and c++ too")
+        self.assertEqual(found, {"python", "selenium", "c++"})
+        self.assertNotIn("go", self.matcher.find_skills("We use Google Cloud and gopher"))
+        self.assertIn("go", self.matcher.find_skills("Backend in Go."))
+
+    def test_match_reports_skills(self):
+        match = self.matcher.match("PYTHON, selenium and Machine\nLearning")
+        self.assertTrue(match.passed)
+        self.assertEqual(match.required, {"python", "selenium"})
+        self.assertEqual(match.preferred, {"machine learning"})
+        
+        match = self.matcher.match("python and docker")
+        self.assertFalse(match.passed)
+        self.assertEqual(match.missing_required, {"selenium"})
+
+    def test_match_many(self):
+        results = self.matcher.match_many([
+            "python selenium docker",
+            "python selenium",
+            ""
+        ])
+        self.assertEqual([r.passed for r in results], [True, False, False])
+
+if __name__ == '__main__':
+    unittest.main()
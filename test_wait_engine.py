@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from wait_engine import NETWORK_IDLE_SCRIPT, LatencyTracker, WaitEngine
+
+# A page whose resource timing buffer is full at 250 entries while requests
+# keep arriving: prints the probe's count before and after 50 more requests.
+FULL_BUFFER_PAGE = """
+globalThis.document = {readyState: 'complete'};
+globalThis.window = {};
+const observers = [];
+globalThis.performance = {getEntriesByType: () => new Array(250)};
+globalThis.PerformanceObserver = class {
+    constructor(callback) { this.callback = callback; }
+    observe() { observers.push(this); }
+};
+const probe = new Function(%s);
+const before = probe();
+observers.forEach(observer => observer.callback({getEntries: () => new Array(50)}));
+console.log(JSON.stringify([before, probe()]));
+"""
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_default_until_enough_samples(self):
+        tracker = LatencyTracker(min_samples=3, default_timeout=10)
+        tracker.record('click', 0.2)
+        self.assertEqual(tracker.timeout_for('click'), 10)
+
+    def test_timeout_from_distribution(self):
+        tracker = LatencyTracker(min_samples=3, headroom=2.0, min_timeout=0.1, max_timeout=30)
+        for seconds in (0.2, 0.3, 0.4, 0.5):
+            tracker.record('click', seconds)
+        self.assertAlmostEqual(tracker.timeout_for('click'), 1.0)
+        
+        # Clamped to the configured bounds
+        tracker.record('slow', 100)
+        tracker.min_samples = 1
+        self.assertEqual(tracker.timeout_for('slow'), 30)
+
+    def test_timeouts_back_off_then_give_up(self):
+        tracker = LatencyTracker(min_samples=3, headroom=2.0, min_timeout=0.5, max_timeout=30,
+                                 backoff=2.0, max_timeouts=3)
+        for seconds in (0.5, 0.5, 0.5):
+            tracker.record('apply', seconds)
+        self.assertAlmostEqual(tracker.timeout_for('apply'), 1.0)
+        
+        # Each timeout in a row is a censored sample and doubles the wait
+        tracker.record_timeout('apply', 1.0)
+        self.assertAlmostEqual(tracker.timeout_for('apply'), 4.0)
+        tracker.record_timeout('apply', 4.0)
+        self.assertEqual(tracker.timeout_for('apply'), 30)
+        
+        # After max_timeouts in a row the action only gets min_timeout
+        tracker.record_timeout('apply', 30.0)
+        self.assertEqual(tracker.timeout_for('apply'), 0.5)
+        self.assertEqual(tracker.stats()['apply']['timeouts'], 3)
+        
+        # A success ends the streak; the slow samples keep the timeout up
+        tracker.record('apply', 12.0)
+        self.assertEqual(tracker.timeout_for('apply'), 30)
+
+    def test_given_up_action_is_probed_with_the_full_timeout(self):
+        tracker = LatencyTracker(min_samples=1, headroom=2.0, min_timeout=1.0, max_timeout=30,
+                                 backoff=1.0, max_timeouts=2, probe_every=3)
+        tracker.record('next_page', 5.0)
+        tracker.record_timeout('next_page', 10.0)
+        tracker.record_timeout('next_page', 10.0)
+        
+        # Short give-up waits that time out don't drag the learned latency down
+        timeouts = []
+        for _ in range(6):
+            timeouts.append(tracker.timeout_for('next_page'))
+            tracker.record_timeout('next_page', timeouts[-1])
+        self.assertEqual(timeouts, [1.0, 1.0, 20.0, 1.0, 1.0, 20.0])
+        self.assertEqual(tracker.stats()['next_page']['timeout'], 1.0)
+        
+        # The probe succeeds once the page is only slow, not gone
+        tracker.timeout_for('next_page')
+        tracker.timeout_for('next_page')
+        self.assertEqual(tracker.timeout_for('next_page'), 20.0)
+        tracker.record('next_page', 8.0)
+        self.assertEqual(tracker.timeout_for('next_page'), 20.0)
+
+    def test_save_and_load(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'latency.json')
+            tracker = LatencyTracker()
+            tracker.record('login', 1.5)
+            tracker.save(path)
+            
+            restored = LatencyTracker()
+            restored.load(path)
+            self.assertEqual(restored.stats()['login']['samples'], 1)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+class TestWaitEngine(unittest.TestCase):
+    def test_records_success_and_timeout(self):
+        engine = WaitEngine(MagicMock(), LatencyTracker(), poll_frequency=0.01)
+        
+        self.assertEqual(engine.until('ready', lambda driver: 'ok'), 'ok')
+        self.assertIsNone(engine.until('never', lambda driver: False, timeout=0.05))
+        
+        stats = engine.tracker.stats()
+        self.assertEqual(stats['ready']['samples'], 1)
+        self.assertEqual(stats['never']['timeouts'], 1)
+        # The timed-out wait is kept as a lower bound on the latency
+        self.assertGreaterEqual(engine.tracker.quantile('never', 0.5), 0.05)
+
+    @unittest.skipUnless(shutil.which('node'), 'node is not installed')
+    def test_network_idle_counts_past_a_full_timing_buffer(self):
+        script = FULL_BUFFER_PAGE % json.dumps(NETWORK_IDLE_SCRIPT)
+        output = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True)
+        self.assertEqual(json.loads(output.stdout), [250, 300])
+
+if __name__ == '__main__':
+    unittest.main()
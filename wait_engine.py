@@ -0,0 +1,234 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Returns the number of resources the page has requested so far, or -1 while
+# the document is still loading. A count that stops changing means the
+# network has gone quiet. The resource timing buffer stops at 250 entries,
+# so after the first probe the count comes from a PerformanceObserver, which
+# sees every request.
+NETWORK_IDLE_SCRIPT = """
+if (document.readyState !== 'complete') { return -1; }
+if (window.__botResourceCount === undefined) {
+    window.__botResourceCount = performance.getEntriesByType('resource').length;
+    new PerformanceObserver(list => { window.__botResourceCount += list.getEntries().length; })
+        .observe({type: 'resource'});
+}
+return window.__botResourceCount;
+"""
+
+class LatencyTracker:
+    """
+    Records how long each named action takes and derives its wait timeout
+    from the observed distribution instead of a constant.
+
+    A timeout is a censored sample: the action took at least as long as the
+    wait. It is kept as a sample of that length, and each further timeout in
+    a row multiplies the timeout by `backoff`. After `max_timeouts` in a row
+    the action is assumed not to be coming and gets `min_timeout`, so a wait
+    that never fires costs little; every `probe_every`-th wait is still given
+    the full timeout, so an action that has only become slow can succeed and
+    end the streak.
+    """
+
+    def __init__(self, window: int = 50, min_samples: int = 5, percentile: float = 0.95,
+                 headroom: float = 2.0, default_timeout: float = 10.0,
+                 min_timeout: float = 1.0, max_timeout: float = 30.0,
+                 backoff: float = 2.0, max_timeouts: int = 3, probe_every: int = 5):
+        self.window = window
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.headroom = headroom
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.backoff = backoff
+        self.max_timeouts = max_timeouts
+        self.probe_every = probe_every
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._timeouts = defaultdict(int)
+        # Timeouts since the action last succeeded
+        self._streak = defaultdict(int)
+        # Waits handed out since the action gave up
+        self._given_up = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> 'LatencyTracker':
+        """Build a tracker from the optional [Waits] config section."""
+        section = 'Waits'
+        return cls(
+            window=config.getint(section, 'window', fallback=50),
+            min_samples=config.getint(section, 'min_samples', fallback=5),
+            percentile=config.getfloat(section, 'percentile', fallback=0.95),
+            headroom=config.getfloat(section, 'headroom', fallback=2.0),
+            default_timeout=config.getfloat(section, 'default_timeout', fallback=10.0),
+            min_timeout=config.getfloat(section, 'min_timeout', fallback=1.0),
+            max_timeout=config.getfloat(section, 'max_timeout', fallback=30.0),
+            backoff=config.getfloat(section, 'backoff', fallback=2.0),
+            max_timeouts=config.getint(section, 'max_timeouts', fallback=3),
+            probe_every=config.getint(section, 'probe_every', fallback=5)
+        )
+
+    def record(self, action: str, seconds: float) -> None:
+        """Record one successful wait for an action."""
+        with self._lock:
+            self._samples[action].append(seconds)
+            self._streak[action] = 0
+            self._given_up[action] = 0
+
+    def record_timeout(self, action: str, seconds: float) -> None:
+        """Record a wait that gave up after `seconds`; the action took at least that long."""
+        with self._lock:
+            # A short give-up wait says nothing about the latency
+            if not self._gave_up(self._streak[action]):
+                self._samples[action].append(seconds)
+            self._timeouts[action] += 1
+            self._streak[action] += 1
+
+    def quantile(self, action: str, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(action, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(q * len(samples)))
+        return samples[index]
+
+    def _gave_up(self, streak: int) -> bool:
+        return bool(self.max_timeouts) and streak >= self.max_timeouts
+
+    def timeout_for(self, action: str) -> float:
+        """
+        Timeout for an action: a high percentile of its latency plus headroom,
+        backed off after timeouts in a row. Once the action has given up this
+        is min_timeout, except for a full-length probe every probe_every waits.
+        """
+        with self._lock:
+            probe = False
+            if self._gave_up(self._streak.get(action, 0)):
+                self._given_up[action] += 1
+                probe = bool(self.probe_every) and self._given_up[action] % self.probe_every == 0
+        return self._timeout(action, probe)
+
+    def _timeout(self, action: str, probe: bool = False) -> float:
+        with self._lock:
+            count = len(self._samples.get(action, ()))
+            streak = self._streak.get(action, 0)
+        if self._gave_up(streak) and not probe:
+            return self.min_timeout
+        if count < self.min_samples:
+            timeout = self.default_timeout
+        else:
+            timeout = self.quantile(action, self.percentile) * self.headroom
+        timeout *= self.backoff ** streak
+        return max(self.min_timeout, min(self.max_timeout, timeout))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-action sample count, median, p95, timeout count and current timeout."""
+        with self._lock:
+            actions = set(self._samples) | set(self._timeouts)
+        return {
+            action: {
+                'samples': len(self._samples.get(action, ())),
+                'p50': self.quantile(action, 0.5),
+                'p95': self.quantile(action, 0.95),
+                'timeouts': self._timeouts.get(action, 0),
+                'timeout': round(self._timeout(action), 3)
+            }
+            for action in sorted(actions)
+        }
+
+    def load(self, path: str) -> None:
+        """Seed samples from a previous run."""
+        if not os.path.exists(path):
+            return
+        with open(path, 'r') as f:
+            data = json.load(f)
+        with self._lock:
+            for action, samples in data.items():
+                self._samples[action].extend(samples)
+
+    def save(self, path: str) -> None:
+        """Persist the current sample windows so the next run starts warm."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {action: list(samples) for action, samples in self._samples.items()}
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+class network_idle:
+    """
+    Expected condition: the document is loaded and no new resource requests
+    have started for `quiet_period` seconds.
+    """
+
+    def __init__(self, quiet_period: float = 0.5):
+        self.quiet_period = quiet_period
+        self._last_count = None
+        self._since = None
+
+    def __call__(self, driver):
+        count = driver.execute_script(NETWORK_IDLE_SCRIPT)
+        now = time.monotonic()
+        if count == -1 or count != self._last_count:
+            self._last_count = count
+            self._since = now
+            return False
+        return now - self._since >= self.quiet_period
+
+class WaitEngine:
+    """
+    Event-driven waits for named actions.
+
+    Each wait polls a concrete DOM or network condition, uses a timeout
+    learned from that action's past latency, and records how long it took.
+    A timed-out wait returns None rather than raising, which matches the
+    fixed sleeps it replaces: the caller carries on either way.
+    """
+
+    def __init__(self, driver, tracker: Optional[LatencyTracker] = None,
+                 poll_frequency: float = 0.1, logger=None, rate_limiter=None):
+        self.driver = driver
+        self.tracker = tracker or LatencyTracker()
+        self.poll_frequency = poll_frequency
+        self.logger = logger
+        # Optional AdaptiveRateLimiter fed with wait timeouts
+        self.rate_limiter = rate_limiter
+
+    def until(self, action: str, condition: Callable, timeout: Optional[float] = None) -> Any:
+        """Wait for `condition` and record the latency under `action`."""
+        timeout = timeout if timeout is not None else self.tracker.timeout_for(action)
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            self.tracker.record_timeout(action, time.monotonic() - start)
+            if self.rate_limiter:
+                self.rate_limiter.on_timeout()
+            if self.logger:
+                self.logger.debug(f"Wait for {action} timed out after {timeout:.1f}s")
+            return None
+        self.tracker.record(action, time.monotonic() - start)
+        return result
+
+    def until_stale(self, action: str, element, timeout: Optional[float] = None) -> bool:
+        """Wait until an element is detached, e.g. a results list being replaced."""
+        return bool(self.until(action, EC.staleness_of(element), timeout))
+
+    def until_url_changes(self, action: str, url: str, timeout: Optional[float] = None) -> bool:
+        """Wait until the browser navigates away from `url`."""
+        return bool(self.until(action, EC.url_changes(url), timeout))
+
+    def until_network_idle(self, action: str, quiet_period: float = 0.5,
+                           timeout: Optional[float] = None) -> bool:
+        """Wait until the page is loaded and its network activity has settled."""
+        return bool(self.until(action, network_idle(quiet_period), timeout))